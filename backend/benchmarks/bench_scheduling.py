@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Scheduling Benchmark Suite
+Seeds a synthetic workload (benchmarks/workload.py) at several headcounts
+and times the scheduling entry points against it:
+
+    auto_assign_best_cleaner    ranking for a new booking
+    get_availability            GET /api/availability
+    get_availability_summary    GET /api/admin/calendar/availability-summary
+
+    python benchmarks/bench_scheduling.py [--sizes 50 500 5000] [--iterations 50]
+                                          [--backend auto|mongodb|mongomock] [--output FILE]
+
+Each headcount runs in its own process with fresh in-memory caches. The
+first call of each function is reported separately ("cold"); the others
+vary the date and slot over the horizon. Per call the MongoDB round trips
+are counted through services/db_metrics.py, and latency and round trips
+are summarized as p50/p95. Results go to a JSON file
+(benchmarks/results/scheduling-<commit>.json by default) with sorted keys,
+so runs from different commits can be diffed.
+
+The mongodb backend seeds BENCH_DB_NAME (default maidsofcyfair_bench) on
+MONGO_URL. The mongomock backend needs mongomock-motor installed; it is
+useful for counting round trips, but its latencies are not MongoDB's.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = [50, 500, 5000]
+
+# mongomock Collection methods that stand for one MongoDB command
+_MOCK_COMMANDS = [
+    "find", "find_one", "find_one_and_update", "find_one_and_replace", "find_one_and_delete", "aggregate",
+    "count_documents", "estimated_document_count", "distinct", "insert_one", "insert_many", "update_one",
+    "update_many", "replace_one", "delete_one", "delete_many", "bulk_write",
+]
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=backend_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _mongodb_reachable(mongo_url: str) -> bool:
+    from pymongo import MongoClient
+    try:
+        MongoClient(mongo_url, serverSelectionTimeoutMS=1500).admin.command("ping")
+        return True
+    except Exception:
+        return False
+
+
+def resolve_backend(backend: str, mongo_url: str) -> str:
+    if backend != "auto":
+        return backend
+    if _mongodb_reachable(mongo_url):
+        return "mongodb"
+    try:
+        import mongomock_motor  # noqa: F401
+        return "mongomock"
+    except ImportError:
+        sys.exit(f"No MongoDB at {mongo_url} and mongomock-motor is not installed")
+
+
+def _count_mongomock_commands() -> None:
+    """Record mongomock collection calls in the current request's db stats, like the
+    command listener does for MongoDB (nested calls inside mongomock count once)"""
+    import mongomock.collection
+    from services.db_metrics import _current_request
+
+    depth = {"value": 0}
+
+    def wrap(name: str, method: Callable) -> Callable:
+        def counted(self, *args, **kwargs):
+            stats = _current_request.get()
+            if stats is None or depth["value"]:
+                return method(self, *args, **kwargs)
+            depth["value"] += 1
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                depth["value"] -= 1
+                stats.record(self.name, f"{name} {self.name}", (time.perf_counter() - started) * 1000, 0)
+        return counted
+
+    for name in _MOCK_COMMANDS:
+        setattr(mongomock.collection.Collection, name, wrap(name, getattr(mongomock.collection.Collection, name)))
+
+
+def _summary(latencies: List[float], round_trips: List[int]) -> Dict[str, Any]:
+    latency = np.asarray(latencies)
+    trips = np.asarray(round_trips)
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(float(np.percentile(latency, 50)), 3),
+        "p95_ms": round(float(np.percentile(latency, 95)), 3),
+        "max_ms": round(float(latency.max()), 3),
+        "round_trips_p50": float(np.percentile(trips, 50)),
+        "round_trips_p95": float(np.percentile(trips, 95)),
+        "round_trips_total": int(trips.sum()),
+    }
+
+
+async def _measure(call: Callable[[], Awaitable[Any]], iterations: int) -> Dict[str, Any]:
+    from services.db_metrics import begin_request
+
+    latencies, round_trips = [], []
+    for _ in range(iterations + 1):
+        stats = begin_request()
+        started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - started) * 1000)
+        round_trips.append(stats.commands)
+    return {
+        "cold_ms": round(latencies[0], 3),
+        "cold_round_trips": round_trips[0],
+        **_summary(latencies[1:], round_trips[1:]),
+    }
+
+
+async def run_worker(args) -> Dict[str, Any]:
+    """Seed one headcount and time every function (runs in a fresh process)"""
+    os.environ["DB_NAME"] = args.db_name
+    if args.backend == "mongomock":
+        import motor.motor_asyncio
+        from mongomock_motor import AsyncMongoMockClient
+        motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+        _count_mongomock_commands()
+
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from services.slots import SLOT_LABELS
+    from workload import seed_workload
+    import server
+
+    workload = await seed_workload(server.db, args.worker, args.bookings, args.horizon_days, args.seed)
+    rng = random.Random(args.seed)
+    dates = [(date.today() + timedelta(days=i)).isoformat() for i in range(args.horizon_days)]
+    zip_codes = list(server.travel_matrix.zip_codes)
+
+    def request() -> Request:
+        return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+    functions = {
+        "auto_assign_best_cleaner": lambda: server.auto_assign_best_cleaner(
+            rng.choice(dates), rng.choice(SLOT_LABELS), rng.choice(["2000-2500", "3000-3500"]), rng.choice(zip_codes)
+        ),
+        "get_availability": lambda: server.get_availability(
+            rng.choice(dates), request(), Response(), rng.choice(SLOT_LABELS)
+        ),
+        "get_availability_summary": lambda: server.get_availability_summary(
+            rng.choice(dates), request(), Response(), None
+        ),
+    }
+    results = {}
+    for name, call in functions.items():
+        results[name] = await _measure(call, args.iterations)
+    return {"workload": workload, "functions": results}
+
+
+def run_size(size: int, args, backend: str) -> Dict[str, Any]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_file = f.name
+    command = [
+        sys.executable, __file__, "--worker", str(size), "--result-file", result_file, "--backend", backend,
+        "--iterations", str(args.iterations), "--horizon-days", str(args.horizon_days), "--seed", str(args.seed),
+        "--db-name", args.db_name,
+    ]
+    if args.bookings:
+        command += ["--bookings", str(args.bookings)]
+    try:
+        # The app prints while importing; keep it out of the report
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{size} cleaners failed:\n{completed.stderr[-4000:]}")
+        with open(result_file) as f:
+            return json.load(f)
+    finally:
+        os.unlink(result_file)
+
+
+def main():
+    from workload import BENCH_DB_NAME
+
+    parser = argparse.ArgumentParser(description="Benchmark scheduling functions on synthetic workloads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Cleaner headcounts")
+    parser.add_argument("--bookings", type=int, help="Bookings per run (default: 4 per cleaner)")
+    parser.add_argument("--horizon-days", type=int, default=14)
+    parser.add_argument("--iterations", type=int, default=50, help="Timed calls per function after the cold one")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--backend", choices=["auto", "mongodb", "mongomock"], default="auto")
+    parser.add_argument("--db-name", default=BENCH_DB_NAME)
+    parser.add_argument("--output", help="JSON report path")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.db_name == os.getenv("DB_NAME"):
+        sys.exit(f"Refusing to benchmark against {args.db_name}: it is the application database (DB_NAME)")
+
+    if args.worker:
+        result = asyncio.run(run_worker(args))
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return
+
+    backend = resolve_backend(args.backend, os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    commit = _git("rev-parse", "HEAD")
+    report = {
+        "benchmark": "scheduling",
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "backend": backend,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"{size} cleaners ({backend})...", flush=True)
+        result = run_size(size, args, backend)
+        report["sizes"][str(size)] = result
+        for name, stats in result["functions"].items():
+            print(f"  {name:26} p50 {stats['p50_ms']:9.2f} ms  p95 {stats['p95_ms']:9.2f} ms  "
+                  f"round trips p50 {stats['round_trips_p50']:g} (cold {stats['cold_round_trips']})")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"scheduling-{commit[:8] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
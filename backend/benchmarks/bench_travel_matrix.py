@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Travel Matrix Benchmark
+Times the route-aware parts of assignment on synthetic days (no database):
+
+    python benchmarks/bench_travel_matrix.py [--cleaners 40 150] [--repeat 200]
+
+For each headcount it reports
+  - 10k zip-to-zip lookups: nested dict vs one matrix indexing operation
+  - ranking travel for one booking (auto-assign): neighbours + detour over all cleaners
+  - the day optimizer with and without the travel term
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.day_optimizer import optimize_day
+from services.slots import SLOT_COUNT, SLOT_LABELS
+from services.travel_matrix import load_travel_matrix
+
+
+def synthetic_day(cleaner_count: int, rng: random.Random):
+    """Cleaners and one day's bookings: ~60% of cleaner-slots booked, a fifth of the day open"""
+    travel = load_travel_matrix()
+    zips = list(travel.zip_codes)
+    cleaners = [
+        {
+            "id": f"cleaner-{i}",
+            "rating": round(rng.uniform(3.5, 5.0), 1),
+            "total_jobs": rng.randint(0, 250),
+            "experience_months": rng.randint(0, 60),
+            "preferred_house_sizes": rng.choice([[], ["1000-1500"], ["2000-2500", "2500-3000"]]),
+        }
+        for i in range(cleaner_count)
+    ]
+    bookings = []
+    for cleaner in cleaners:
+        for s in rng.sample(range(SLOT_COUNT), rng.randint(1, 3)):
+            bookings.append({
+                "id": f"booking-{len(bookings)}",
+                "cleaner_id": cleaner["id"],
+                "status": "confirmed",
+                "time_slot": SLOT_LABELS[s],
+                "slot_index": s,
+                "house_size": rng.choice(["1000-1500", "2000-2500", "2500-3000"]),
+                "address": {"zip_code": rng.choice(zips)},
+            })
+    for booking in rng.sample(bookings, len(bookings) // 5):
+        booking["cleaner_id"] = None
+        booking["status"] = "pending"
+    return cleaners, bookings
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds of `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(cleaner_count: int, repeat: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    travel = load_travel_matrix()
+    cleaners, bookings = synthetic_day(cleaner_count, rng)
+    cleaner_ids = [cleaner["id"] for cleaner in cleaners]
+    zips = list(travel.zip_codes)
+
+    # Zip-to-zip lookups
+    nested = {a: {b: travel.between(a, b) for b in zips} for a in zips}
+    pairs = [(rng.choice(zips), rng.choice(zips)) for _ in range(10_000)]
+    pos_a = np.array([travel.position(a) for a, _ in pairs])
+    pos_b = np.array([travel.position(b) for _, b in pairs])
+    dict_ms = timed(lambda: [nested[a][b] for a, b in pairs], repeat)
+    array_ms = timed(lambda: travel.minutes[pos_a, pos_b], repeat)
+
+    # One booking against every cleaner (the auto-assign hot path)
+    slot = SLOT_COUNT // 2
+    zip_position = travel.position(zips[0])
+
+    def rank_travel():
+        before, after = travel.route_neighbours(cleaner_ids, bookings)
+        return travel.detour_minutes(before[:, slot], zip_position, after[:, slot])
+
+    rank_ms = timed(rank_travel, repeat)
+
+    # Whole day
+    recent_jobs = {cleaner_id: rng.randint(0, 12) for cleaner_id in cleaner_ids}
+    optimizer_repeat = max(1, repeat // 20)
+    plain_ms = timed(lambda: optimize_day(bookings, cleaners, [], recent_jobs), optimizer_repeat)
+    travel_ms = timed(lambda: optimize_day(bookings, cleaners, [], recent_jobs, travel=travel), optimizer_repeat)
+    plain = optimize_day(bookings, cleaners, [], recent_jobs)
+    routed = optimize_day(bookings, cleaners, [], recent_jobs, travel=travel)
+    # Detour of the plan made without travel, measured against the same fixed jobs
+    before, after = travel.route_neighbours(cleaner_ids, bookings)
+    cleaner_pos = {cleaner_id: i for i, cleaner_id in enumerate(cleaner_ids)}
+    booking_by_id = {b["id"]: b for b in bookings}
+    plain_minutes = 0.0
+    for assignment in plain["assignments"]:
+        if assignment["cleaner_id"]:
+            booking = booking_by_id[assignment["booking_id"]]
+            c, s = cleaner_pos[assignment["cleaner_id"]], booking["slot_index"]
+            plain_minutes += float(travel.detour_minutes(
+                before[c, s], travel.position(booking["address"]["zip_code"]), after[c, s]
+            ))
+
+    return {
+        "cleaners": cleaner_count,
+        "bookings": len(bookings),
+        "open_bookings": plain["open_bookings"],
+        "lookup_10k_nested_dict_ms": round(dict_ms, 3),
+        "lookup_10k_matrix_index_ms": round(array_ms, 3),
+        "rank_travel_one_booking_ms": round(rank_ms, 3),
+        "optimize_day_ms": round(plain_ms, 2),
+        "optimize_day_travel_ms": round(travel_ms, 2),
+        "assigned": plain["assigned"],
+        "assigned_travel": routed["assigned"],
+        "detour_minutes": round(plain_minutes, 1),
+        "detour_minutes_travel": routed["travel_minutes"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark route-aware cleaner scoring")
+    parser.add_argument("--cleaners", type=int, nargs="+", default=[40, 150], help="Headcounts to run")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per timing (the optimizer runs repeat/20)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for cleaner_count in args.cleaners:
+        result = run(cleaner_count, args.repeat, args.seed)
+        print(f"\n{cleaner_count} cleaners, {result['bookings']} bookings ({result['open_bookings']} open)")
+        for key, value in result.items():
+            if key not in ("cleaners", "bookings", "open_bookings"):
+                print(f"  {key:32} {value}")
+
+
+if __name__ == "__main__":
+    main()
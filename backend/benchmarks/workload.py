@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Synthetic Scheduling Workload
+Seeds a database with cleaners, bookings and calendar availability shaped
+like production documents, for the scheduling benchmarks:
+
+    python benchmarks/workload.py --cleaners 500 [--bookings 2000] [--horizon-days 14]
+
+Writes to BENCH_DB_NAME (default maidsofcyfair_bench) on MONGO_URL and
+drops the seeded collections first, so never point it at a live database.
+
+Per cleaner and day every catalog slot gets a cleaner_availability row, as
+the availability horizon fill creates them; a few are blocked and the rows
+of assigned bookings are booked. Bookings are spread over the horizon with
+production-like statuses, house sizes and serviced zip codes; most are
+assigned, at most one per cleaner and slot. The same seed gives the same
+workload.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from services.booking_times import booking_window_fields
+from services.db_indexes import ensure_indexes
+from services.slots import SLOTS
+from services.travel_matrix import load_travel_matrix
+
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "maidsofcyfair_bench")
+SEEDED_COLLECTIONS = ["cleaners", "bookings", "cleaner_availability", "time_slot_availability"]
+
+HOUSE_SIZES = ["1000-2000", "2000-2500", "2500-3000", "3000-3500", "3500-4000", "4000-4500"]
+# (status, weight) of seeded bookings
+BOOKING_STATUSES = [("confirmed", 70), ("pending", 15), ("completed", 7), ("cancelled", 5), ("in_progress", 3)]
+# Share of assignable bookings that already have a cleaner
+ASSIGNED_SHARE = 0.85
+# Share of cleaner-slots manually marked unavailable
+BLOCKED_SHARE = 0.05
+INSERT_BATCH = 5000
+
+
+def _cleaner(i: int, rng: random.Random, now: str) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "email": f"cleaner{i}@bench.local",
+        "first_name": f"Cleaner{i}",
+        "last_name": "Bench",
+        "phone": f"(555) {i // 10000 % 1000:03d}-{i % 10000:04d}",
+        "is_active": rng.random() > 0.03,
+        "is_approved": rng.random() > 0.05,
+        "rating": round(rng.uniform(3.8, 5.0), 1),
+        "total_jobs": rng.choice([rng.randint(0, 19), rng.randint(20, 100), rng.randint(101, 400)]),
+        "experience_months": rng.randint(0, 72),
+        "preferred_house_sizes": rng.sample(HOUSE_SIZES, rng.choice([0, 0, 1, 2, 3])),
+        "google_calendar_id": "primary",
+        "calendar_integration_enabled": False,
+        "created_at": now,
+    }
+
+
+def _booking(booking_date: str, slot_id: int, status: str, cleaner_id: Optional[str], zip_code: str,
+             rng: random.Random, now: str) -> Dict[str, Any]:
+    slot = SLOTS[slot_id]
+    amount = float(rng.choice([129, 159, 189, 219, 249, 299]))
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "customer_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "house_size": rng.choice(HOUSE_SIZES),
+        "frequency": rng.choice(["one_time", "one_time", "weekly", "bi_weekly", "monthly"]),
+        "services": [],
+        "a_la_carte_services": [],
+        "booking_date": booking_date,
+        "time_slot": slot.label,
+        "slot_index": slot.id,
+        "base_price": amount,
+        "room_price": 0.0,
+        "a_la_carte_total": 0.0,
+        "total_amount": amount,
+        "status": status,
+        "payment_status": "paid" if status == "completed" else "pending",
+        "address": {"street": f"{rng.randint(100, 99999)} Bench St", "city": "Cypress", "state": "TX",
+                    "zip_code": zip_code},
+        "cleaner_id": cleaner_id,
+        "created_at": now,
+        "updated_at": now,
+        **booking_window_fields(booking_date, slot.label),
+    }
+
+
+def generate_workload(cleaner_count: int, booking_count: int, horizon_days: int, seed: int = 7,
+                      start_date: Optional[date] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Documents for each seeded collection, in memory"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    start = start_date or date.today()
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(horizon_days)]
+    zip_codes = list(load_travel_matrix().zip_codes)
+
+    cleaners = [_cleaner(i, rng, now) for i in range(cleaner_count)]
+    assignable = [c["id"] for c in cleaners if c["is_active"] and c["is_approved"]]
+    statuses, weights = zip(*BOOKING_STATUSES)
+
+    taken = set()  # (cleaner_id, date, slot) already booked
+    bookings = []
+    for _ in range(booking_count):
+        booking_date = rng.choice(dates)
+        slot_id = rng.randrange(len(SLOTS))
+        status = rng.choices(statuses, weights)[0]
+        cleaner_id = None
+        if status != "pending" and assignable and rng.random() < ASSIGNED_SHARE:
+            candidate = rng.choice(assignable)
+            if (candidate, booking_date, slot_id) not in taken:
+                cleaner_id = candidate
+                if status != "cancelled":
+                    taken.add((candidate, booking_date, slot_id))
+        if cleaner_id is None and status in ("in_progress", "completed"):
+            status = "pending"
+        bookings.append(_booking(booking_date, slot_id, status, cleaner_id, rng.choice(zip_codes), rng, now))
+
+    booked = {
+        (b["cleaner_id"], b["booking_date"], b["slot_index"]): b["id"]
+        for b in bookings if b["cleaner_id"] and b["status"] != "cancelled"
+    }
+    availability = []
+    for cleaner in cleaners:
+        for booking_date in dates:
+            for slot in SLOTS:
+                booking_id = booked.get((cleaner["id"], booking_date, slot.id))
+                availability.append({
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "cleaner_id": cleaner["id"],
+                    "date": booking_date,
+                    "time_slot": slot.label,
+                    "slot_index": slot.id,
+                    "is_available": booking_id is not None or rng.random() > BLOCKED_SHARE,
+                    "is_booked": booking_id is not None,
+                    "booking_id": booking_id,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+    time_slots = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "date": booking_date,
+            "time_slot": slot.label,
+            "slot_index": slot.id,
+            "total_capacity": len(assignable),
+            "booked_count": sum(1 for (_, d, s) in booked if d == booking_date and s == slot.id),
+            "is_available": True,
+            "is_blocked": False,
+            "blocked_reason": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for booking_date in dates for slot in SLOTS
+    ]
+    return {"cleaners": cleaners, "bookings": bookings, "cleaner_availability": availability,
+            "time_slot_availability": time_slots}
+
+
+async def seed_workload(db: AsyncIOMotorDatabase, cleaner_count: int, booking_count: Optional[int] = None,
+                        horizon_days: int = 14, seed: int = 7) -> Dict[str, Any]:
+    """Drop the seeded collections, insert a generated workload and build the app's indexes"""
+    started = time.perf_counter()
+    if booking_count is None:
+        booking_count = cleaner_count * 4
+    workload = generate_workload(cleaner_count, booking_count, horizon_days, seed)
+    for name in SEEDED_COLLECTIONS:
+        await db.drop_collection(name)
+    counts = {}
+    for name, documents in workload.items():
+        for i in range(0, len(documents), INSERT_BATCH):
+            await db[name].insert_many(documents[i:i + INSERT_BATCH], ordered=False)
+        counts[name] = len(documents)
+    try:
+        await ensure_indexes(db)
+        indexes = True
+    except Exception:
+        # mongomock does not support every index option
+        indexes = False
+    return {
+        "cleaners": cleaner_count,
+        "bookings": booking_count,
+        "horizon_days": horizon_days,
+        "seed": seed,
+        "documents": counts,
+        "indexes": indexes,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+async def main(args):
+    if args.db_name == os.getenv("DB_NAME"):
+        sys.exit(f"Refusing to seed {args.db_name}: it is the application database (DB_NAME)")
+    client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    try:
+        result = await seed_workload(client[args.db_name], args.cleaners, args.bookings, args.horizon_days, args.seed)
+        print(f"Seeded {args.db_name}: {result}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a synthetic scheduling workload")
+    parser.add_argument("--cleaners", type=int, required=True)
+    parser.add_argument("--bookings", type=int, help="Default: 4 per cleaner")
+    parser.add_argument("--horizon-days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db-name", default=BENCH_DB_NAME)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Index Manifest Tool
+Apply the index manifest, or replace an existing index whose definition
+conflicts with it (startup never drops indexes):
+
+    python manage_indexes.py apply
+    python manage_indexes.py rebuild COLLECTION NAME [--allow-weaker]
+
+A rebuild drops the index before creating it again, so run it when traffic
+is low and with a single app worker.
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from services.db_indexes import ensure_indexes, rebuild_index
+import logging
+
+load_dotenv(backend_dir / '.env')
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+async def main(args):
+    """
+    Main function to apply the manifest or rebuild one index
+    """
+    mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DB_NAME", "maidsofcyfair")
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        db = client[db_name]
+        if args.command == "rebuild":
+            await rebuild_index(db, args.collection, args.name, allow_weaker=args.allow_weaker)
+            return 0
+        results = await ensure_indexes(db)
+        failed = 0
+        for collection, indexes in results.items():
+            for name, outcome in indexes.items():
+                logger.info(f"{collection}.{name}: {outcome}")
+                failed += outcome != "ok"
+        return 1 if failed else 0
+
+    except Exception as e:
+        logger.error(f"Index command failed: {e}")
+        return 1
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the index manifest or rebuild one index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("apply", help="Create missing indexes; report conflicts")
+    rebuild = subparsers.add_parser("rebuild", help="Replace an index with its manifest definition")
+    rebuild.add_argument("collection")
+    rebuild.add_argument("name")
+    rebuild.add_argument("--allow-weaker", action="store_true",
+                         help="Allow replacing a unique index with a non-unique definition")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,23 @@
+from .runner import Migration, MigrationRunner, MIGRATIONS_COLLECTION, DELETE_DOCUMENT
+from .m0001_normalize_booking_enums import NormalizeBookingEnums
+from .m0002_backfill_booking_windows import BackfillBookingWindows
+from .m0003_dedupe_cleaner_availability import DedupeCleanerAvailability
+from .m0004_dedupe_time_slot_availability import DedupeTimeSlotAvailability
+from .m0005_build_daily_counters import BuildDailyCounters
+from .m0006_backfill_cleaner_availability_slot_index import BackfillCleanerAvailabilitySlotIndex
+from .m0007_backfill_time_slot_availability_slot_index import BackfillTimeSlotAvailabilitySlotIndex
+from .m0008_backfill_booking_slot_index import BackfillBookingSlotIndex
+
+# Registered migrations, applied in version order (one m<version> module each)
+MIGRATIONS = [
+    NormalizeBookingEnums(),
+    BackfillBookingWindows(),
+    DedupeCleanerAvailability(),
+    DedupeTimeSlotAvailability(),
+    BuildDailyCounters(),
+    BackfillCleanerAvailabilitySlotIndex(),
+    BackfillTimeSlotAvailabilitySlotIndex(),
+    BackfillBookingSlotIndex(),
+]
+
+__all__ = ["Migration", "MigrationRunner", "MIGRATIONS", "MIGRATIONS_COLLECTION", "DELETE_DOCUMENT"]
@@ -0,0 +1,47 @@
+"""
+Normalize legacy booking enum values in storage.
+
+House sizes follow the mapping documented on the HouseSize enum (legacy
+ranges fold into the current sq ft tiers); "1200-1500" was never a valid
+member and is folded the same way. Bedroom/small/medium/large descriptions
+are valid members with no reliable sq ft equivalent and are left as is.
+"""
+from typing import Any, Dict, Optional
+from .runner import Migration
+
+HOUSE_SIZE_MAP = {
+    "1000-1500": "1000-2000",
+    "1200-1500": "1000-2000",
+    "1500-2000": "1000-2000",
+    "5000+": "5000-6000",
+}
+PAYMENT_STATUS_MAP = {"completed": "paid"}
+FREQUENCY_MAP = {"biweekly": "bi_weekly"}
+
+
+class NormalizeBookingEnums(Migration):
+    version = 1
+    name = "normalize_booking_enums"
+    collection = "bookings"
+
+    def query(self) -> Dict[str, Any]:
+        return {"$or": [
+            {"house_size": {"$in": list(HOUSE_SIZE_MAP)}},
+            {"payment_status": {"$in": list(PAYMENT_STATUS_MAP)}},
+            {"frequency": {"$in": list(FREQUENCY_MAP)}},
+        ]}
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        return {"house_size": 1, "payment_status": 1, "frequency": 1}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        changes = {}
+        for field, mapping in (
+            ("house_size", HOUSE_SIZE_MAP),
+            ("payment_status", PAYMENT_STATUS_MAP),
+            ("frequency", FREQUENCY_MAP),
+        ):
+            value = doc.get(field)
+            if value in mapping:
+                changes[field] = mapping[value]
+        return {"$set": changes} if changes else None
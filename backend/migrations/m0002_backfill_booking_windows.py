@@ -0,0 +1,26 @@
+"""
+Backfill start_at/end_at on bookings written before they were stored.
+
+The window is derived from booking_date and time_slot exactly as on write
+(see services.booking_times); bookings without a parseable date are left
+alone and simply stay out of range queries.
+"""
+from typing import Any, Dict, Optional
+from services.booking_times import booking_window_fields
+from .runner import Migration
+
+
+class BackfillBookingWindows(Migration):
+    version = 2
+    name = "backfill_booking_windows"
+    collection = "bookings"
+
+    def query(self) -> Dict[str, Any]:
+        return {"start_at": {"$exists": False}}
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        return {"booking_date": 1, "time_slot": 1}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        fields = booking_window_fields(doc.get("booking_date"), doc.get("time_slot"))
+        return {"$set": fields} if fields else None
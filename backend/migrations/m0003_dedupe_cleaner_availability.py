@@ -0,0 +1,13 @@
+"""
+Remove duplicate cleaner_availability rows so (cleaner_id, date, time_slot)
+can be unique. Booked rows are kept first, then blocked ones, then the oldest.
+"""
+from .templates import DedupeSlotsMigration
+
+
+class DedupeCleanerAvailability(DedupeSlotsMigration):
+    version = 3
+    name = "dedupe_cleaner_availability"
+    collection = "cleaner_availability"
+    key_fields = ["cleaner_id", "date", "time_slot"]
+    keep_order = {"is_booked": -1, "is_available": 1, "created_at": 1}
@@ -0,0 +1,13 @@
+"""
+Remove duplicate time_slot_availability rows so (date, time_slot) can be
+unique. Blocked rows are kept first, then the most booked, then the oldest.
+"""
+from .templates import DedupeSlotsMigration
+
+
+class DedupeTimeSlotAvailability(DedupeSlotsMigration):
+    version = 4
+    name = "dedupe_time_slot_availability"
+    collection = "time_slot_availability"
+    key_fields = ["date", "time_slot"]
+    keep_order = {"is_blocked": -1, "booked_count": -1, "created_at": 1}
@@ -0,0 +1,10 @@
+"""
+Backfill slot_index on cleaner_availability documents written before it was stored.
+"""
+from .templates import BackfillSlotIndexMigration
+
+
+class BackfillCleanerAvailabilitySlotIndex(BackfillSlotIndexMigration):
+    version = 6
+    name = "backfill_cleaner_availability_slot_index"
+    collection = "cleaner_availability"
@@ -0,0 +1,10 @@
+"""
+Backfill slot_index on time_slot_availability documents written before it was stored.
+"""
+from .templates import BackfillSlotIndexMigration
+
+
+class BackfillTimeSlotAvailabilitySlotIndex(BackfillSlotIndexMigration):
+    version = 7
+    name = "backfill_time_slot_availability_slot_index"
+    collection = "time_slot_availability"
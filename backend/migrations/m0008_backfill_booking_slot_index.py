@@ -0,0 +1,10 @@
+"""
+Backfill slot_index on bookings documents written before it was stored.
+"""
+from .templates import BackfillSlotIndexMigration
+
+
+class BackfillBookingSlotIndex(BackfillSlotIndexMigration):
+    version = 8
+    name = "backfill_booking_slot_index"
+    collection = "bookings"
@@ -0,0 +1,159 @@
+"""
+Data Migration Runner
+Applies versioned data migrations in order. Each migration walks its
+collection in `_id` order and writes in batches with bulk_write; progress is
+checkpointed in the `migrations` collection so an interrupted run resumes
+from the last completed batch.
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "migrations"
+
+# Returned by Migration.transform() to remove the document instead of updating it
+DELETE_DOCUMENT = {"$delete": True}
+
+
+class Migration:
+    """Base class for a document-by-document data migration"""
+
+    version: int = 0
+    name: str = ""
+    collection: str = ""
+    batch_size: int = 500
+
+    def query(self) -> Dict[str, Any]:
+        """Filter selecting the documents that may need changes"""
+        return {}
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        """Fields transform() needs; None loads whole documents"""
+        return None
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the update document for `doc`, None to leave it unchanged,
+        or DELETE_DOCUMENT to remove it"""
+        raise NotImplementedError
+
+    async def before(self, db: AsyncIOMotorDatabase) -> None:
+        """Hook run once before the first batch"""
+
+    async def after(self, db: AsyncIOMotorDatabase) -> None:
+        """Hook run once after the last batch"""
+
+
+class MigrationRunner:
+    def __init__(self, db: AsyncIOMotorDatabase, migrations: List[Migration]):
+        self.db = db
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.records = db[MIGRATIONS_COLLECTION]
+
+        versions = [m.version for m in self.migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError("Duplicate migration versions")
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """Report the state of every known migration"""
+        records = {r["_id"]: r async for r in self.records.find({})}
+        report = []
+        for migration in self.migrations:
+            record = records.get(migration.version, {})
+            report.append({
+                "version": migration.version,
+                "name": migration.name,
+                "status": record.get("status", "pending"),
+                "processed": record.get("processed", 0),
+                "modified": record.get("modified", 0),
+                "completed_at": record.get("completed_at"),
+            })
+        return report
+
+    async def run(self, target: Optional[int] = None, dry_run: bool = False) -> List[Dict[str, Any]]:
+        """Apply every pending migration up to and including `target`"""
+        results = []
+        for migration in self.migrations:
+            if target is not None and migration.version > target:
+                break
+            record = await self.records.find_one({"_id": migration.version})
+            if record and record.get("status") == "completed":
+                continue
+            results.append(await self._apply(migration, record, dry_run))
+        return results
+
+    async def _apply(self, migration: Migration, record: Optional[Dict[str, Any]], dry_run: bool) -> Dict[str, Any]:
+        label = f"{migration.version:04d}_{migration.name}"
+        last_id = record.get("last_id") if record else None
+        processed = record.get("processed", 0) if record else 0
+        modified = record.get("modified", 0) if record else 0
+
+        if last_id is not None:
+            logger.info(f"Resuming migration {label} after _id {last_id}")
+        else:
+            logger.info(f"Starting migration {label}")
+
+        if not dry_run:
+            await self.records.update_one(
+                {"_id": migration.version},
+                {
+                    "$set": {"name": migration.name, "status": "running"},
+                    "$setOnInsert": {"started_at": datetime.now(timezone.utc)},
+                },
+                upsert=True,
+            )
+        await migration.before(self.db)
+
+        collection = self.db[migration.collection]
+        base_query = migration.query()
+        would_modify = 0
+
+        while True:
+            query = dict(base_query)
+            if last_id is not None:
+                query = {"$and": [base_query, {"_id": {"$gt": last_id}}]} if base_query else {"_id": {"$gt": last_id}}
+            batch = await collection.find(query, migration.projection()).sort("_id", 1).limit(
+                migration.batch_size
+            ).to_list(migration.batch_size)
+            if not batch:
+                break
+
+            operations = []
+            for doc in batch:
+                update = migration.transform(doc)
+                if update is DELETE_DOCUMENT:
+                    operations.append(DeleteOne({"_id": doc["_id"]}))
+                elif update:
+                    operations.append(UpdateOne({"_id": doc["_id"]}, update))
+
+            processed += len(batch)
+            last_id = batch[-1]["_id"]
+            if dry_run:
+                would_modify += len(operations)
+                continue
+
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count + result.deleted_count
+            # Checkpoint after each batch so a crash resumes here
+            await self.records.update_one(
+                {"_id": migration.version},
+                {"$set": {"last_id": last_id, "processed": processed, "modified": modified}},
+            )
+
+        if dry_run:
+            logger.info(f"Dry run of {label}: {processed} scanned, {would_modify} would change")
+            return {"version": migration.version, "name": migration.name, "dry_run": True,
+                    "processed": processed, "would_modify": would_modify}
+
+        await migration.after(self.db)
+        await self.records.update_one(
+            {"_id": migration.version},
+            {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc)}},
+        )
+        logger.info(f"Completed migration {label}: {processed} scanned, {modified} modified")
+        return {"version": migration.version, "name": migration.name,
+                "processed": processed, "modified": modified}
@@ -0,0 +1,71 @@
+"""
+Migration Templates
+Shared bases for migrations that run the same steps over several
+collections; each version subclasses one in its own m<version> module.
+"""
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.db_indexes import ensure_collection_indexes
+from services.slots import slot_fields
+from .runner import Migration, DELETE_DOCUMENT
+
+
+class DedupeSlotsMigration(Migration):
+    """Remove duplicate rows of a slot key so its unique index can be applied.
+
+    Availability used to be initialized with find_one + insert_one per slot, so
+    concurrent approvals or restarts could insert the same key twice. For each
+    duplicated key the most informative row is kept (keep_order puts it first)
+    and the rest are deleted; the manifest's indexes are re-applied afterwards.
+    """
+
+    key_fields: List[str] = []
+    # Sort order that puts the row to keep first within each key
+    keep_order: Dict[str, int] = {}
+
+    def __init__(self):
+        self._duplicate_ids: List[Any] = []
+
+    async def before(self, db: AsyncIOMotorDatabase) -> None:
+        pipeline = [
+            {"$sort": {**{field: 1 for field in self.key_fields}, **self.keep_order}},
+            {"$group": {
+                "_id": {field: f"${field}" for field in self.key_fields},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1},
+            }},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        self._duplicate_ids = []
+        async for group in db[self.collection].aggregate(pipeline, allowDiskUse=True):
+            self._duplicate_ids.extend(group["ids"][1:])
+
+    def query(self) -> Dict[str, Any]:
+        return {"_id": {"$in": self._duplicate_ids}}
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        return {"_id": 1}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return DELETE_DOCUMENT
+
+    async def after(self, db: AsyncIOMotorDatabase) -> None:
+        await ensure_collection_indexes(db, self.collection)
+
+
+class BackfillSlotIndexMigration(Migration):
+    """Backfill slot_index on documents written before it was stored.
+
+    The id is resolved from time_slot exactly as on write (see services.slots);
+    documents whose slot is not in the catalog are left without one.
+    """
+
+    def query(self) -> Dict[str, Any]:
+        return {"slot_index": {"$exists": False}, "time_slot": {"$type": "string"}}
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        return {"time_slot": 1}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        fields = slot_fields(doc.get("time_slot"))
+        return {"$set": fields} if fields else None
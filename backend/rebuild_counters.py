@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Daily Counters Rebuild
+Recompute the per-date booking counters from the bookings collection:
+
+    python rebuild_counters.py [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from services.daily_counters import rebuild_daily_counters
+import logging
+
+load_dotenv(backend_dir / '.env')
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+async def main(args):
+    """
+    Main function to rebuild the daily counters
+    """
+    mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DB_NAME", "maidsofcyfair")
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        result = await rebuild_daily_counters(client[db_name], start_date=args.start, end_date=args.end)
+        logger.info(f"Rebuilt {result['rebuilt']} dates, removed {result['removed']} empty dates")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Counter rebuild failed: {e}")
+        return 1
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily booking counters")
+    parser.add_argument("--from", dest="start", default=None, help="First booking date to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", default=None, help="Last booking date to rebuild (YYYY-MM-DD)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Capacity Ledger Repair
+Recount bookings per date and correct the daily capacity ledger:
+
+    python repair_capacity.py [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from services.capacity import reconcile_capacity
+import logging
+
+load_dotenv(backend_dir / '.env')
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+async def main(args):
+    """
+    Main function to reconcile the capacity ledger
+    """
+    mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DB_NAME", "maidsofcyfair")
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        result = await reconcile_capacity(client[db_name], start_date=args.start, end_date=args.end)
+        for entry in result["corrected"]:
+            logger.info(f"{entry['date']}: ledger {entry['recorded']} -> {entry['actual']}")
+        if result["skipped"]:
+            logger.info(f"Skipped recently written dates: {', '.join(result['skipped'])}")
+        logger.info(f"Checked {result['checked']} dates, corrected {len(result['corrected'])}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Capacity repair failed: {e}")
+        return 1
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repair the daily capacity ledger")
+    parser.add_argument("--from", dest="start", default=None, help="First booking date to check (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", default=None, help="Last booking date to check (YYYY-MM-DD)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,3 @@
+from .loaders import BatchLoader, RequestLoaders, documents_by_field, latest_document_by_field
+
+__all__ = ["BatchLoader", "RequestLoaders", "documents_by_field", "latest_document_by_field"]
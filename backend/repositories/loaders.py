@@ -0,0 +1,105 @@
+"""
+Batch Loaders
+DataLoader-style helpers that turn per-row find_one() calls into a single
+`$in` query. Each loader memoizes what it fetched, so one instance should live
+for exactly one request (see RequestLoaders).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class BatchLoader:
+    """Resolve keys in batches with per-instance memoization"""
+
+    def __init__(self, batch_fn: BatchFn):
+        self._batch_fn = batch_fn
+        self._cache: Dict[Hashable, Any] = {}
+        self._queue: Dict[Hashable, asyncio.Future] = {}
+        self._dispatch_scheduled = False
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Fetch every key not already cached in one round trip"""
+        wanted = [key for key in dict.fromkeys(keys) if key is not None]
+        missing = [key for key in wanted if key not in self._cache]
+        if missing:
+            found = await self._batch_fn(missing)
+            for key in missing:
+                self._cache[key] = found.get(key)
+        return {key: self._cache[key] for key in wanted}
+
+    async def load(self, key: Hashable) -> Any:
+        """Fetch one key; loads issued in the same loop tick share a query"""
+        if key is None:
+            return None
+        if key in self._cache:
+            return self._cache[key]
+        future = self._queue.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._queue[key] = future
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                asyncio.get_running_loop().call_soon(self._start_dispatch)
+        return await future
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Seed the cache with a value fetched elsewhere"""
+        self._cache[key] = value
+
+    def _start_dispatch(self) -> None:
+        self._dispatch_task = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        queued, self._queue = self._queue, {}
+        self._dispatch_scheduled = False
+        try:
+            found = await self.load_many(queued.keys())
+        except Exception as e:
+            for future in queued.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in queued.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+
+def documents_by_field(collection, field: str = "id",
+                       projection: Optional[Dict[str, Any]] = None) -> BatchFn:
+    """Batch function returning the document matching each key of `field`"""
+    async def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+        cursor = collection.find({field: {"$in": keys}}, projection)
+        return {doc[field]: doc async for doc in cursor}
+    return batch
+
+
+def latest_document_by_field(collection, field: str, sort_field: str = "created_at",
+                             projection: Optional[Dict[str, Any]] = None) -> BatchFn:
+    """Batch function returning the newest document for each key of `field`"""
+    async def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {field: {"$in": keys}}},
+            {"$sort": {field: 1, sort_field: -1}},
+        ]
+        if projection:
+            # The projection must keep `field`, which the $group stage keys on
+            pipeline.append({"$project": projection})
+        pipeline.append({"$group": {"_id": f"${field}", "doc": {"$first": "$$ROOT"}}})
+        return {row["_id"]: row["doc"] async for row in collection.aggregate(pipeline)}
+    return batch
+
+
+class RequestLoaders:
+    """The loaders available to one request"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.users = BatchLoader(documents_by_field(db.users, "id", {"_id": 0, "password_hash": 0}))
+        self.cleaners = BatchLoader(documents_by_field(db.cleaners, "id", {"_id": 0}))
+        self.services = BatchLoader(documents_by_field(db.services, "id", {"_id": 0}))
+        self.latest_booking_by_user = BatchLoader(
+            latest_document_by_field(db.bookings, "user_id", projection={"_id": 0, "user_id": 1, "address": 1})
+        )
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Data Migrations Runner
+Apply pending data migrations or show their status:
+
+    python run_migrations.py status
+    python run_migrations.py up [--to VERSION] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from migrations import MIGRATIONS, MigrationRunner
+import logging
+
+load_dotenv(backend_dir / '.env')
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+async def main(args):
+    """
+    Main function to run or report migrations
+    """
+    mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    db_name = os.getenv("DB_NAME", "maidsofcyfair")
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        runner = MigrationRunner(client[db_name], MIGRATIONS)
+
+        if args.command == "status":
+            for entry in await runner.status():
+                print(f"{entry['version']:04d}  {entry['name']:<40} {entry['status']:<10} "
+                      f"processed={entry['processed']} modified={entry['modified']}")
+            return 0
+
+        results = await runner.run(target=args.to, dry_run=args.dry_run)
+        if not results:
+            logger.info("No pending migrations")
+        for result in results:
+            logger.info(f"Migration result: {result}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Migration run failed: {e}")
+        return 1
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply versioned data migrations")
+    parser.add_argument("command", choices=["status", "up"], help="Show status or apply pending migrations")
+    parser.add_argument("--to", type=int, default=None, help="Stop after this migration version")
+    parser.add_argument("--dry-run", action="store_true", help="Scan and count changes without writing")
+    sys.exit(asyncio.run(main(parser.parse_args())))
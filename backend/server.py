@@ -1,19 +1,22 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends, status, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from contextlib import asynccontextmanager
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from bson import ObjectId
 import os
 import json
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 from datetime import datetime, date, time, timezone, timedelta
 from enum import Enum
@@ -23,6 +26,34 @@ import stripe
 from stripe import StripeError
 import httpx
 from services.email_service import email_service
+from services.db_indexes import ensure_indexes, explain_hot_queries, has_unique_index
+from services.availability_horizon import fill_missing_slots, horizon_dates
+from services.analytics_db import create_analytics_client, AnalyticsDatabase
+from services.availability_index import AvailabilityIndex
+from services.calendar_heatmap import load_heatmap
+from services.cleaner_profiles import CleanerProfileCache
+from services.cleaner_scoring import load_cleaner_load, load_unavailable, rank_cleaners
+from services.day_optimizer import optimize_day
+from services.response_cache import DateRangeCache
+from services.date_versions import bump_versions, get_versions, make_etag, etag_matches, ROSTER_KEY
+from services.calendar_stream import CalendarEventBus, format_sse, supports_change_streams, watch_collections
+from services.db_metrics import (
+    command_listener, db_metrics, begin_request, DB_METRICS_ENABLED, DB_METRICS_DEBUG_HEADER
+)
+from repositories import RequestLoaders
+from migrations import MIGRATIONS, MigrationRunner
+from services.booking_times import booking_window_fields, local_date_range, to_local_iso
+from services.travel_matrix import booking_zip, load_travel_matrix
+from services.slots import SLOT_LABELS, get_slot, slot_catalog, slot_clock_range, slot_fields, slot_index
+from services.capacity import (
+    reserve_capacity, release_capacity, release_capacity_many, apply_booking_change,
+    get_reserved, reconcile_capacity, CAPACITY_COLLECTION
+)
+from services.daily_counters import (
+    transition_booking_status, record_booking_created, record_booking_change, apply_counter_changes,
+    get_daily_counters, sum_counters, rebuild_daily_counters, add_change_listener, COUNTERS_COLLECTION
+)
+from services.pagination import paginate, paginate_pipeline, page_headers, cursor_filter, page_size, InvalidCursorError
 from urllib.parse import quote_plus
 
 
@@ -44,6 +75,9 @@ max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
 min_pool_size = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
 max_idle_time_ms = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "30000"))
 
+# Per-request command instrumentation (see services/db_metrics.py)
+mongo_event_listeners = [command_listener] if DB_METRICS_ENABLED else []
+
 client = AsyncIOMotorClient(
     mongo_url,
     maxPoolSize=max_pool_size,
@@ -53,10 +87,16 @@ client = AsyncIOMotorClient(
     connectTimeoutMS=10000,        # 10 second connection timeout
     socketTimeoutMS=20000,         # 20 second socket timeout
     retryWrites=True,              # Enable retryable writes for cloud
-    retryReads=True                # Enable retryable reads for cloud
+    retryReads=True,               # Enable retryable reads for cloud
+    event_listeners=mongo_event_listeners
 )
 db = client[db_name]
 
+# Reports, exports and admin stats read through a separate pool (secondaries
+# preferred) so they cannot starve booking traffic of connections
+analytics_client = create_analytics_client(os.getenv("ANALYTICS_MONGO_URL") or mongo_url, mongo_event_listeners)
+analytics_db = AnalyticsDatabase(analytics_client[db_name])
+
 # Stripe Configuration
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY")
@@ -73,6 +113,11 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "https://foodsensescale.tech")
 # Servicable zip codes
 SERVICABLE_ZIP_CODES = ['77433', '77429', '77095', '77377', '77070', '77065']
 
+# Drive minutes between serviced zip codes (data/zip_travel_minutes.json), for route-aware assignment
+travel_matrix = load_travel_matrix()
+if travel_matrix.missing(SERVICABLE_ZIP_CODES):
+    print(f"Warning: No travel times for zip codes {', '.join(travel_matrix.missing(SERVICABLE_ZIP_CODES))}")
+
 # Business capacity settings
 MAX_DAILY_BOOKINGS = 10  # Maximum bookings per day
 
@@ -83,11 +128,8 @@ def validate_zip_code(zip_code: str) -> bool:
 async def check_daily_capacity(booking_date: str) -> dict:
     """Check if we've reached daily capacity for a given date"""
     try:
-        # Count confirmed and in-progress bookings for the date
-        booking_count = await db.bookings.count_documents({
-            "booking_date": booking_date,
-            "status": {"$in": ["confirmed", "in_progress"]}
-        })
+        # Capacity reserved on the date (see services/capacity.py)
+        booking_count = (await get_reserved(db, [booking_date]))[booking_date]
         
         is_at_capacity = booking_count >= MAX_DAILY_BOOKINGS
         
@@ -106,6 +148,196 @@ async def check_daily_capacity(booking_date: str) -> dict:
             "available_slots": MAX_DAILY_BOOKINGS
         }
 
+index_build_task = None
+
+async def apply_index_manifest():
+    """Create or update the indexes declared in services/db_indexes.py"""
+    try:
+        results = await ensure_indexes(db)
+        failed = [
+            f"{collection}.{name}"
+            for collection, indexes in results.items()
+            for name, outcome in indexes.items()
+            if outcome != "ok"
+        ]
+        if failed:
+            print(f"Warning: some indexes were not applied: {', '.join(failed)}")
+        else:
+            print("Database indexes applied successfully")
+    except Exception as e:
+        print(f"Warning: Index build failed: {str(e)}")
+
+migration_task = None
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() == "true"
+
+async def apply_pending_migrations():
+    """Run pending data migrations (see run_migrations.py for the CLI)"""
+    try:
+        results = await MigrationRunner(db, MIGRATIONS).run()
+        for result in results:
+            print(f"Applied migration {result['version']:04d}_{result['name']}: {result.get('modified', 0)} documents updated")
+    except Exception as e:
+        print(f"Warning: Data migrations failed: {str(e)}")
+
+capacity_reconcile_task = None
+CAPACITY_RECONCILE_INTERVAL_SECONDS = int(os.getenv("CAPACITY_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+async def capacity_reconcile_loop():
+    """Repair drift in the daily capacity ledger for today onwards.
+
+    The first pass also seeds the ledger from existing bookings.
+    """
+    while True:
+        try:
+            today = datetime.now().strftime("%Y-%m-%d")
+            result = await reconcile_capacity(db, start_date=today)
+            if result["corrected"]:
+                print(f"Capacity ledger corrected for {len(result['corrected'])} dates")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Capacity reconciliation failed: {str(e)}")
+        await asyncio.sleep(CAPACITY_RECONCILE_INTERVAL_SECONDS)
+
+availability_horizon_task = None
+AVAILABILITY_HORIZON_DAYS = int(os.getenv("AVAILABILITY_HORIZON_DAYS", "90"))
+
+# Cleaner x date x slot availability served from memory (services/availability_index.py)
+availability_index = AvailabilityIndex(db, horizon_days=AVAILABILITY_HORIZON_DAYS)
+availability_check_task = None
+AVAILABILITY_INDEX_CHECK_SECONDS = int(os.getenv("AVAILABILITY_INDEX_CHECK_SECONDS", "600"))
+
+# Cleaner scoring features and recent loads served from memory (services/cleaner_profiles.py)
+cleaner_profiles = CleanerProfileCache(db)
+add_change_listener(cleaner_profiles.record_booking_changes)
+cleaner_profile_task = None
+CLEANER_PROFILE_REFRESH_SECONDS = int(os.getenv("CLEANER_PROFILE_REFRESH_SECONDS", "300"))
+
+# Customer date picker responses, keyed by requested range
+AVAILABLE_DATES_CACHE_SECONDS = int(os.getenv("AVAILABLE_DATES_CACHE_SECONDS", "60"))
+available_dates_cache = DateRangeCache(ttl_seconds=AVAILABLE_DATES_CACHE_SECONDS)
+
+# Calendar deltas pushed to admin dashboards (/api/admin/calendar/stream)
+calendar_events = CalendarEventBus()
+calendar_stream_task = None
+# "auto" follows MongoDB change streams when running on a replica set; "off" never does
+CALENDAR_CHANGE_STREAMS = os.getenv("CALENDAR_CHANGE_STREAMS", "auto").lower()
+CALENDAR_STREAM_HEARTBEAT_SECONDS = 15
+# Backoff between change stream (re)connection attempts
+CALENDAR_STREAM_RETRY_SECONDS = (5, 300)
+# Lifetime of the ticket that authorizes opening /api/admin/calendar/stream
+CALENDAR_STREAM_TICKET_SECONDS = 60
+
+async def invalidate_date_caches(*dates: Optional[str], index: bool = True, event: Optional[dict] = None):
+    """Single entry point for writes that change bookings, blocks or availability on `dates`.
+
+    Drops cached responses, bumps the dates' versions (ETags), publishes
+    `event` (default: a plain "dates_changed") to calendar subscribers and,
+    unless index=False because the caller already updated it in place,
+    reloads the availability index for them.
+    """
+    available_dates_cache.invalidate(dates)
+    if index:
+        availability_index.invalidate(*dates)
+    await bump_versions(db, dates)
+    calendar_events.publish({"type": "dates_changed", **(event or {}), "dates": sorted({d for d in dates if d})})
+
+async def invalidate_roster_caches(*cleaner_ids: Optional[str]):
+    """Cleaners were added, removed, approved or reset; every date's view changes"""
+    availability_index.invalidate_roster()
+    await cleaner_profiles.reload(*cleaner_ids)
+    await bump_versions(db, [ROSTER_KEY])
+    calendar_events.publish({"type": "resync", "dates": [], "reason": "roster"}, source="any")
+
+async def transition_booking(query: dict, changes: dict, index: bool = True) -> Optional[dict]:
+    """transition_booking_status() plus cache and version invalidation of the booking's dates"""
+    previous = await transition_booking_status(db, query, changes)
+    if previous is not None:
+        booking = {**previous, **changes}
+        await invalidate_date_caches(
+            previous.get("booking_date"), changes.get("booking_date"), index=index,
+            event={"type": "booking", "booking": {
+                field: booking.get(field) for field in ("id", "status", "cleaner_id", "booking_date", "time_slot")
+            }}
+        )
+    return previous
+
+async def conditional_get(request: Request, response: Response, scope: str, date: str) -> Optional[Response]:
+    """Set the ETag of a per-date view; returns a 304 response if the client copy is current"""
+    etag = make_etag(f"{scope}-{date}", await get_versions(db, [date, ROSTER_KEY]))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return None
+
+async def calendar_change_stream_loop():
+    """Follow MongoDB change streams for calendar events when the deployment supports them.
+
+    Runs in the background so an unreachable MongoDB does not hold up startup;
+    the probe and the stream are retried with exponential backoff after any error.
+    """
+    delay, max_delay = CALENDAR_STREAM_RETRY_SECONDS
+    while True:
+        started = asyncio.get_running_loop().time()
+        try:
+            if not await supports_change_streams(client):
+                print("Calendar events use the in-process bus (MongoDB is not a replica set)")
+                return
+            await watch_collections(db, calendar_events)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Calendar change stream failed: {str(e)}")
+        if asyncio.get_running_loop().time() - started > max_delay:
+            delay = CALENDAR_STREAM_RETRY_SECONDS[0]  # The stream was up for a while
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+async def availability_index_check_loop():
+    """Periodically compare the in-memory availability index with MongoDB"""
+    while True:
+        await asyncio.sleep(AVAILABILITY_INDEX_CHECK_SECONDS)
+        try:
+            result = await availability_index.check_consistency()
+            # Drift came from writes that bypassed the API; their ETags are stale too
+            await bump_versions(db, result["repaired"] + ([ROSTER_KEY] if result["roster_changed"] else []))
+            if result["repaired"]:
+                # Change streams already delivered these if they are running
+                calendar_events.publish({"type": "dates_changed", "dates": result["repaired"]})
+            if result["roster_changed"]:
+                # Cleaners are not watched by the change stream; resync in either mode
+                calendar_events.publish({"type": "resync", "dates": [], "reason": "roster"}, source="any")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Availability index check failed: {str(e)}")
+
+async def cleaner_profile_refresh_loop():
+    """Load the cleaner profile cache, then rebuild it to repair writes that bypassed the API"""
+    while True:
+        try:
+            await cleaner_profiles.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Cleaner profile refresh failed: {str(e)}")
+        await asyncio.sleep(CLEANER_PROFILE_REFRESH_SECONDS)
+
+async def availability_horizon_loop():
+    """Extend the availability tables by the missing days, once a day"""
+    while True:
+        try:
+            result = await extend_availability_horizon()
+            if result["time_slot_rows"] or result["cleaner_rows"]:
+                print(f"Availability horizon extended: {result['time_slot_rows']} slot rows, "
+                      f"{result['cleaner_rows']} cleaner rows")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Extending availability horizon failed: {str(e)}")
+        await asyncio.sleep(24 * 60 * 60)
+
 # Lifespan event handler
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -115,6 +347,18 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Warning: Database initialization failed: {str(e)}")
         print("Running in test mode without database")
+    # Index builds can take a while on large collections; don't hold up startup
+    global index_build_task, migration_task, capacity_reconcile_task, availability_horizon_task, availability_check_task
+    global calendar_stream_task, cleaner_profile_task
+    index_build_task = asyncio.create_task(apply_index_manifest())
+    if RUN_MIGRATIONS_ON_STARTUP:
+        migration_task = asyncio.create_task(apply_pending_migrations())
+    capacity_reconcile_task = asyncio.create_task(capacity_reconcile_loop())
+    availability_horizon_task = asyncio.create_task(availability_horizon_loop())
+    availability_check_task = asyncio.create_task(availability_index_check_loop())
+    cleaner_profile_task = asyncio.create_task(cleaner_profile_refresh_loop())
+    if CALENDAR_CHANGE_STREAMS != "off":
+        calendar_stream_task = asyncio.create_task(calendar_change_stream_loop())
     try:
         # Try to import and initialize reminder services
         from services.reminder_service import ReminderService
@@ -132,8 +376,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Error initializing reminder service: {str(e)}")
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown
+    for task in (capacity_reconcile_task, availability_horizon_task, availability_check_task, calendar_stream_task,
+                 cleaner_profile_task):
+        if task:
+            task.cancel()
 
 # Create the main app without a prefix
 app = FastAPI(title="Maids of Cyfair Booking System", lifespan=lifespan)
@@ -287,6 +534,7 @@ class TimeSlot(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     date: str
     time_slot: str
+    slot_index: Optional[int] = None  # Catalog id (services.slots)
     is_available: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -372,7 +620,8 @@ class CleanerAvailability(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     cleaner_id: str
     date: str  # YYYY-MM-DD format
-    time_slot: str  # e.g., "09:00-12:00"
+    time_slot: str  # e.g., "08:00-10:00"
+    slot_index: Optional[int] = None  # Catalog id (services.slots)
     is_available: bool = True
     is_booked: bool = False
     booking_id: Optional[str] = None
@@ -452,7 +701,8 @@ class CalendarEvent(BaseModel):
 class TimeSlotAvailability(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     date: str  # YYYY-MM-DD
-    time_slot: str  # e.g., "09:00-12:00"
+    time_slot: str  # e.g., "08:00-10:00"
+    slot_index: Optional[int] = None  # Catalog id (services.slots)
     total_capacity: int = 5  # Number of cleaners available
     booked_count: int = 0
     is_available: bool = True
@@ -608,6 +858,20 @@ def prepare_for_response(doc):
         return doc
     return doc
 
+async def fetch_page(collection, query: Optional[dict] = None, response: Optional[Response] = None,
+                     pipeline: Optional[list] = None, **options) -> dict:
+    """Fetch one keyset page; cursor metadata is mirrored into response headers when given"""
+    try:
+        if pipeline is not None:
+            page = await paginate_pipeline(collection, pipeline, **options)
+        else:
+            page = await paginate(collection, query, **options)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if response is not None:
+        response.headers.update(page_headers(page))
+    return page
+
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
@@ -1098,11 +1362,44 @@ async def get_admin_user(current_user: User = Depends(get_current_user)) -> User
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
+def create_stream_ticket(user_id: str) -> str:
+    """Short-lived token for opening the calendar stream. It has no "sub", so it
+    is not accepted as a bearer token by get_current_user."""
+    expire = datetime.now(timezone.utc) + timedelta(seconds=CALENDAR_STREAM_TICKET_SECONDS)
+    return jwt.encode({"stream_user": user_id, "scope": "calendar_stream", "exp": expire}, JWT_SECRET,
+                      algorithm=JWT_ALGORITHM)
+
+async def get_admin_user_from_stream_ticket(
+    ticket: str = Query(..., description="From POST /api/admin/calendar/stream-ticket; EventSource cannot send headers")
+) -> User:
+    """Admin check for the calendar stream. EventSource passes credentials in the URL,
+    which ends up in access logs, so it carries a ticket that expires within a minute."""
+    try:
+        payload = jwt.decode(ticket, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    if payload.get("scope") != "calendar_stream" or not payload.get("stream_user"):
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    user = await db.users.find_one({"id": payload["stream_user"]})
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    return await get_admin_user(User(**user))
+
 async def get_cleaner_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.CLEANER:
         raise HTTPException(status_code=403, detail="Cleaner access required")
     return current_user
 
+def get_request_loaders() -> RequestLoaders:
+    """Batch loaders scoped to the current request"""
+    return RequestLoaders(db)
+
+# Response headers readable by the frontend (pagination metadata included)
+CORS_EXPOSE_HEADERS = [
+    "Content-Length", "Content-Range", "Authorization",
+    "X-Next-Cursor", "X-Has-More", "X-Total-Count", "X-DB-Stats", "ETag",
+]
+
 # CORS - Safari-compatible configuration
 # CRITICAL: Cannot use allow_origins=["*"] with allow_credentials=True
 # Safari strictly enforces this CORS policy violation
@@ -1125,12 +1422,13 @@ app.add_middleware(
         "X-Requested-With",
         "X-CSRFToken",
         "Cache-Control",
+        "If-None-Match",
         "Pragma",
         "Origin",
         "Referer",
         "User-Agent"
     ],
-    expose_headers=["Content-Length", "Content-Range", "Authorization"],
+    expose_headers=CORS_EXPOSE_HEADERS,
     max_age=3600
 )
 
@@ -1154,15 +1452,32 @@ class SafariCompatibleCORSMiddleware(BaseHTTPMiddleware):
         if origin in allowed_origins:
             response.headers["Access-Control-Allow-Origin"] = origin
             response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-            response.headers["Access-Control-Allow-Headers"] = "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, X-CSRFToken, Cache-Control, Pragma, Origin, Referer, User-Agent"
+            response.headers["Access-Control-Allow-Headers"] = "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, X-CSRFToken, Cache-Control, If-None-Match, Pragma, Origin, Referer, User-Agent"
             response.headers["Access-Control-Allow-Credentials"] = "true"
-            response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Range, Authorization"
+            response.headers["Access-Control-Expose-Headers"] = ", ".join(CORS_EXPOSE_HEADERS)
             response.headers["Access-Control-Max-Age"] = "3600"
         
         return response
 
 app.add_middleware(SafariCompatibleCORSMiddleware)
 
+class DbMetricsMiddleware(BaseHTTPMiddleware):
+    """Attribute MongoDB commands to the request that issued them"""
+    async def dispatch(self, request: Request, call_next):
+        stats = begin_request()
+        response = await call_next(request)
+        
+        route = request.scope.get("route")
+        endpoint = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        if stats.commands:
+            db_metrics.observe(endpoint, stats)
+        if DB_METRICS_DEBUG_HEADER:
+            response.headers["X-DB-Stats"] = stats.header_value()
+        return response
+
+if DB_METRICS_ENABLED:
+    app.add_middleware(DbMetricsMiddleware)
+
 # Static file serving for React production build
 frontend_build_path = ROOT_DIR.parent / "frontend" / "build"
 if frontend_build_path.exists():
@@ -1538,9 +1853,16 @@ class ObjectIdEncoder(json.JSONEncoder):
         return super().default(obj)
 
 @api_router.get("/admin/promo-codes", response_model=List[PromoCode])
-async def get_promo_codes(admin_user: User = Depends(get_admin_user)):
-    """Get all promo codes with usage statistics"""
-    promos = await db.promo_codes.find().sort("created_at", -1).to_list(1000)
+async def get_promo_codes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get promo codes with usage statistics (paginated, newest first)"""
+    page = await fetch_page(db.promo_codes, {}, response, limit=limit, cursor=cursor, include_total=include_total)
+    promos = page["items"]
     # Convert ObjectId to string for JSON serialization
     clean_promos = []
     for promo in promos:
@@ -1681,11 +2003,24 @@ async def add_to_waitlist(waitlist_data: WaitlistEntryCreate):
         raise HTTPException(status_code=500, detail=f"Failed to add to waitlist: {str(e)}")
 
 @api_router.get("/admin/waitlist")
-async def get_waitlist(admin_user: User = Depends(get_admin_user)):
-    """Get all waitlist entries for admin"""
+async def get_waitlist(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get waitlist entries for admin (paginated, newest first)"""
     try:
-        entries = await db.waitlist.find().sort("created_at", -1).to_list(1000)
-        return {"waitlist": entries}
+        page = await fetch_page(db.waitlist, {}, limit=limit, cursor=cursor, include_total=include_total)
+        entries = [prepare_for_response(entry) for entry in page["items"]]
+        return {
+            "waitlist": entries,
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"],
+            "total": page["total"]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get waitlist: {str(e)}")
 
@@ -1784,12 +2119,15 @@ async def create_cancellation_request(
         raise HTTPException(status_code=500, detail=f"Failed to create cancellation request: {str(e)}")
 
 @api_router.get("/cancellation-requests")
-async def get_customer_cancellation_requests(current_user: User = Depends(get_current_user)):
+async def get_customer_cancellation_requests(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
     """Get cancellation requests for the current customer"""
     try:
-        requests = await db.cancellation_requests.find(
-            {"customer_id": current_user.id}
-        ).sort("created_at", -1).to_list(1000)
+        page = await fetch_page(db.cancellation_requests, {"customer_id": current_user.id}, limit=limit, cursor=cursor)
+        requests = page["items"]
         
         # Convert ObjectId to string for JSON serialization
         processed_requests = []
@@ -1799,16 +2137,28 @@ async def get_customer_cancellation_requests(current_user: User = Depends(get_cu
                 request_dict['_id'] = str(request_dict['_id'])
             processed_requests.append(request_dict)
         
-        return {"cancellation_requests": processed_requests}
+        return {
+            "cancellation_requests": processed_requests,
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_customer_cancellation_requests: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get cancellation requests: {str(e)}")
 
 @api_router.get("/admin/cancellation-requests")
-async def get_all_cancellation_requests(admin_user: User = Depends(get_admin_user)):
-    """Get all cancellation requests for admin"""
+async def get_all_cancellation_requests(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get cancellation requests for admin (paginated, newest first)"""
     try:
-        requests = await db.cancellation_requests.find().sort("created_at", -1).to_list(1000)
+        page = await fetch_page(db.cancellation_requests, {}, limit=limit, cursor=cursor, include_total=include_total)
+        requests = page["items"]
         
         # Convert ObjectId to string for JSON serialization
         processed_requests = []
@@ -1818,7 +2168,14 @@ async def get_all_cancellation_requests(admin_user: User = Depends(get_admin_use
                 request_dict['_id'] = str(request_dict['_id'])
             processed_requests.append(request_dict)
         
-        return {"cancellation_requests": processed_requests}
+        return {
+            "cancellation_requests": processed_requests,
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"],
+            "total": page["total"]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_all_cancellation_requests: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get cancellation requests: {str(e)}")
@@ -1864,23 +2221,41 @@ async def update_cancellation_request(
         
         # If approved, cancel the booking
         if status == "approved":
-            await db.bookings.update_one(
-                {"id": request["booking_id"]},
+            cancelled = await db.bookings.find_one_and_update(
+                {"id": request["booking_id"], "status": {"$ne": "cancelled"}},
                 {"$set": {"status": "cancelled", "updated_at": datetime.now(timezone.utc).isoformat()}}
             )
+            if cancelled:
+                await record_booking_change(db, cancelled, {"status": "cancelled"})
+                await release_capacity(db, cancelled.get("booking_date"))
+                await release_cleaner_slot(cancelled)
             
             # If it's a recurring booking, cancel future instances
-            booking = await db.bookings.find_one({"id": request["booking_id"]})
+            booking = cancelled or await db.bookings.find_one({"id": request["booking_id"]})
             if booking and booking.get("frequency") in ['weekly', 'bi_weekly', 'monthly', 'every_3_weeks']:
-                await db.bookings.update_many(
+                future_bookings = await db.bookings.find(
                     {
                         "customer_id": booking["customer_id"],
                         "frequency": booking["frequency"],
                         "booking_date": {"$gt": booking["booking_date"]},
                         "status": {"$in": ["pending", "confirmed"]}
                     },
-                    {"$set": {"status": "cancelled", "updated_at": datetime.now(timezone.utc).isoformat()}}
-                )
+                    {"_id": 0, "id": 1, "booking_date": 1, "status": 1, "time_slot": 1, "total_amount": 1}
+                ).to_list(None)
+                if future_bookings:
+                    await db.bookings.update_many(
+                        {
+                            "id": {"$in": [b["id"] for b in future_bookings]},
+                            "status": {"$in": ["pending", "confirmed"]}
+                        },
+                        {"$set": {"status": "cancelled", "updated_at": datetime.now(timezone.utc).isoformat()}}
+                    )
+                    await apply_counter_changes(db, [(b, {**b, "status": "cancelled"}) for b in future_bookings])
+                    await release_capacity_many(db, [b["booking_date"] for b in future_bookings])
+                    await invalidate_date_caches(
+                        *{b["booking_date"] for b in future_bookings},
+                        event={"type": "bookings_cancelled", "booking_ids": [b["id"] for b in future_bookings]}
+                    )
         
         return {"message": f"Cancellation request {status} successfully"}
     except HTTPException:
@@ -1891,7 +2266,7 @@ async def update_cancellation_request(
 # Services endpoints
 @api_router.get("/services", response_model=List[Service])
 async def get_services():
-    services = await db.services.find().to_list(1000)
+    services = await db.services.find().to_list(None)
     # Handle missing category field by providing a default value
     processed_services = []
     for service in services:
@@ -1902,7 +2277,7 @@ async def get_services():
 
 @api_router.get("/services/standard", response_model=List[Service])
 async def get_standard_services():
-    services = await db.services.find({"is_a_la_carte": False}).to_list(1000)
+    services = await db.services.find({"is_a_la_carte": False}).to_list(None)
     # Handle missing category field by providing a default value
     processed_services = []
     for service in services:
@@ -1913,7 +2288,7 @@ async def get_standard_services():
 
 @api_router.get("/services/a-la-carte", response_model=List[Service])
 async def get_a_la_carte_services():
-    services = await db.services.find({"is_a_la_carte": True}).to_list(1000)
+    services = await db.services.find({"is_a_la_carte": True}).to_list(None)
     # Handle missing category field by providing a default value
     processed_services = []
     for service in services:
@@ -1960,7 +2335,7 @@ async def calculate_room_pricing_endpoint(request: dict):
 # Time slots endpoints
 @api_router.get("/time-slots")
 async def get_time_slots(date: str = Query(..., description="Date in YYYY-MM-DD format")):
-    slots = await db.time_slots.find({"date": date, "is_available": True}).to_list(1000)
+    slots = await db.time_slots.find({"date": date, "is_available": True}).to_list(None)
     return [TimeSlot(**slot) for slot in slots]
 
 @api_router.get("/available-dates")
@@ -2021,9 +2396,12 @@ async def check_cleaner_availability(date: str, current_user: User = Depends(get
 # Cleaner job management endpoints
 @api_router.get("/cleaner/jobs")
 async def get_cleaner_jobs(
+    response: Response,
     current_user: User = Depends(get_current_cleaner),
     status: str = Query(None, description="Filter by job status"),
-    date_range: str = Query(None, description="Filter by date range: today, tomorrow, week, month")
+    date_range: str = Query(None, description="Filter by date range: today, tomorrow, week, month"),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None
 ):
     """Get jobs assigned to the current cleaner in UI-friendly shape"""
     try:
@@ -2049,8 +2427,12 @@ async def get_cleaner_jobs(
                 month_end = today + timedelta(days=30)
                 query["booking_date"] = {"$gte": today.strftime('%Y-%m-%d'), "$lte": month_end.strftime('%Y-%m-%d')}
 
-        # Fetch bookings
-        bookings = await db.bookings.find(query).sort([("booking_date", 1), ("time_slot", 1)]).to_list(1000)
+        # Page in visit order: start_at is the booking date plus slot start (cleaner_id_1_start_at_1)
+        page = await fetch_page(
+            db.bookings, query, response,
+            sort_field="start_at", direction=ASCENDING, limit=limit, cursor=cursor
+        )
+        bookings = page["items"]
 
         jobs = []
         for b in bookings:
@@ -2064,9 +2446,7 @@ async def get_cleaner_jobs(
             customer_phone = cust.get("phone") if cust else b.get("customer", {}).get("phone")
 
             # Parse time slot
-            slot = b.get("time_slot", "09:00-12:00")
-            parts = [p.strip() for p in slot.split("-")]
-            start_t, end_t = (parts + [parts[0]])[:2] if parts else ("09:00", "12:00")
+            start_t, end_t = slot_clock_range(b.get("time_slot"))
 
             addr = b.get("address", {})
             addr_text = f"{addr.get('street','')}, {addr.get('city','')}, {addr.get('state','')} {addr.get('zip_code','')}".strip().strip(',')
@@ -2088,6 +2468,8 @@ async def get_cleaner_jobs(
 
         return jobs
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
@@ -2111,9 +2493,7 @@ async def get_cleaner_today_jobs(current_user: User = Depends(get_current_cleane
             customer_phone = cust.get("phone") if cust else b.get("customer", {}).get("phone")
 
             # Parse time slot
-            slot = b.get("time_slot", "09:00-12:00")
-            parts = [p.strip() for p in slot.split("-")]
-            start_t, end_t = (parts + [parts[0]])[:2] if parts else ("09:00", "12:00")
+            start_t, end_t = slot_clock_range(b.get("time_slot"))
 
             addr = b.get("address", {})
             addr_text = f"{addr.get('street','')}, {addr.get('city','')}, {addr.get('state','')} {addr.get('zip_code','')}".strip().strip(',')
@@ -2151,9 +2531,7 @@ async def get_cleaner_upcoming_jobs(current_user: User = Depends(get_current_cle
 
         jobs = []
         for b in bookings:
-            slot = b.get("time_slot", "09:00-12:00")
-            parts = [p.strip() for p in slot.split("-")]
-            start_t, end_t = (parts + [parts[0]])[:2] if parts else ("09:00", "12:00")
+            start_t, end_t = slot_clock_range(b.get("time_slot"))
             addr = b.get("address", {})
             addr_text = f"{addr.get('street','')}, {addr.get('city','')}, {addr.get('state','')} {addr.get('zip_code','')}".strip().strip(',')
 
@@ -2206,13 +2584,14 @@ async def clock_in_job(job_id: str, current_user: User = Depends(get_current_cle
             raise HTTPException(status_code=404, detail="Job not found")
         if booking.get("status") not in ["confirmed", "pending"]:
             raise HTTPException(status_code=400, detail="Can only clock in for confirmed jobs")
-        await db.bookings.update_one(
+        await transition_booking(
             {"id": job_id},
-            {"$set": {
+            {
                 "status": "in_progress",
                 "clock_in_time": datetime.now(timezone.utc).isoformat(),
                 "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+            },
+            index=False
         )
         return {"message": "Clocked in successfully"}
     except HTTPException:
@@ -2233,13 +2612,14 @@ async def clock_out_job(job_id: str, current_user: User = Depends(get_current_cl
             raise HTTPException(status_code=400, detail="Can only clock out from in-progress jobs")
 
         # Update booking status to completed
-        await db.bookings.update_one(
+        await transition_booking(
             {"id": job_id},
-            {"$set": {
+            {
                 "status": "completed",
                 "clock_out_time": datetime.now(),
                 "updated_at": datetime.now()
-            }}
+            },
+            index=False
         )
 
         return {"message": "Clocked out successfully"}
@@ -2289,6 +2669,109 @@ async def create_booking(booking_data: dict, current_user: User = Depends(get_cu
     """Create a booking for authenticated users"""
     return await create_booking_internal(booking_data, current_user=current_user, is_guest=False)
 
+def availability_label(time_slot: Optional[str]) -> Optional[str]:
+    """time_slot as stored on cleaner_availability rows (the catalog label where there is one)"""
+    slot = get_slot(time_slot)
+    return slot.label if slot else time_slot
+
+def cleaner_claim_update(cleaner_id: str, booking_date: str, time_slot: str, booking_id: str,
+                         allow_blocked: bool = False) -> Tuple[dict, dict]:
+    """(filter, update) of the conditional upsert behind claim_cleaner_slot(), for bulk writes"""
+    time_slot = availability_label(time_slot)
+    query = {
+        "cleaner_id": cleaner_id,
+        "date": booking_date,
+        "time_slot": time_slot,
+        "$or": [{"is_booked": {"$ne": True}}, {"booking_id": booking_id}]
+    }
+    if not allow_blocked:
+        query["is_available"] = {"$ne": False}
+    changes = {"is_booked": True, "booking_id": booking_id, "updated_at": datetime.now(timezone.utc).isoformat()}
+    new_record = prepare_for_mongo(CleanerAvailability(
+        cleaner_id=cleaner_id,
+        date=booking_date,
+        time_slot=time_slot,
+        **slot_fields(time_slot)
+    ).dict())
+    for field in changes:
+        new_record.pop(field, None)
+    return query, {"$set": changes, "$setOnInsert": new_record}
+
+# Claims are only race-free while this unique index exists (see require_slot_claim_index)
+SLOT_CLAIM_INDEX = "cleaner_id_1_date_1_time_slot_1"
+slot_claim_index_ready = False
+
+async def require_slot_claim_index():
+    """Refuse slot claims until the unique (cleaner_id, date, time_slot) index exists.
+    
+    Without it the upsert of a claim inserts a second row for a slot another
+    booking holds, so the cleaner would be double booked. The index is
+    skipped at startup while duplicate rows remain (migration 3 removes them).
+    """
+    global slot_claim_index_ready
+    if not slot_claim_index_ready:
+        slot_claim_index_ready = await has_unique_index(db, "cleaner_availability", SLOT_CLAIM_INDEX)
+    if not slot_claim_index_ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Cleaner assignment is unavailable until the cleaner availability slot index is built"
+        )
+
+async def claim_cleaner_slot(cleaner_id: str, booking_date: str, time_slot: str, booking_id: str,
+                             allow_blocked: bool = False) -> bool:
+    """Mark the cleaner's availability row for the slot as booked by `booking_id`.
+    
+    One conditional upsert: it only matches the row while the slot is free
+    (or already held by this booking, so claiming again is a no-op);
+    otherwise the insert it falls back to hits the unique
+    (cleaner_id, date, time_slot) index. Returns False when another booking
+    holds the slot, or it is manually unavailable unless allow_blocked.
+    Raises 503 while that index is missing (auto-assignment then leaves the
+    booking unassigned).
+    """
+    await require_slot_claim_index()
+    query, update = cleaner_claim_update(cleaner_id, booking_date, time_slot, booking_id, allow_blocked)
+    try:
+        await db.cleaner_availability.find_one_and_update(query, update, upsert=True)
+    except DuplicateKeyError:
+        return False
+    return True
+
+async def release_cleaner_claim(cleaner_id: str, booking_date: str, time_slot: str, booking_id: str):
+    """Undo claim_cleaner_slot(); rows held by other bookings are left alone"""
+    await db.cleaner_availability.update_one(
+        {
+            "cleaner_id": cleaner_id,
+            "date": booking_date,
+            "time_slot": availability_label(time_slot),
+            "booking_id": booking_id
+        },
+        {"$set": {"is_booked": False, "booking_id": None, "updated_at": datetime.now(timezone.utc).isoformat()}}
+    )
+
+async def release_cleaner_slot(booking: dict):
+    """Free the availability row a cancelled booking held so the slot is bookable again"""
+    await invalidate_date_caches(booking.get("booking_date"), index=False, event={"type": "booking", "booking": {
+        "id": booking.get("id"), "status": "cancelled", "cleaner_id": booking.get("cleaner_id"),
+        "booking_date": booking.get("booking_date"), "time_slot": booking.get("time_slot")
+    }})
+    cleaner_id = booking.get("cleaner_id")
+    if not cleaner_id:
+        return
+    await release_cleaner_claim(cleaner_id, booking.get("booking_date"), booking.get("time_slot"), booking.get("id"))
+    availability_index.record_release(booking.get("booking_date"), booking.get("time_slot"), cleaner_id)
+
+def capacity_waitlist_response(booking_date: str, booking_count: int) -> dict:
+    """Waitlist redirect returned instead of an error when a date is full"""
+    return {
+        "waitlist_required": True,
+        "message": "We're currently at capacity for this date. We value you and hope to service your home soon!",
+        "waitlist_message": "We're currently full for that slot — would you like to join our Waitlist?",
+        "max_capacity": MAX_DAILY_BOOKINGS,
+        "current_bookings": booking_count,
+        "date": booking_date
+    }
+
 async def create_booking_internal(booking_data: dict, current_user: User = None, is_guest: bool = False):
     # Validate zip code - handle both nested and flat data structures
     if 'customer' in booking_data and 'zip_code' in booking_data['customer']:
@@ -2314,25 +2797,14 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
     if not booking_date or not time_slot:
         raise HTTPException(status_code=400, detail="Booking date and time slot are required")
 
-    # Check daily capacity first
-    booking_count = await db.bookings.count_documents({
-        "booking_date": booking_date,
-        "status": {"$in": ["confirmed", "in_progress"]}
-    })
+    # Check daily capacity first (the reservation itself is taken just before insert)
+    booking_count = (await get_reserved(db, [booking_date]))[booking_date]
     
     if booking_count >= MAX_DAILY_BOOKINGS:
-        # Return waitlist redirect instead of error
-        return {
-            "waitlist_required": True,
-            "message": "We're currently at capacity for this date. We value you and hope to service your home soon!",
-            "waitlist_message": "We're currently full for that slot — would you like to join our Waitlist?",
-            "max_capacity": MAX_DAILY_BOOKINGS,
-            "current_bookings": booking_count,
-            "date": booking_date
-        }
+        return capacity_waitlist_response(booking_date, booking_count)
     
     # Check if there are available cleaners for this date and time
-    availability_response = await get_availability(booking_date, time_slot)
+    availability_response = await check_slot_availability(booking_date, time_slot)
     if not availability_response['available']:
         raise HTTPException(
             status_code=400,
@@ -2419,6 +2891,8 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
     )
     
     booking_dict = prepare_for_mongo(booking.model_dump())
+    booking_dict.update(booking_window_fields(booking.booking_date, booking.time_slot))
+    booking_dict.update(slot_fields(booking.time_slot))
     
     # Add customer information to the booking document for guest customers
     if not current_user:  # Guest booking
@@ -2440,8 +2914,16 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
         print(f"Created subscription {subscription_result['subscription_id']} for customer {customer_id}")
         return subscription_result['first_booking']
     
-    # For one-time bookings, insert the booking directly
-    await db.bookings.insert_one(booking_dict)
+    # For one-time bookings, reserve a unit of daily capacity and insert the booking
+    if not await reserve_capacity(db, booking.booking_date, MAX_DAILY_BOOKINGS):
+        return capacity_waitlist_response(booking.booking_date, MAX_DAILY_BOOKINGS)
+    try:
+        await db.bookings.insert_one(booking_dict)
+    except Exception:
+        await release_capacity(db, booking.booking_date)
+        raise
+    await record_booking_created(db, booking_dict)
+    await invalidate_date_caches(booking.booking_date, index=False)
     
     # Auto-assign best available cleaner
     assigned_cleaner_id = None
@@ -2453,32 +2935,26 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
         cleaner_id = await auto_assign_best_cleaner(
             booking_data['booking_date'], 
             booking_data['time_slot'],
-            booking_data.get('house_size')
+            booking_data.get('house_size'),
+            booking.address.zip_code if booking.address else None,
+            booking_id=booking.id
         )
         
         if cleaner_id:
-            # Update booking with assigned cleaner
-            await db.bookings.update_one(
+            # Update booking with assigned cleaner (its availability row is already claimed)
+            await transition_booking(
                 {"id": booking.id},
-                {
-                    "$set": {
-                        "cleaner_id": cleaner_id,
-                        "status": "confirmed",
-                        "assignment_type": "auto",
-                        "assigned_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
-            )
-            assignment_type = "auto"
-            
-            # Update cleaner availability
-            await db.cleaner_availability.update_one(
                 {
                     "cleaner_id": cleaner_id,
-                    "date": booking_data['booking_date'],
-                    "time_slot": booking_data['time_slot']
+                    "status": "confirmed",
+                    "assignment_type": "auto",
+                    "assigned_at": datetime.now(timezone.utc).isoformat()
                 },
-                {"$set": {"is_booked": True, "booking_id": booking.id}}
+                index=False
+            )
+            assignment_type = "auto"
+            availability_index.record_assignment(
+                booking_data['booking_date'], booking_data['time_slot'], cleaner_id, zip_code=booking_zip(booking_dict)
             )
             # Get cleaner name for response
             cleaner = await db.cleaners.find_one({"id": cleaner_id})
@@ -2531,15 +3007,14 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
             print(f"Auto-assigned cleaner {assigned_cleaner_name} to booking {booking.id}")
         else:
             # No cleaner available - keep booking as pending
-            await db.bookings.update_one(
+            await transition_booking(
                 {"id": booking.id},
                 {
-                    "$set": {
-                        "status": "pending",
-                        "assignment_type": "pending",
-                        "assigned_at": None
-                    }
-                }
+                    "status": "pending",
+                    "assignment_type": "pending",
+                    "assigned_at": None
+                },
+                index=False
             )
             print(f"No available cleaner for booking {booking.id} - will remain unassigned")
     except Exception as e:
@@ -2601,9 +3076,14 @@ async def create_booking_internal(booking_data: dict, current_user: User = None,
     return Booking(**booking_response)
 
 @api_router.get("/bookings", response_model=List[Booking])
-async def get_user_bookings(current_user: User = Depends(get_current_user)):
-    bookings = await db.bookings.find({"user_id": current_user.id}).to_list(1000)
-    return [Booking(**booking) for booking in bookings]
+async def get_user_bookings(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    page = await fetch_page(db.bookings, {"user_id": current_user.id}, response, limit=limit, cursor=cursor)
+    return [Booking(**booking) for booking in page["items"]]
 
 @api_router.get("/bookings/{booking_id}", response_model=Booking)
 async def get_booking(booking_id: str, current_user: User = Depends(get_current_user)):
@@ -2618,7 +3098,11 @@ async def get_booking(booking_id: str, current_user: User = Depends(get_current_
     return Booking(**booking)
 
 @api_router.get("/bookings/{booking_id}/summary")
-async def get_booking_summary(booking_id: str, current_user: User = Depends(get_current_user)):
+async def get_booking_summary(
+    booking_id: str,
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_request_loaders)
+):
     """Get a comprehensive summary of a booking including all items and services checked out"""
     booking = await db.bookings.find_one({"id": booking_id})
     if not booking:
@@ -2634,7 +3118,7 @@ async def get_booking_summary(booking_id: str, current_user: User = Depends(get_
         customer_info = booking["customer"]
     else:
         # For registered users, get customer info from users collection
-        user = await db.users.find_one({"id": booking.get("user_id")})
+        user = await loaders.users.load(booking.get("user_id"))
         if user:
             customer_info = {
                 "email": user.get("email"),
@@ -2648,10 +3132,14 @@ async def get_booking_summary(booking_id: str, current_user: User = Depends(get_
                 "is_guest": False
             }
     
-    # Get service details for all booked services
+    # Get service details for all booked services (standard and a la carte) in one query
+    services_by_id = await loaders.services.load_many(
+        item["service_id"]
+        for item in (booking.get("services") or []) + (booking.get("a_la_carte_services") or [])
+    )
     services_summary = []
     for booking_service in booking.get("services", []):
-        service = await db.services.find_one({"id": booking_service["service_id"]})
+        service = services_by_id.get(booking_service["service_id"])
         if service:
             services_summary.append({
                 "id": service["id"],
@@ -2667,7 +3155,7 @@ async def get_booking_summary(booking_id: str, current_user: User = Depends(get_
     # Get a la carte services details
     a_la_carte_summary = []
     for booking_service in booking.get("a_la_carte_services", []):
-        service = await db.services.find_one({"id": booking_service["service_id"]})
+        service = services_by_id.get(booking_service["service_id"])
         if service:
             a_la_carte_summary.append({
                 "id": service["id"],
@@ -2736,7 +3224,10 @@ async def get_booking_summary(booking_id: str, current_user: User = Depends(get_
     return summary
 
 @api_router.get("/bookings/{booking_id}/guest-summary")
-async def get_guest_booking_summary(booking_id: str):
+async def get_guest_booking_summary(
+    booking_id: str,
+    loaders: RequestLoaders = Depends(get_request_loaders)
+):
     """Get booking summary for guest users (no authentication required)"""
     booking = await db.bookings.find_one({"id": booking_id})
     if not booking:
@@ -2749,10 +3240,14 @@ async def get_guest_booking_summary(booking_id: str):
     # Use the same logic as the authenticated version but with guest customer info
     customer_info = booking.get("customer", {})
     
-    # Get service details for all booked services
+    # Get service details for all booked services (standard and a la carte) in one query
+    services_by_id = await loaders.services.load_many(
+        item["service_id"]
+        for item in (booking.get("services") or []) + (booking.get("a_la_carte_services") or [])
+    )
     services_summary = []
     for booking_service in booking.get("services", []):
-        service = await db.services.find_one({"id": booking_service["service_id"]})
+        service = services_by_id.get(booking_service["service_id"])
         if service:
             services_summary.append({
                 "id": service["id"],
@@ -2768,7 +3263,7 @@ async def get_guest_booking_summary(booking_id: str):
     # Get a la carte services details
     a_la_carte_summary = []
     for booking_service in booking.get("a_la_carte_services", []):
-        service = await db.services.find_one({"id": booking_service["service_id"]})
+        service = services_by_id.get(booking_service["service_id"])
         if service:
             a_la_carte_summary.append({
                 "id": service["id"],
@@ -2837,70 +3332,103 @@ async def get_guest_booking_summary(booking_id: str):
     return summary
 
 @api_router.get("/admin/customers")
-async def get_all_customers(admin_user: User = Depends(get_admin_user)):
-    """Get all customers for admin dashboard"""
+async def get_all_customers(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_request_loaders)
+):
+    """Get customers for admin dashboard (registered and guest, paginated, newest first)"""
+    # Registered users and guest customers (grouped from their bookings) form one
+    # stream so a single cursor can walk both. Each branch applies the cursor
+    # boundary and page limit itself, so a page does not group every guest booking.
+    try:
+        boundary = cursor_filter(cursor)
+        guest_boundary = cursor_filter(cursor, tiebreak_field="customer_id")
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    size = page_size(limit, cursor)
+    page_tail = [{"$sort": {"created_at": DESCENDING, "id": DESCENDING}}]
+    if size is not None:
+        page_tail.append({"$limit": size + 1})
+
+    def customer_stream(user_boundary, booking_boundary, tail):
+        users_match = {"role": "customer"}
+        if user_boundary:
+            users_match = {"$and": [users_match, user_boundary]}
+        guests_match = {"customer_id": {"$regex": "^guest_"}, "customer": {"$exists": True}}
+        if booking_boundary:
+            # A guest's row is its earliest booking, which passes the boundary
+            # exactly when the guest does (same created_at, id = customer_id)
+            guests_match = {"$and": [guests_match, booking_boundary]}
+        return [
+            {"$match": users_match},
+            *tail,
+            {"$project": {
+                "_id": 0,
+                "id": 1,
+                "email": 1,
+                "first_name": 1,
+                "last_name": 1,
+                "phone": {"$ifNull": ["$phone", ""]},
+                "is_guest": {"$literal": False},
+                "created_at": 1
+            }},
+            {"$unionWith": {
+                "coll": "bookings",
+                "pipeline": [
+                    {"$match": guests_match},
+                    {"$sort": {"created_at": 1}},
+                    {"$group": {
+                        "_id": "$customer_id",
+                        "customer": {"$first": "$customer"},
+                        "created_at": {"$first": "$created_at"}
+                    }},
+                    {"$project": {
+                        "_id": 0,
+                        "id": "$_id",
+                        "email": {"$ifNull": ["$customer.email", ""]},
+                        "first_name": {"$ifNull": ["$customer.first_name", ""]},
+                        "last_name": {"$ifNull": ["$customer.last_name", ""]},
+                        "phone": {"$ifNull": ["$customer.phone", ""]},
+                        "address": {"$ifNull": ["$customer.address", ""]},
+                        "city": {"$ifNull": ["$customer.city", ""]},
+                        "state": {"$ifNull": ["$customer.state", ""]},
+                        "zip_code": {"$ifNull": ["$customer.zip_code", ""]},
+                        "is_guest": {"$literal": True},
+                        "created_at": 1
+                    }},
+                    *tail
+                ]
+            }}
+        ]
+
+    page = await fetch_page(
+        db.users, response=response, pipeline=customer_stream(boundary, guest_boundary, page_tail),
+        count_pipeline=customer_stream(None, None, []),
+        limit=limit, cursor=cursor, include_total=include_total
+    )
+
+    # Latest booking per registered user (for address info) in one query
+    latest_bookings = await loaders.latest_booking_by_user.load_many(
+        customer["id"] for customer in page["items"] if not customer["is_guest"]
+    )
+
     customers = []
-    
-    # Get registered users
-    registered_users = await db.users.find({"role": "customer"}).to_list(1000)
-    for user in registered_users:
-        # Get their latest booking for address info
-        latest_booking = await db.bookings.find_one(
-            {"user_id": user["id"]},
-            sort=[("created_at", -1)]
-        )
-        
-        address_info = {}
-        if latest_booking and latest_booking.get("address"):
-            address_info = {
-                "address": latest_booking["address"].get("street", ""),
-                "city": latest_booking["address"].get("city", ""),
-                "state": latest_booking["address"].get("state", ""),
-                "zip_code": latest_booking["address"].get("zip_code", "")
-            }
-        
-        customers.append({
-            "id": user["id"],
-            "email": user["email"],
-            "first_name": user["first_name"],
-            "last_name": user["last_name"],
-            "phone": user.get("phone", ""),
-            "is_guest": False,
-            "created_at": user.get("created_at"),
-            **address_info
-        })
-    
-    # Get guest customers from bookings
-    guest_bookings = await db.bookings.find({
-        "customer_id": {"$regex": "^guest_"},
-        "customer": {"$exists": True}
-    }).to_list(1000)
-    
-    # Group guest bookings by customer_id to avoid duplicates
-    guest_customers = {}
-    for booking in guest_bookings:
-        customer_id = booking["customer_id"]
-        if customer_id not in guest_customers:
-            customer_info = booking.get("customer", {})
-            guest_customers[customer_id] = {
-                "id": customer_id,
-                "email": customer_info.get("email", ""),
-                "first_name": customer_info.get("first_name", ""),
-                "last_name": customer_info.get("last_name", ""),
-                "phone": customer_info.get("phone", ""),
-                "address": customer_info.get("address", ""),
-                "city": customer_info.get("city", ""),
-                "state": customer_info.get("state", ""),
-                "zip_code": customer_info.get("zip_code", ""),
-                "is_guest": True,
-                "created_at": booking.get("created_at")
-            }
-    
-    customers.extend(guest_customers.values())
-    
-    # Sort by creation date (newest first)
-    customers.sort(key=lambda x: x.get("created_at", datetime.min), reverse=True)
-    
+    for customer in page["items"]:
+        if not customer["is_guest"]:
+            latest_booking = latest_bookings.get(customer["id"])
+            if latest_booking and latest_booking.get("address"):
+                customer.update({
+                    "address": latest_booking["address"].get("street", ""),
+                    "city": latest_booking["address"].get("city", ""),
+                    "state": latest_booking["address"].get("state", ""),
+                    "zip_code": latest_booking["address"].get("zip_code", "")
+                })
+        customers.append(customer)
+
     return customers
 
 @api_router.get("/customers/{customer_id}")
@@ -2908,58 +3436,27 @@ async def get_customer(customer_id: str):
     """Get customer information by customer ID"""
     # For guest customers, the customer_id is in format "guest_{email}"
     if customer_id.startswith("guest_"):
-        # For guest customers, look up in the admin customers endpoint data
-        # This is a simplified approach - in production, you might want to cache this
-        customers = []
-        
-        # Get registered users
-        users = await db.users.find({"role": "customer"}).to_list(1000)
-        for user in users:
-            customers.append({
-                "id": user["id"],
-                "email": user["email"],
-                "first_name": user["first_name"],
-                "last_name": user["last_name"],
-                "phone": user.get("phone", ""),
-                "address": "",
-                "city": "",
-                "state": "",
-                "zip_code": "",
-                "is_guest": False
-            })
-        
-        # Get guest customers from bookings
-        guest_bookings = await db.bookings.find({
-            "customer_id": {"$regex": "^guest_"}
-        }).to_list(1000)
-        
-        # Group guest bookings by customer_id to avoid duplicates
-        guest_customers = {}
-        for booking in guest_bookings:
-            customer_id_booking = booking["customer_id"]
-            if customer_id_booking not in guest_customers:
-                customer_info = booking.get("customer", {})
-                guest_customers[customer_id_booking] = {
-                    "id": customer_id_booking,
-                    "email": customer_info.get("email", ""),
-                    "first_name": customer_info.get("first_name", ""),
-                    "last_name": customer_info.get("last_name", ""),
-                    "phone": customer_info.get("phone", ""),
-                    "address": customer_info.get("address", ""),
-                    "city": customer_info.get("city", ""),
-                    "state": customer_info.get("state", ""),
-                    "zip_code": customer_info.get("zip_code", ""),
-                    "is_guest": True
-                }
-        
-        customers.extend(guest_customers.values())
-        
-        # Find the specific customer
-        customer = next((c for c in customers if c["id"] == customer_id), None)
-        if not customer:
+        # Guest details live on their bookings; the earliest one is authoritative
+        booking = await db.bookings.find_one(
+            {"customer_id": customer_id},
+            sort=[("created_at", 1)]
+        )
+        if not booking:
             raise HTTPException(status_code=404, detail="Customer not found")
         
-        return customer
+        customer_info = booking.get("customer", {})
+        return {
+            "id": customer_id,
+            "email": customer_info.get("email", ""),
+            "first_name": customer_info.get("first_name", ""),
+            "last_name": customer_info.get("last_name", ""),
+            "phone": customer_info.get("phone", ""),
+            "address": customer_info.get("address", ""),
+            "city": customer_info.get("city", ""),
+            "state": customer_info.get("state", ""),
+            "zip_code": customer_info.get("zip_code", ""),
+            "is_guest": True
+        }
     else:
         # For registered users, look up in the users collection
         user = await db.users.find_one({"id": customer_id})
@@ -3134,19 +3631,14 @@ async def create_booking_from_subscription(subscription_id: str, booking_date: s
     # Check availability for the requested date and time
     time_slot = subscription['preferred_time_slot']
     
-    # Check daily capacity first
-    booking_count = await db.bookings.count_documents({
-        "booking_date": booking_date,
-        "status": {"$in": ["confirmed", "in_progress"]}
-    })
-    
-    if booking_count >= MAX_DAILY_BOOKINGS:
-        # Skip this booking if at capacity
+    # Reserve daily capacity first; skip this booking if the date is full
+    if not await reserve_capacity(db, booking_date, MAX_DAILY_BOOKINGS):
         return {"status": "skipped", "reason": "capacity_full"}
     
     # Check if there are available cleaners for this date and time
-    availability_response = await get_availability(booking_date, time_slot)
+    availability_response = await check_slot_availability(booking_date, time_slot)
     if not availability_response['available']:
+        await release_capacity(db, booking_date)
         return {"status": "skipped", "reason": "no_cleaners_available"}
     
     # Create booking data
@@ -3197,26 +3689,26 @@ async def create_booking_from_subscription(subscription_id: str, booking_date: s
     
     # Insert booking into database
     booking_dict = prepare_for_mongo(booking.model_dump())
-    await db.bookings.insert_one(booking_dict)
+    booking_dict.update(booking_window_fields(booking.booking_date, booking.time_slot))
+    booking_dict.update(slot_fields(booking.time_slot))
+    try:
+        await db.bookings.insert_one(booking_dict)
+    except Exception:
+        await release_capacity(db, booking_date)
+        raise
+    await record_booking_created(db, booking_dict)
+    await invalidate_date_caches(booking_date, index=False)
     
     # Auto-assign cleaner if available
     try:
-        cleaner_id = await auto_assign_best_cleaner(booking_date, time_slot)
+        cleaner_id = await auto_assign_best_cleaner(
+            booking_date, time_slot, zip_code=booking.address.zip_code if booking.address else None,
+            booking_id=booking.id
+        )
         if cleaner_id:
-            await db.bookings.update_one(
-                {"id": booking.id},
-                {"$set": {"cleaner_id": cleaner_id, "status": "confirmed"}}
-            )
-            
-            # Update cleaner availability
-            await db.cleaner_availability.update_one(
-                {
-                    "cleaner_id": cleaner_id,
-                    "date": booking_date,
-                    "time_slot": time_slot
-                },
-                {"$set": {"is_booked": True, "booking_id": booking.id}}
-            )
+            # The availability row is already claimed for the booking
+            await transition_booking({"id": booking.id}, {"cleaner_id": cleaner_id, "status": "confirmed"}, index=False)
+            availability_index.record_assignment(booking_date, time_slot, cleaner_id, zip_code=booking_zip(booking_dict))
     except Exception as e:
         print(f"Error during auto-assignment for subscription booking: {str(e)}")
     
@@ -3235,12 +3727,12 @@ async def process_subscription_bookings():
     today = datetime.now().strftime("%Y-%m-%d")
     
     # Find active subscriptions that need new bookings
-    active_subscriptions = await db.subscriptions.find({
+    active_subscriptions = db.subscriptions.find({
         "status": "active",
         "next_booking_date": {"$lte": today}
-    }).to_list(1000)
+    })
     
-    for subscription in active_subscriptions:
+    async for subscription in active_subscriptions:
         try:
             # Create booking for next_booking_date
             booking = await create_booking_from_subscription(
@@ -3289,37 +3781,34 @@ async def create_recurring_bookings(booking_data: dict, customer_id: str, is_gue
         next_date = base_date + timedelta(days=days_interval * i)
         next_date_str = next_date.strftime("%Y-%m-%d")
         
-        # Check if this date is available
-        booking_count = await db.bookings.count_documents({
-            "booking_date": next_date_str,
-            "status": {"$in": ["confirmed", "in_progress"]}
-        })
-        
-        if booking_count >= MAX_DAILY_BOOKINGS:
-            continue  # Skip if at capacity
-        
         # Create booking data for this occurrence
         recurring_booking_data = booking_data.copy()
         recurring_booking_data['booking_date'] = next_date_str
         
-        # Create the recurring booking
+        # Create the recurring booking; it reserves capacity itself and
+        # returns a waitlist response (skipped here) when the date is full
         try:
-            await create_booking_internal(recurring_booking_data, is_guest=is_guest)
+            result = await create_booking_internal(recurring_booking_data, is_guest=is_guest)
+            if isinstance(result, dict) and result.get("waitlist_required"):
+                continue
         except Exception as e:
             print(f"Failed to create recurring booking for {next_date_str}: {e}")
             continue
 
 # Subscription Management Endpoints
 @api_router.get("/admin/subscriptions")
-async def get_all_subscriptions(admin_user: User = Depends(get_admin_user)):
-    """Get all subscriptions for admin dashboard"""
+async def get_all_subscriptions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get subscriptions for admin dashboard (paginated, newest first)"""
     try:
-        print(f"Getting subscriptions for admin: {admin_user.email}")
-        print(f"Database name: {db.name}")
-        
         # Try to find subscriptions, if collection doesn't exist, it will return empty list
-        subscriptions = await db.subscriptions.find().sort("created_at", -1).to_list(1000)
-        print(f"Found {len(subscriptions)} subscriptions")
+        page = await fetch_page(db.subscriptions, {}, response, limit=limit, cursor=cursor, include_total=include_total)
+        subscriptions = page["items"]
         
         # Convert ObjectId to string for JSON serialization
         for subscription in subscriptions:
@@ -3327,6 +3816,8 @@ async def get_all_subscriptions(admin_user: User = Depends(get_admin_user)):
                 subscription['_id'] = str(subscription['_id'])
         
         return subscriptions
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error retrieving subscriptions: {str(e)}")
         import traceback
@@ -3568,7 +4059,7 @@ async def get_upcoming_appointments(current_user: User = Depends(get_current_use
             "status": {"$in": ["pending", "confirmed"]}
         },
         sort=[("booking_date", 1), ("time_slot", 1)]
-    ).to_list(1000)
+    ).to_list(None)
     
     # Convert ObjectId to string for JSON serialization
     for booking in upcoming_bookings:
@@ -3730,17 +4221,16 @@ async def delete_customer_payment_method(
 # Admin endpoints
 @api_router.get("/admin/stats")
 async def get_admin_stats(admin_user: User = Depends(get_admin_user)):
-    # Get stats from database
-    total_bookings = await db.bookings.count_documents({})
-    total_revenue = await db.bookings.aggregate([
-        {"$group": {"_id": None, "total": {"$sum": "$total_amount"}}}
+    # Booking totals from the per-date counters (one document per date)
+    totals = await analytics_db[COUNTERS_COLLECTION].aggregate([
+        {"$group": {"_id": None, "bookings": {"$sum": "$total"}, "revenue": {"$sum": "$revenue_total"}}}
     ]).to_list(1)
-    total_cleaners = await db.cleaners.count_documents({"is_active": True})
-    open_tickets = await db.tickets.count_documents({"status": {"$ne": "closed"}})
+    total_cleaners = await analytics_db.cleaners.count_documents({"is_active": True})
+    open_tickets = await analytics_db.tickets.count_documents({"status": {"$ne": "closed"}})
     
     return {
-        "total_bookings": total_bookings,
-        "total_revenue": total_revenue[0]["total"] if total_revenue else 0,
+        "total_bookings": totals[0]["bookings"] if totals else 0,
+        "total_revenue": totals[0]["revenue"] if totals else 0,
         "total_cleaners": total_cleaners,
         "open_tickets": open_tickets
     }
@@ -3751,93 +4241,43 @@ async def admin_test():
     return {"message": "Admin test endpoint working - code updated!"}
 
 @api_router.get("/admin/bookings-new")
-async def get_all_bookings_new(admin_user: User = Depends(get_admin_user)):
+async def get_all_bookings_new(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
     """New admin bookings endpoint without Pydantic validation"""
     try:
-        bookings = await db.bookings.find().sort("created_at", -1).to_list(1000)
-        print(f"Admin bookings-new endpoint: Found {len(bookings)} bookings")
-        
-        # Fix enum values before returning
-        fixed_bookings = []
-        for i, booking in enumerate(bookings):
-            # Create a copy to avoid modifying the original
-            fixed_booking = booking.copy()
-            
-            # Fix house_size enum values
-            house_size = fixed_booking.get("house_size", "")
-            if house_size in ["1200-1500", "1000-1500"]:
-                fixed_booking["house_size"] = "2_bedroom"
-            elif house_size == "1500-2000":
-                fixed_booking["house_size"] = "3_bedroom"
-            elif house_size == "2000-2500":
-                fixed_booking["house_size"] = "4_bedroom"
-            elif house_size == "2500-3000":
-                fixed_booking["house_size"] = "5_bedroom"
-            elif house_size in ["3000-3500", "3500-4000", "4000-4500", "4500-5000", "5000-6000", "5000+"]:
-                fixed_booking["house_size"] = "6_bedroom"
-            
-            # Fix payment_status enum values
-            if fixed_booking.get("payment_status") == "completed":
-                fixed_booking["payment_status"] = "paid"
-            
-            # Fix frequency enum values
-            frequency = fixed_booking.get("frequency", "")
-            if frequency == "biweekly":
-                fixed_booking["frequency"] = "bi_weekly"
-            
-            # Convert ObjectId to string for JSON serialization
-            if '_id' in fixed_booking:
-                fixed_booking['_id'] = str(fixed_booking['_id'])
-            
-            fixed_bookings.append(fixed_booking)
+        page = await fetch_page(db.bookings, {}, response, limit=limit, cursor=cursor, include_total=include_total)
+        bookings = page["items"]
         
-        return fixed_bookings
+        # Legacy enum values are normalized in storage (migration 0001)
+        return [prepare_for_response(booking) for booking in bookings]
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in admin bookings-new endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve bookings: {str(e)}")
 
 @api_router.get("/admin/bookings")
-async def get_all_bookings(admin_user: User = Depends(get_admin_user)):
+async def get_all_bookings(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
     """Get all bookings for admin dashboard - returns raw data without Pydantic validation"""
     try:
-        bookings = await db.bookings.find().sort("created_at", -1).to_list(1000)
-        print(f"Admin bookings endpoint: Found {len(bookings)} bookings")
-        
-        # Fix enum values and convert ObjectId to string
-        fixed_bookings = []
-        for booking in bookings:
-            # Create a copy to avoid modifying the original
-            fixed_booking = booking.copy()
-            
-            # Fix house_size enum values
-            house_size = fixed_booking.get("house_size", "")
-            if house_size in ["1200-1500", "1000-1500"]:
-                fixed_booking["house_size"] = "2_bedroom"
-            elif house_size == "1500-2000":
-                fixed_booking["house_size"] = "3_bedroom"
-            elif house_size == "2000-2500":
-                fixed_booking["house_size"] = "4_bedroom"
-            elif house_size == "2500-3000":
-                fixed_booking["house_size"] = "5_bedroom"
-            elif house_size in ["3000-3500", "3500-4000", "4000-4500", "4500-5000", "5000-6000", "5000+"]:
-                fixed_booking["house_size"] = "6_bedroom"
-            
-            # Fix payment_status enum values
-            if fixed_booking.get("payment_status") == "completed":
-                fixed_booking["payment_status"] = "paid"
-            
-            # Fix frequency enum values
-            frequency = fixed_booking.get("frequency", "")
-            if frequency == "biweekly":
-                fixed_booking["frequency"] = "bi_weekly"
-            
-            # Convert ObjectId to string for JSON serialization
-            if '_id' in fixed_booking:
-                fixed_booking['_id'] = str(fixed_booking['_id'])
-            
-            fixed_bookings.append(fixed_booking)
+        page = await fetch_page(db.bookings, {}, response, limit=limit, cursor=cursor, include_total=include_total)
+        bookings = page["items"]
         
-        return fixed_bookings
+        # Legacy enum values are normalized in storage (migration 0001)
+        return [prepare_for_response(booking) for booking in bookings]
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in admin bookings endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve bookings: {str(e)}")
@@ -3852,15 +4292,38 @@ async def update_booking(booking_id: str, update_data: dict, admin_user: User =
     old_cleaner_id = booking.get("cleaner_id")
     new_cleaner_id = update_data.get("cleaner_id")
     
+    # Keep start_at/end_at in step with a moved date or slot
+    if "booking_date" in update_data or "time_slot" in update_data:
+        update_data.update(booking_window_fields(
+            update_data.get("booking_date", booking.get("booking_date")),
+            update_data.get("time_slot", booking.get("time_slot"))
+        ))
+        update_data.update(slot_fields(update_data.get("time_slot", booking.get("time_slot"))))
+    
     # Update booking
-    result = await db.bookings.update_one(
+    previous = await db.bookings.find_one_and_update(
         {"id": booking_id},
         {"$set": {**update_data, "updated_at": datetime.now(timezone.utc).isoformat()}}
     )
     
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Booking not found")
     
+    await record_booking_change(db, previous, update_data)
+    
+    # Moving, reassigning or cancelling changes who is free in the old and new slots
+    await invalidate_date_caches(
+        previous.get("booking_date"), update_data.get("booking_date"),
+        index=bool({"status", "booking_date", "time_slot", "cleaner_id"} & update_data.keys())
+    )
+    
+    # Cancelling, restoring or moving the booking shifts its daily capacity
+    if "status" in update_data or "booking_date" in update_data:
+        await apply_booking_change(db, previous, {
+            "status": update_data.get("status", previous.get("status")),
+            "booking_date": update_data.get("booking_date", previous.get("booking_date"))
+        })
+    
     # If cleaner was changed, send notifications
     if new_cleaner_id and new_cleaner_id != old_cleaner_id:
         try:
@@ -3935,7 +4398,7 @@ async def update_booking(booking_id: str, update_data: dict, admin_user: User =
 @api_router.get("/admin/cleaners", response_model=List[Cleaner])
 async def get_cleaners(admin_user: User = Depends(get_admin_user)):
     try:
-        cleaners = await db.cleaners.find().to_list(1000)
+        cleaners = await db.cleaners.find().to_list(None)
         print(f"Admin cleaners endpoint: Found {len(cleaners)} cleaners")
         
         # Filter out cleaners with missing required fields
@@ -3982,6 +4445,7 @@ async def create_cleaner(cleaner_data: dict, admin_user: User = Depends(get_admi
     cleaner = Cleaner(**cleaner_data)
     cleaner_dict = prepare_for_mongo(cleaner.dict())
     await db.cleaners.insert_one(cleaner_dict)
+    await invalidate_roster_caches(cleaner.id)
     return cleaner
 
 @api_router.delete("/admin/cleaners/{cleaner_id}")
@@ -3989,13 +4453,14 @@ async def delete_cleaner(cleaner_id: str, admin_user: User = Depends(get_admin_u
     result = await db.cleaners.delete_one({"id": cleaner_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Cleaner not found")
+    await invalidate_roster_caches(cleaner_id)
     return {"message": "Cleaner deleted successfully"}
 
 @api_router.get("/admin/cleaners/pending")
 async def get_pending_cleaners(admin_user: User = Depends(get_admin_user)):
     """Get all cleaners pending approval"""
     try:
-        pending_cleaners = await db.cleaners.find({"is_approved": False}).sort("created_at", -1).to_list(1000)
+        pending_cleaners = await db.cleaners.find({"is_approved": False}).sort("created_at", -1).to_list(None)
         
         result = []
         for cleaner in pending_cleaners:
@@ -4040,6 +4505,7 @@ async def approve_cleaner(cleaner_id: str, admin_user: User = Depends(get_admin_
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Cleaner not found")
+        await invalidate_roster_caches(cleaner_id)
         
         # Initialize calendar availability for the cleaner (90 days)
         try:
@@ -4089,6 +4555,7 @@ async def reject_cleaner(cleaner_id: str, reason: str = "", admin_user: User = D
         # Delete cleaner and associated user account
         await db.cleaners.delete_one({"id": cleaner_id})
         await db.users.delete_one({"email": cleaner_email, "role": "cleaner"})
+        await invalidate_roster_caches(cleaner_id)
         
         return {
             "success": True,
@@ -4103,7 +4570,7 @@ async def reject_cleaner(cleaner_id: str, reason: str = "", admin_user: User = D
 
 @api_router.get("/admin/services", response_model=List[Service])
 async def get_admin_services(admin_user: User = Depends(get_admin_user)):
-    services = await db.services.find().to_list(1000)
+    services = await db.services.find().to_list(None)
     # Handle missing category field by providing a default value
     processed_services = []
     for service in services:
@@ -4196,11 +4663,15 @@ async def delete_service(service_id: str, admin_user: User = Depends(get_admin_u
 
 @api_router.get("/admin/export/bookings")
 async def export_bookings(admin_user: User = Depends(get_admin_user)):
-    bookings = await db.bookings.find().to_list(1000)
+    # Stream the whole collection; exports must not be truncated to a page
+    bookings = analytics_db.bookings.find({}, {
+        "_id": 0, "id": 1, "customer_id": 1, "booking_date": 1, "time_slot": 1, "house_size": 1,
+        "frequency": 1, "total_amount": 1, "status": 1, "cleaner_id": 1, "created_at": 1
+    }).sort("created_at", -1)
     
     # Convert to CSV-friendly format
     csv_data = []
-    for booking in bookings:
+    async for booking in bookings:
         csv_data.append({
             "ID": booking["id"],
             "Customer ID": booking.get("customer_id", ""),
@@ -4243,6 +4714,13 @@ async def clear_all_bookings(admin_user: User = Depends(get_admin_user)):
         # Clear cancellation requests
         await db.cancellation_requests.delete_many({})
         
+        # Nothing holds capacity any more
+        await db[CAPACITY_COLLECTION].delete_many({})
+        await db[COUNTERS_COLLECTION].delete_many({})
+        availability_index.clear()
+        available_dates_cache.clear()
+        await bump_versions(db, [ROSTER_KEY])
+        
         print(f"Admin {admin_user.email} cleared {deleted_count} bookings from database")
         
         return {
@@ -4260,18 +4738,25 @@ async def clear_all_bookings(admin_user: User = Depends(get_admin_user)):
 @api_router.get("/admin/calendar/availability-summary")
 async def get_availability_summary(
     date: str,
+    request: Request,
+    response: Response,
     admin_user: User = Depends(get_admin_user)
 ):
     """Get availability summary for all cleaners for a specific date using custom calendar (optimized)"""
     try:
-        # Get all active cleaners
-        cleaners = await db.cleaners.find({"is_active": True}).to_list(1000)
-        
-        time_slots = ["08:00-10:00", "10:00-12:00", "12:00-14:00", "14:00-16:00", "16:00-18:00"]
-        
         job_date = datetime.fromisoformat(date)
         date_str = job_date.strftime("%Y-%m-%d")
         
+        # Unchanged since the client's copy (If-None-Match)
+        not_modified = await conditional_get(request, response, "availability-summary", date_str)
+        if not_modified:
+            return not_modified
+        
+        # Get all active cleaners
+        cleaners = await cleaner_profiles.cleaners()
+        
+        time_slots = SLOT_LABELS
+        
         # OPTIMIZATION: Fetch all data in bulk queries instead of per-cleaner queries
         # Get all cleaner IDs
         cleaner_ids = [cleaner["id"] for cleaner in cleaners]
@@ -4280,13 +4765,19 @@ async def get_availability_summary(
         all_bookings = await db.bookings.find({
             "cleaner_id": {"$in": cleaner_ids},
             "booking_date": date_str
-        }).to_list(1000)
+        }).to_list(None)
         
-        # Fetch ALL availability records for ALL cleaners for this date in ONE query
-        all_availability = await db.cleaner_availability.find({
-            "cleaner_id": {"$in": cleaner_ids},
-            "date": date_str
-        }).to_list(1000)
+        # Slot states come from the availability index inside the horizon
+        slot_states = None
+        all_availability = []
+        if availability_index.covers(date_str):
+            slot_states = await availability_index.slot_states(date_str, time_slots)
+        else:
+            # Fetch ALL availability records for ALL cleaners for this date in ONE query
+            all_availability = await db.cleaner_availability.find({
+                "cleaner_id": {"$in": cleaner_ids},
+                "date": date_str
+            }).to_list(None)
         
         # Organize bookings by cleaner_id and time_slot for fast lookup
         bookings_map = {}
@@ -4351,10 +4842,16 @@ async def get_availability_summary(
                             job_dict.pop("_id", None)
                             formatted_jobs.append(job_dict)
 
+                        manual_blocked = availability_record.get('is_available', True) == False if availability_record else False
+                        state = slot_states.get(cleaner_id, {}).get(slot) if slot_states is not None else None
+                        if state is not None:
+                            is_available = state["available"]
+                            manual_blocked = state["manual_blocked"]
+
                         cleaner_data["slots"][slot] = {
                             "available": is_available,
                             "existing_jobs": formatted_jobs,
-                            "manual_blocked": availability_record.get('is_available', True) == False if availability_record else False
+                            "manual_blocked": manual_blocked
                         }
                     except Exception as slot_error:
                         print(f"Warning: Error processing slot {slot} for cleaner {cleaner_id}: {slot_error}")
@@ -4437,44 +4934,32 @@ async def assign_job_to_calendar(
             "booking_date": booking_date,
             "time_slot": time_slot,
             "status": "confirmed",
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            **booking_window_fields(booking_date, time_slot),
+            **slot_fields(time_slot)
         }
         
         if assignment_data.notes:
             update_data["assignment_notes"] = assignment_data.notes
         
-        await db.bookings.update_one(
-            {"id": assignment_data.booking_id},
-            {"$set": update_data}
-        )
+        # Claim the cleaner's slot first; a manual block only warns (above)
+        if not await claim_cleaner_slot(
+            assignment_data.cleaner_id, booking_date, time_slot, assignment_data.booking_id, allow_blocked=True
+        ):
+            raise HTTPException(status_code=409, detail="Cleaner is already booked in this time slot")
         
-        # Update cleaner_availability to mark as booked
-        if availability_record:
-            await db.cleaner_availability.update_one(
-                {
-                    "cleaner_id": assignment_data.cleaner_id,
-                    "date": booking_date,
-                    "time_slot": time_slot
-                },
-                {
-                    "$set": {
-                        "is_booked": True,
-                        "booking_id": assignment_data.booking_id,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
-            )
-        else:
-            # Create availability record if it doesn't exist
-            new_availability = CleanerAvailability(
-                cleaner_id=assignment_data.cleaner_id,
-                date=booking_date,
-                time_slot=time_slot,
-                is_available=True,
-                is_booked=True,
-                booking_id=assignment_data.booking_id
-            )
-            await db.cleaner_availability.insert_one(prepare_for_mongo(new_availability.dict()))
+        previous = await transition_booking_status(db, {"id": assignment_data.booking_id}, update_data)
+        if previous is None:
+            await release_cleaner_claim(assignment_data.cleaner_id, booking_date, time_slot, assignment_data.booking_id)
+            raise HTTPException(status_code=404, detail="Booking not found")
+        # Free the slot the booking held before it was moved or reassigned
+        old_slot = (previous.get("cleaner_id"), previous.get("booking_date"), availability_label(previous.get("time_slot")))
+        if old_slot[0] and old_slot != (assignment_data.cleaner_id, booking_date, availability_label(time_slot)):
+            await release_cleaner_claim(*old_slot, assignment_data.booking_id)
+        await invalidate_date_caches(booking.get("booking_date"), booking_date, event={
+            "type": "assignment", "booking_id": assignment_data.booking_id,
+            "cleaner_id": assignment_data.cleaner_id, "booking_date": booking_date, "time_slot": time_slot
+        })
         
         response_data = {
             "message": "Job assigned successfully" if not warning_message else f"Job assigned with warning: {warning_message}",
@@ -4500,6 +4985,9 @@ async def assign_job_to_calendar(
 async def get_pending_assignment_bookings(
     date: Optional[str] = None,
     time_slot: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     admin_user: User = Depends(get_admin_user)
 ):
     """Get bookings that need manual assignment"""
@@ -4514,7 +5002,11 @@ async def get_pending_assignment_bookings(
         if time_slot:
             query["time_slot"] = time_slot
             
-        bookings = await db.bookings.find(query).sort("booking_date", 1).to_list(1000)
+        page = await fetch_page(
+            db.bookings, query, sort_field="booking_date", direction=ASCENDING,
+            limit=limit, cursor=cursor, include_total=include_total
+        )
+        bookings = page["items"]
         
         # Get customer details for each booking
         booking_details = []
@@ -4536,21 +5028,35 @@ async def get_pending_assignment_bookings(
         
         return {
             "pending_bookings": booking_details,
-            "count": len(booking_details)
+            "count": len(booking_details),
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"],
+            "total": page["total"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get pending bookings: {str(e)}")
 
 @api_router.get("/admin/calendar/unassigned-jobs")
-async def get_unassigned_jobs(admin_user: User = Depends(get_admin_user)):
-    """Get all unassigned jobs for drag-and-drop assignment"""
+async def get_unassigned_jobs(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get unassigned jobs for drag-and-drop assignment (paginated by booking date)"""
     try:
         # Get bookings without cleaner assignment
-        unassigned_bookings = await db.bookings.find({
-            "cleaner_id": {"$exists": False},
-            "status": {"$in": ["pending", "confirmed"]}
-        }).sort("booking_date", 1).to_list(1000)
+        page = await fetch_page(
+            db.bookings,
+            {
+                "cleaner_id": {"$exists": False},
+                "status": {"$in": ["pending", "confirmed"]}
+            },
+            sort_field="booking_date", direction=ASCENDING, limit=limit, cursor=cursor
+        )
+        unassigned_bookings = page["items"]
         
         jobs = []
         for booking in unassigned_bookings:
@@ -4569,8 +5075,14 @@ async def get_unassigned_jobs(admin_user: User = Depends(get_admin_user)):
                 "a_la_carte_services": booking.get("a_la_carte_services", [])
             })
         
-        return {"unassigned_jobs": jobs}
+        return {
+            "unassigned_jobs": jobs,
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"]
+        }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get unassigned jobs: {str(e)}")
 
@@ -4599,7 +5111,7 @@ async def get_cleaner_availability(
         availability_records = await db.cleaner_availability.find({
             "cleaner_id": cleaner_id,
             "date": {"$gte": start_date, "$lte": end_date}
-        }).sort("date", 1).to_list(1000)
+        }).sort("date", 1).to_list(None)
         
         # Format records
         formatted_records = []
@@ -4642,43 +5154,38 @@ async def set_cleaner_availability(
         if not date or not time_slots:
             raise HTTPException(status_code=400, detail="Date and time_slots are required")
         
-        # Update or create availability records
-        updated_count = 0
+        # Update or create availability records in one bulk write
+        operations = []
         for time_slot in time_slots:
-            # Check if record exists
-            existing = await db.cleaner_availability.find_one({
-                "cleaner_id": cleaner_id,
-                "date": date,
-                "time_slot": time_slot
-            })
-            
-            if existing:
-                # Update existing record
-                await db.cleaner_availability.update_one(
-                    {
-                        "cleaner_id": cleaner_id,
-                        "date": date,
-                        "time_slot": time_slot
+            new_record = prepare_for_mongo(CleanerAvailability(
+                cleaner_id=cleaner_id,
+                date=date,
+                time_slot=time_slot,
+                is_available=is_available,
+                is_booked=False,
+                **slot_fields(time_slot)
+            ).dict())
+            for field in ("is_available", "updated_at"):
+                new_record.pop(field, None)
+            operations.append(UpdateOne(
+                {"cleaner_id": cleaner_id, "date": date, "time_slot": time_slot},
+                {
+                    "$set": {
+                        "is_available": is_available,
+                        "updated_at": datetime.now(timezone.utc).isoformat()
                     },
-                    {
-                        "$set": {
-                            "is_available": is_available,
-                            "updated_at": datetime.now(timezone.utc).isoformat()
-                        }
-                    }
-                )
-            else:
-                # Create new record
-                new_record = CleanerAvailability(
-                    cleaner_id=cleaner_id,
-                    date=date,
-                    time_slot=time_slot,
-                    is_available=is_available,
-                    is_booked=False
-                )
-                await db.cleaner_availability.insert_one(prepare_for_mongo(new_record.dict()))
-            
-            updated_count += 1
+                    "$setOnInsert": new_record
+                },
+                upsert=True
+            ))
+        await db.cleaner_availability.bulk_write(operations, ordered=False)
+        updated_count = len(operations)
+        
+        for time_slot in time_slots:
+            availability_index.set_manual_availability(date, time_slot, cleaner_id, is_available)
+        await invalidate_date_caches(date, index=False, event={
+            "type": "availability", "cleaner_id": cleaner_id, "time_slots": time_slots, "is_available": is_available
+        })
         
         return {
             "message": f"Updated {updated_count} time slots",
@@ -4711,16 +5218,21 @@ async def toggle_cleaner_availability(
         if is_available is None:
             raise HTTPException(status_code=400, detail="is_available is required")
         
-        result = await db.cleaner_availability.update_one(
+        record = await db.cleaner_availability.find_one_and_update(
             {"id": availability_id, "cleaner_id": cleaner_id},
             {"$set": {
                 "is_available": is_available,
                 "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+            }},
+            projection={"_id": 0, "date": 1, "time_slot": 1}
         )
         
-        if result.matched_count == 0:
+        if record is None:
             raise HTTPException(status_code=404, detail="Availability record not found")
+        availability_index.set_manual_availability(record.get("date"), record.get("time_slot"), cleaner_id, is_available)
+        await invalidate_date_caches(record.get("date"), index=False, event={
+            "type": "availability", "cleaner_id": cleaner_id, "time_slots": [record.get("time_slot")], "is_available": is_available
+        })
         
         return {
             "message": "Availability updated successfully",
@@ -4736,16 +5248,20 @@ async def toggle_cleaner_availability(
 # Invoice Management Endpoints
 @api_router.get("/admin/invoices", response_model=List[Invoice])
 async def get_all_invoices(
+    response: Response,
     status: Optional[InvoiceStatus] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     admin_user: User = Depends(get_admin_user)
 ):
-    """Get all invoices with optional status filter"""
+    """Get invoices with optional status filter (paginated, newest first)"""
     query = {}
     if status:
         query["status"] = status
     
-    invoices = await db.invoices.find(query).sort("created_at", -1).to_list(1000)
-    return [Invoice(**invoice) for invoice in invoices]
+    page = await fetch_page(db.invoices, query, response, limit=limit, cursor=cursor, include_total=include_total)
+    return [Invoice(**invoice) for invoice in page["items"]]
 
 @api_router.post("/admin/invoices/generate/{booking_id}", response_model=Invoice)
 async def generate_invoice_for_booking(
@@ -4770,7 +5286,7 @@ async def generate_invoice_for_booking(
             raise HTTPException(status_code=404, detail="Customer not found")
         
         # Get service details
-        services = await db.services.find().to_list(1000)
+        services = await db.services.find().to_list(None)
         service_map = {service["id"]: service for service in services}
         
         # Create invoice items
@@ -5312,6 +5828,7 @@ async def cleaner_register(
             is_approved=False  # Requires admin approval
         )
         await db.cleaners.insert_one(prepare_for_mongo(cleaner.dict()))
+        await invalidate_roster_caches(cleaner.id)
         
         # Send pending approval email
         try:
@@ -5373,7 +5890,7 @@ async def get_cleaner_jobs(current_user: User = Depends(get_current_user)):
         # Get all bookings assigned to this cleaner
         bookings = await db.bookings.find({
             "cleaner_id": cleaner.get("id")
-        }).sort("booking_date", 1).to_list(1000)
+        }).sort("booking_date", 1).to_list(None)
         
         jobs = []
         for booking in bookings:
@@ -5445,16 +5962,15 @@ async def clock_in(
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Update booking with clock in time
-        await db.bookings.update_one(
+        await transition_booking(
             {"id": jobId},
             {
-                "$set": {
-                    "clock_in_time": datetime.now(timezone.utc).isoformat(),
-                    "clock_in_location": {"lat": latitude, "lng": longitude},
-                    "status": "in_progress",
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
+                "clock_in_time": datetime.now(timezone.utc).isoformat(),
+                "clock_in_location": {"lat": latitude, "lng": longitude},
+                "status": "in_progress",
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            },
+            index=False
         )
         
         # Get updated booking
@@ -5488,16 +6004,15 @@ async def clock_out(
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Update booking with clock out time
-        await db.bookings.update_one(
+        await transition_booking(
             {"id": jobId},
             {
-                "$set": {
-                    "clock_out_time": datetime.now(timezone.utc).isoformat(),
-                    "clock_out_location": {"lat": latitude, "lng": longitude},
-                    "status": "completed",
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
+                "clock_out_time": datetime.now(timezone.utc).isoformat(),
+                "clock_out_location": {"lat": latitude, "lng": longitude},
+                "status": "completed",
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            },
+            index=False
         )
         
         # Update cleaner's total jobs
@@ -5507,6 +6022,7 @@ async def clock_out(
                 {"id": cleaner.get("id")},
                 {"$inc": {"total_jobs": 1}}
             )
+            await cleaner_profiles.reload(cleaner.get("id"))
         
         # Get updated booking
         updated_booking = await db.bookings.find_one({"id": jobId})
@@ -5610,26 +6126,19 @@ async def get_cleaner_calendar(
         if not cleaner:
             raise HTTPException(status_code=404, detail="Cleaner not found")
 
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        range_start, range_end = local_date_range(start_date, end_date)
 
         # Get bookings for this cleaner in date range
         bookings = await db.bookings.find({
             "cleaner_id": current_user.id,
-            "booking_date": {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        }).sort("booking_date", 1).to_list(1000)
+            "start_at": {"$gte": range_start, "$lt": range_end}
+        }).sort("start_at", 1).to_list(None)
 
         # Get calendar events
         events = []
         for booking in bookings:
-            # Parse time slot to create start/end times
-            time_slot = booking.get("time_slot", "09:00-12:00")
-            time_parts = time_slot.split("-")
-            start_time_str = f"{booking['booking_date']}T{time_parts[0]}:00"
-            end_time_str = f"{booking['booking_date']}T{time_parts[1] if len(time_parts) > 1 else '12:00'}:00"
+            start_time_str = to_local_iso(booking["start_at"])
+            end_time_str = to_local_iso(booking["end_at"])
 
             event = {
                 "id": booking["id"],
@@ -5698,10 +6207,7 @@ async def update_job_status(
         elif status == "in_progress":
             update_data["started_at"] = datetime.now(timezone.utc).isoformat()
         
-        await db.bookings.update_one(
-            {"id": booking_id},
-            {"$set": update_data}
-        )
+        await transition_booking({"id": booking_id}, update_data, index=False)
         
         # Update cleaner's total jobs count if completed
         if status == "completed":
@@ -5709,6 +6215,7 @@ async def update_job_status(
                 {"id": current_user.id},
                 {"$inc": {"total_jobs": 1}}
             )
+            await cleaner_profiles.reload(current_user.id)
         
         return {"message": f"Job status updated to {status}", "status": status}
         
@@ -5731,22 +6238,17 @@ async def get_cleaner_calendar_events(
         # Get today's and next 7 days bookings
         today = datetime.now().strftime("%Y-%m-%d")
         next_week = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        range_start, range_end = local_date_range(today, next_week)
 
         bookings = await db.bookings.find({
             "cleaner_id": current_user.id,
-            "booking_date": {
-                "$gte": today,
-                "$lte": next_week
-            }
-        }).sort("booking_date", 1).to_list(1000)
+            "start_at": {"$gte": range_start, "$lt": range_end}
+        }).sort("start_at", 1).to_list(None)
 
         events = []
         for booking in bookings:
-            # Parse time slot to create start/end times
-            time_slot = booking.get("time_slot", "09:00-12:00")
-            time_parts = time_slot.split("-")
-            start_time_str = f"{booking['booking_date']}T{time_parts[0]}:00"
-            end_time_str = f"{booking['booking_date']}T{time_parts[1] if len(time_parts) > 1 else '12:00'}:00"
+            start_time_str = to_local_iso(booking["start_at"])
+            end_time_str = to_local_iso(booking["end_at"])
 
             event = {
                 "id": booking["id"],
@@ -5773,63 +6275,73 @@ async def get_cleaner_calendar_events(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get calendar events: {str(e)}")
 
+async def check_slot_availability(date: str, time_slot: Optional[str] = None) -> dict:
+    """Available cleaner count for one slot on a date (served by the availability index).
+    
+    Without a time_slot the calendar slot with the most free cleaners is reported.
+    """
+    # Served from memory inside the booking horizon; other dates cost two $in queries
+    counts, total_cleaners = await availability_index.slot_counts(date, [time_slot] if time_slot else SLOT_LABELS)
+    slot = time_slot or max(SLOT_LABELS, key=lambda label: counts[label])
+    if not total_cleaners:
+        return {
+            "date": date,
+            "available": False,
+            "available_cleaners": 0,
+            "total_cleaners": 0,
+            "message": "No cleaners available"
+        }
+    
+    available_cleaners = counts[slot]
+    return {
+        "date": date,
+        "time_slot": slot,
+        "available": available_cleaners > 0,
+        "available_cleaners": available_cleaners,
+        "total_cleaners": total_cleaners,
+        "message": f"{available_cleaners} of {total_cleaners} cleaners available"
+    }
+
 @api_router.get("/availability")
 async def get_availability(
     date: str,
+    request: Request,
+    response: Response,
     time_slot: Optional[str] = None
 ):
     """Check availability for booking on a specific date using custom calendar"""
     try:
-        # Get all active cleaners
-        cleaners = await db.cleaners.find({"is_active": True}).to_list(1000)
-
-        if not cleaners:
-            return {
-                "date": date,
-                "available": False,
-                "available_cleaners": 0,
-                "total_cleaners": 0,
-                "message": "No cleaners available"
-            }
-
-        # Check cleaner availability using database
-        available_cleaners = 0
-        slot = time_slot or "09:00-12:00"
-
-        for cleaner in cleaners:
-            # Check cleaner_availability collection
-            availability_record = await db.cleaner_availability.find_one({
-                "cleaner_id": cleaner["id"],
-                "date": date,
-                "time_slot": slot
-            })
-
-            # Check for existing bookings in this time slot
-            existing_bookings = await db.bookings.count_documents({
-                "cleaner_id": cleaner["id"],
-                "booking_date": date,
-                "time_slot": slot
-            })
-
-            # Cleaner is available if:
-            # 1. No existing bookings in the slot
-            # 2. Manual availability is not set to False
-            # 3. If no availability record exists, default to available
-            is_available = existing_bookings == 0
-            
-            if availability_record:
-                is_available = is_available and availability_record.get('is_available', True) and not availability_record.get('is_booked', False)
+        not_modified = await conditional_get(request, response, "availability", date)
+        if not_modified:
+            return not_modified
+        
+        return await check_slot_availability(date, time_slot)
 
-            if is_available:
-                available_cleaners += 1
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check availability: {str(e)}")
 
+@api_router.get("/availability/slots")
+async def get_availability_for_slots(
+    date: str,
+    time_slots: Optional[str] = Query(None, description="Comma-separated slots; defaults to every calendar slot")
+):
+    """Check availability of every time slot on a date in one call"""
+    try:
+        slots = [s.strip() for s in time_slots.split(",") if s.strip()] if time_slots else SLOT_LABELS
+        counts, total_cleaners = await availability_index.slot_counts(date, slots)
+        
         return {
             "date": date,
-            "time_slot": slot,
-            "available": available_cleaners > 0,
-            "available_cleaners": available_cleaners,
-            "total_cleaners": len(cleaners),
-            "message": f"{available_cleaners} of {len(cleaners)} cleaners available"
+            "available": any(counts.values()),
+            "total_cleaners": total_cleaners,
+            "time_slots": [
+                {
+                    "time_slot": slot,
+                    "available": counts[slot] > 0,
+                    "available_cleaners": counts[slot]
+                }
+                for slot in slots
+            ]
         }
 
     except Exception as e:
@@ -5846,11 +6358,11 @@ async def get_cleaner_earnings(current_user: User = Depends(get_current_user)):
         if not cleaner:
             raise HTTPException(status_code=404, detail="Cleaner profile not found")
 
-        # Fetch this cleaner's completed bookings
-        completed_bookings = await db.bookings.find({
-            "cleaner_id": cleaner.get("id"),
-            "status": "completed"
-        }).to_list(1000)
+        # Fetch this cleaner's completed bookings (only the fields the totals need)
+        completed_bookings = await db.bookings.find(
+            {"cleaner_id": cleaner.get("id"), "status": "completed"},
+            {"_id": 0, "total_amount": 1, "updated_at": 1, "completed_at": 1, "booking_date": 1}
+        ).to_list(None)
 
         def parse_dt(val):
             if not val:
@@ -5905,10 +6417,10 @@ async def get_cleaner_wallet(current_user: User = Depends(get_current_user)):
             raise HTTPException(status_code=404, detail="Cleaner profile not found")
         
         # Get completed jobs
-        completed_bookings = await db.bookings.find({
-            "cleaner_id": cleaner.get("id"),
-            "status": "completed"
-        }).to_list(1000)
+        completed_bookings = await db.bookings.find(
+            {"cleaner_id": cleaner.get("id"), "status": "completed"},
+            {"_id": 0, "total_amount": 1}
+        ).to_list(None)
         
         total_earnings = sum(booking.get("total_amount", 0) * 0.7 for booking in completed_bookings)
         
@@ -5926,8 +6438,13 @@ async def get_cleaner_wallet(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=f"Failed to get wallet: {str(e)}")
 
 @api_router.get("/cleaner/payments")
-async def get_cleaner_payments(current_user: User = Depends(get_current_user)):
-    """Get cleaner payment history"""
+async def get_cleaner_payments(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_request_loaders)
+):
+    """Get cleaner payment history (paginated, most recent jobs first)"""
     if current_user.role != UserRole.CLEANER:
         raise HTTPException(status_code=403, detail="Access denied")
     
@@ -5937,14 +6454,17 @@ async def get_cleaner_payments(current_user: User = Depends(get_current_user)):
             raise HTTPException(status_code=404, detail="Cleaner profile not found")
         
         # Get completed jobs
-        completed_bookings = await db.bookings.find({
-            "cleaner_id": cleaner.get("id"),
-            "status": "completed"
-        }).sort("booking_date", -1).to_list(1000)
+        page = await fetch_page(
+            db.bookings,
+            {"cleaner_id": cleaner.get("id"), "status": "completed"},
+            sort_field="booking_date", direction=DESCENDING, limit=limit, cursor=cursor
+        )
+        completed_bookings = page["items"]
+        customers = await loaders.users.load_many(booking.get("customer_id") for booking in completed_bookings)
         
         payments = []
         for booking in completed_bookings:
-            customer = await db.users.find_one({"id": booking.get("customer_id")})
+            customer = customers.get(booking.get("customer_id"))
             customer_name = "Guest Customer"
             if customer:
                 customer_name = f"{customer.get('first_name', '')} {customer.get('last_name', '')}"
@@ -5961,7 +6481,13 @@ async def get_cleaner_payments(current_user: User = Depends(get_current_user)):
             }
             payments.append(payment)
         
-        return {"payments": payments}
+        return {
+            "payments": payments,
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get payments: {str(e)}")
 
@@ -5985,49 +6511,65 @@ async def get_available_dates(
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
         
+        cache_key = (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        cached = available_dates_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # One range query for every open slot, grouped by date in memory
+        open_slots = await db.time_slot_availability.find(
+            {
+                "date": {"$gte": cache_key[0], "$lte": cache_key[1]},
+                "is_available": True,
+                "is_blocked": False
+            },
+            {"_id": 0, "date": 1, "time_slot": 1, "total_capacity": 1, "booked_count": 1}
+        ).sort([("date", 1), ("time_slot", 1)]).to_list(None)
+        
+        slots_by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for slot in open_slots:
+            total_capacity = slot.get("total_capacity", 5)
+            booked_count = slot.get("booked_count", 0)
+            if booked_count < total_capacity:
+                slots_by_date.setdefault(slot["date"], []).append({
+                    "time_slot": slot.get("time_slot"),
+                    "available_spots": total_capacity - booked_count,
+                    "total_capacity": total_capacity
+                })
+        
         available_dates = []
         current_date = start
-        
         while current_date <= end:
             date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Check if date has available time slots
-            time_slots_cursor = db.time_slot_availability.find({
-                "date": date_str,
-                "is_available": True,
-                "is_blocked": False
-            })
-            time_slots = await time_slots_cursor.to_list(100)
-            
-            # Get available time slots for this date
-            available_time_slots = []
-            for slot in time_slots:
-                if slot.get("booked_count", 0) < slot.get("total_capacity", 5):
-                    available_time_slots.append({
-                        "time_slot": slot.get("time_slot"),
-                        "available_spots": slot.get("total_capacity", 5) - slot.get("booked_count", 0),
-                        "total_capacity": slot.get("total_capacity", 5)
-                    })
-            
-            if available_time_slots:
+            if date_str in slots_by_date:
                 available_dates.append({
                     "date": date_str,
                     "day_name": current_date.strftime("%A"),
                     "is_available": True,
-                    "time_slots": available_time_slots
+                    "time_slots": slots_by_date[date_str]
                 })
-            
             current_date += timedelta(days=1)
         
-        return {"available_dates": available_dates}
+        result = {"available_dates": available_dates}
+        available_dates_cache.set(cache_key, result)
+        return result
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get available dates: {str(e)}")
 
+@api_router.get("/calendar/slots")
+async def get_calendar_slots():
+    """The daily time slot catalog (ids, labels and boundaries)"""
+    return {"slots": slot_catalog()}
+
 @api_router.get("/calendar/time-slots/{date}")
-async def get_time_slots_for_date(date: str):
+async def get_time_slots_for_date(date: str, request: Request, response: Response):
     """Get all time slots and their availability for a specific date"""
     try:
+        not_modified = await conditional_get(request, response, "time-slots", date)
+        if not_modified:
+            return not_modified
+        
         # Get time slot availability
         slots_cursor = db.time_slot_availability.find({"date": date})
         slots = await slots_cursor.to_list(100)
@@ -6037,6 +6579,7 @@ async def get_time_slots_for_date(date: str):
             time_slots.append({
                 "id": slot.get("id"),
                 "time_slot": slot.get("time_slot"),
+                "slot_index": slot.get("slot_index"),
                 "is_available": slot.get("is_available", True) and not slot.get("is_blocked", False),
                 "is_blocked": slot.get("is_blocked", False),
                 "blocked_reason": slot.get("blocked_reason"),
@@ -6051,159 +6594,508 @@ async def get_time_slots_for_date(date: str):
         raise HTTPException(status_code=500, detail=f"Failed to get time slots: {str(e)}")
 
 # Admin Calendar Management
+CALENDAR_MAX_JOBS_PER_DAY = 3
+
+async def build_calendar_overview(start: datetime, end: datetime, include_documents: bool) -> List[Dict[str, Any]]:
+    """Per-day bookings, events and cleaner schedules between start and end (inclusive).
+
+    Rows are grouped once into dicts keyed by date and (date, cleaner) instead of
+    being re-filtered per day and per cleaner. Without include_documents only
+    counts are fetched, via two $group aggregations.
+    """
+    start_date = start.strftime("%Y-%m-%d")
+    end_date = end.strftime("%Y-%m-%d")
+    # Events are stored with ISO start_time strings; the end bound is exclusive
+    events_match = {
+        "start_time": {
+            "$gte": start.isoformat(),
+            "$lt": (end + timedelta(days=1)).isoformat()
+        }
+    }
+    
+    cleaners = await analytics_db.cleaners.find(
+        {"is_active": True}, {"_id": 0, "id": 1, "first_name": 1, "last_name": 1}
+    ).to_list(100)
+    
+    bookings_by_date: Dict[str, List[Dict[str, Any]]] = {}
+    events_by_date: Dict[str, List[Dict[str, Any]]] = {}
+    booking_counts: Dict[tuple, int] = {}
+    event_counts: Dict[tuple, int] = {}
+    
+    if include_documents:
+        bookings = await analytics_db.bookings.find(
+            {"booking_date": {"$gte": start_date, "$lte": end_date}}, {"_id": 0}
+        ).to_list(None)
+        events = await analytics_db.calendar_events.find(events_match, {"_id": 0}).to_list(None)
+        for booking in bookings:
+            key = (booking.get("booking_date"), booking.get("cleaner_id"))
+            bookings_by_date.setdefault(key[0], []).append(booking)
+            booking_counts[key] = booking_counts.get(key, 0) + 1
+        for event in events:
+            key = (str(event.get("start_time", ""))[:10], event.get("cleaner_id"))
+            events_by_date.setdefault(key[0], []).append(event)
+            event_counts[key] = event_counts.get(key, 0) + 1
+    else:
+        async for row in analytics_db.bookings.aggregate([
+            {"$match": {"booking_date": {"$gte": start_date, "$lte": end_date}}},
+            {"$group": {"_id": {"date": "$booking_date", "cleaner_id": "$cleaner_id"}, "count": {"$sum": 1}}}
+        ]):
+            booking_counts[(row["_id"].get("date"), row["_id"].get("cleaner_id"))] = row["count"]
+        async for row in analytics_db.calendar_events.aggregate([
+            {"$match": events_match},
+            {"$group": {
+                "_id": {"date": {"$substrCP": ["$start_time", 0, 10]}, "cleaner_id": "$cleaner_id"},
+                "count": {"$sum": 1}
+            }}
+        ]):
+            event_counts[(row["_id"].get("date"), row["_id"].get("cleaner_id"))] = row["count"]
+    
+    day_bookings: Dict[str, int] = {}
+    for (date_str, _), count in booking_counts.items():
+        day_bookings[date_str] = day_bookings.get(date_str, 0) + count
+    day_events: Dict[str, int] = {}
+    for (date_str, _), count in event_counts.items():
+        day_events[date_str] = day_events.get(date_str, 0) + count
+    
+    calendar_data = []
+    current_date = start
+    while current_date <= end:
+        date_str = current_date.strftime("%Y-%m-%d")
+        day = {
+            "date": date_str,
+            "day_name": current_date.strftime("%A"),
+            "bookings_count": day_bookings.get(date_str, 0),
+            "events_count": day_events.get(date_str, 0),
+        }
+        
+        if include_documents:
+            day["cleaner_schedules"] = [
+                {
+                    "cleaner_id": cleaner.get("id"),
+                    "cleaner_name": f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}",
+                    "bookings_count": booking_counts.get((date_str, cleaner.get("id")), 0),
+                    "events_count": event_counts.get((date_str, cleaner.get("id")), 0),
+                    "is_available": booking_counts.get((date_str, cleaner.get("id")), 0) < CALENDAR_MAX_JOBS_PER_DAY
+                }
+                for cleaner in cleaners
+            ]
+            day["bookings"] = bookings_by_date.get(date_str, [])
+            day["events"] = events_by_date.get(date_str, [])
+        else:
+            busy = [booking_counts.get((date_str, cleaner.get("id")), 0) for cleaner in cleaners]
+            day["cleaners_booked"] = sum(1 for count in busy if count > 0)
+            day["cleaners_available"] = sum(1 for count in busy if count < CALENDAR_MAX_JOBS_PER_DAY)
+            day["unassigned_count"] = booking_counts.get((date_str, None), 0)
+        
+        calendar_data.append(day)
+        current_date += timedelta(days=1)
+    
+    return calendar_data
+
 @api_router.get("/admin/calendar/overview")
 async def get_calendar_overview(
     start_date: str,
     end_date: str,
+    mode: str = Query("detail", description="'detail' (bookings and events inline) or 'summary' (counts only)"),
     admin_user: User = Depends(get_admin_user)
 ):
     """Get complete calendar overview for admin with all bookings and cleaner schedules"""
+    if mode not in ("detail", "summary"):
+        raise HTTPException(status_code=400, detail="mode must be 'detail' or 'summary'")
     try:
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
         
-        # Get all bookings in date range
-        bookings_cursor = db.bookings.find({
-            "booking_date": {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        })
-        bookings = await bookings_cursor.to_list(1000)
-        
-        # Get all calendar events in date range
-        events_cursor = db.calendar_events.find({
-            "start_time": {
-                "$gte": start.isoformat(),
-                "$lte": end.isoformat()
-            }
-        })
-        events = await events_cursor.to_list(1000)
-        
-        # Get all cleaners
-        cleaners_cursor = db.cleaners.find({"is_active": True})
-        cleaners = await cleaners_cursor.to_list(100)
-        
-        # Organize data by date
-        calendar_data = []
-        current_date = start
-        
-        while current_date <= end:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Get bookings for this date
-            date_bookings = [b for b in bookings if b.get("booking_date") == date_str]
-            
-            # Get events for this date
-            date_events = [e for e in events if e.get("start_time", "").startswith(date_str)]
-            
-            # Get cleaner availability
-            cleaner_schedules = []
-            for cleaner in cleaners:
-                cleaner_id = cleaner.get("id")
-                cleaner_bookings = [b for b in date_bookings if b.get("cleaner_id") == cleaner_id]
-                cleaner_events = [e for e in date_events if e.get("cleaner_id") == cleaner_id]
-                
-                cleaner_schedules.append({
-                    "cleaner_id": cleaner_id,
-                    "cleaner_name": f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}",
-                    "bookings_count": len(cleaner_bookings),
-                    "events_count": len(cleaner_events),
-                    "is_available": len(cleaner_bookings) < 3  # Max 3 jobs per day
-                })
-            
-            calendar_data.append({
-                "date": date_str,
-                "day_name": current_date.strftime("%A"),
-                "bookings_count": len(date_bookings),
-                "events_count": len(date_events),
-                "cleaner_schedules": cleaner_schedules,
-                "bookings": date_bookings,
-                "events": date_events
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return {"calendar_overview": calendar_data}
+        calendar_data = await build_calendar_overview(start, end, include_documents=mode == "detail")
+        return {"calendar_overview": calendar_data, "mode": mode}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get calendar overview: {str(e)}")
 
-@api_router.post("/admin/calendar/block-date")
-async def block_date(
+@api_router.get("/admin/calendar/overview/{date}")
+async def get_calendar_overview_day(
     date: str,
-    time_slot: Optional[str] = None,
-    reason: str = "",
     admin_user: User = Depends(get_admin_user)
 ):
-    """Block a date or specific time slot from bookings"""
+    """Bookings, events and cleaner schedules of one day (detail for a summary overview)"""
     try:
-        if time_slot:
-            # Block specific time slot
-            result = await db.time_slot_availability.update_one(
-                {"date": date, "time_slot": time_slot},
-                {
-                    "$set": {
-                        "is_blocked": True,
-                        "blocked_reason": reason,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                },
-                upsert=True
-            )
-        else:
-            # Block entire date (all time slots)
-            await db.time_slot_availability.update_many(
-                {"date": date},
-                {
-                    "$set": {
-                        "is_blocked": True,
-                        "blocked_reason": reason,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
-            )
-        
-        return {"message": "Date/time slot blocked successfully", "date": date, "time_slot": time_slot}
+        day = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    try:
+        calendar_data = await build_calendar_overview(day, day, include_documents=True)
+        return calendar_data[0]
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to block date: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get calendar day: {str(e)}")
 
-@api_router.post("/admin/calendar/unblock-date")
-async def unblock_date(
-    date: str,
-    time_slot: Optional[str] = None,
+# Longest range one heatmap request may cover
+CALENDAR_HEATMAP_MAX_DAYS = 93
+
+@api_router.get("/admin/calendar/heatmap")
+async def get_calendar_heatmap(
+    start_date: str,
+    end_date: str,
     admin_user: User = Depends(get_admin_user)
 ):
-    """Unblock a date or specific time slot"""
+    """Cleaner x day x slot utilization for a date range, with per-day, per-slot and per-cleaner totals"""
     try:
-        if time_slot:
-            # Unblock specific time slot
-            await db.time_slot_availability.update_one(
-                {"date": date, "time_slot": time_slot},
-                {
-                    "$set": {
-                        "is_blocked": False,
-                        "blocked_reason": None,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end - start).days + 1 > CALENDAR_HEATMAP_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {CALENDAR_HEATMAP_MAX_DAYS} days")
+    try:
+        # Cleaner bit order of the availability index (cached in memory)
+        roster = await availability_index.roster()
+        return await load_heatmap(analytics_db, roster.ids, start_date, end_date)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build calendar heatmap: {str(e)}")
+
+async def apply_day_assignments(booking_date: str, bookings: List[dict], assignments: List[dict]) -> dict:
+    """Write optimizer assignments: move the availability rows, then the bookings,
+    then their counters.
+    
+    Bookings that change cleaner first release their old rows, so swaps and
+    chains between re-solved bookings can claim them. The new rows are then
+    claimed in one bulk_write with the conditional upsert of
+    claim_cleaner_slot(), so a slot another booking took (or an admin
+    blocked) since the optimizer read the day is not overwritten. Each
+    booking is only updated if its cleaner and status are still what the
+    optimizer saw. A booking that fails either step is reported as stale and
+    put back on its old row, together with every planned booking that moved
+    into that row. Calendar events and notifications are not created here.
+    """
+    by_id = {booking["id"]: booking for booking in bookings}
+    planned = {
+        a["booking_id"]: a for a in assignments
+        if a["cleaner_id"] and (a["changed"] or by_id[a["booking_id"]].get("status") != "confirmed")
+    }
+    if not planned:
+        return {"updated": 0, "stale": []}
+    
+    await require_slot_claim_index()
+    now = datetime.now(timezone.utc).isoformat()
+    previous = {booking_id: by_id[booking_id].get("cleaner_id") for booking_id in planned}
+    moving = [
+        booking_id for booking_id, a in planned.items()
+        if previous[booking_id] and previous[booking_id] != a["cleaner_id"]
+    ]
+    
+    def release_operation(cleaner_id: str, booking_id: str) -> UpdateOne:
+        return UpdateOne(
+            {"cleaner_id": cleaner_id, "date": booking_date, "booking_id": booking_id},
+            {"$set": {"is_booked": False, "booking_id": None, "updated_at": now}}
+        )
+    
+    def with_dependents(failed: set) -> set:
+        """`failed` plus the planned bookings that moved into their old rows, transitively"""
+        result, queue = set(failed), list(failed)
+        while queue:
+            failed_id = queue.pop()
+            old_cleaner = previous.get(failed_id)
+            if failed_id not in moving or not old_cleaner:
+                continue
+            slot = availability_label(planned[failed_id]["time_slot"])
+            for booking_id, a in planned.items():
+                if booking_id not in result and a["cleaner_id"] == old_cleaner \
+                        and availability_label(a["time_slot"]) == slot:
+                    result.add(booking_id)
+                    queue.append(booking_id)
+        return result
+    
+    async def unwind(booking_ids: set, claimed: set, written: set) -> None:
+        """Put bookings back on their old rows: drop the new claims and booking writes they made"""
+        releases = [release_operation(planned[b]["cleaner_id"], b) for b in booking_ids & claimed]
+        if releases:
+            await db.cleaner_availability.bulk_write(releases, ordered=False)
+        reverts = [
+            UpdateOne(
+                {"id": b, "cleaner_id": planned[b]["cleaner_id"], "updated_at": now},
+                {"$set": {"cleaner_id": previous[b], "status": by_id[b].get("status")}}
             )
-        else:
-            # Unblock entire date
-            await db.time_slot_availability.update_many(
-                {"date": date},
+            for b in booking_ids & written
+        ]
+        if reverts:
+            await db.bookings.bulk_write(reverts, ordered=False)
+        # Only bookings still on their old cleaner get the row back; one that was
+        # reassigned or cancelled meanwhile already released it
+        restore = [b for b in booking_ids if b in moving]
+        if not restore:
+            return
+        current = {
+            doc["id"]: doc async for doc in db.bookings.find(
+                {"id": {"$in": restore}}, {"_id": 0, "id": 1, "cleaner_id": 1, "status": 1}
+            )
+        }
+        for b in restore:
+            doc = current.get(b)
+            if not doc or doc.get("cleaner_id") != previous[b] or doc.get("status") == "cancelled":
+                continue
+            if not await claim_cleaner_slot(previous[b], booking_date, planned[b]["time_slot"], b, allow_blocked=True):
+                print(f"Warning: could not restore the availability row of booking {b} for cleaner {previous[b]}")
+    
+    if moving:
+        await db.cleaner_availability.bulk_write(
+            [release_operation(previous[b], b) for b in moving], ordered=False
+        )
+    
+    order = list(planned)
+    failed = set()
+    try:
+        await db.cleaner_availability.bulk_write([
+            UpdateOne(*cleaner_claim_update(planned[b]["cleaner_id"], booking_date, planned[b]["time_slot"], b),
+                      upsert=True)
+            for b in order
+        ], ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != 11000 for error in errors):
+            raise
+        # Duplicate key: the slot is held by another booking or blocked
+        failed = {order[error["index"]] for error in errors}
+    claimed = set(planned) - failed
+    stale = with_dependents(failed)
+    await unwind(stale, claimed, set())
+    
+    pending = [b for b in order if b not in stale]
+    written = set()
+    if pending:
+        result = await db.bookings.bulk_write([
+            UpdateOne(
+                {"id": b, "cleaner_id": previous[b], "status": by_id[b].get("status")},
+                {"$set": {"cleaner_id": planned[b]["cleaner_id"], "status": "confirmed", "updated_at": now}}
+            )
+            for b in pending
+        ], ordered=False)
+        written = set(pending)
+        if result.matched_count < len(pending):
+            # Bookings this write updated carry its updated_at; the others changed first
+            written = {
+                doc["id"] async for doc in db.bookings.find(
+                    {"id": {"$in": pending}, "updated_at": now}, {"_id": 0, "id": 1}
+                )
+            }
+            changed = with_dependents({b for b in pending if b not in written})
+            await unwind(changed, claimed, written)
+            stale |= changed
+    applied = [planned[b] for b in order if b not in stale]
+    
+    await apply_counter_changes(db, [
+        (by_id[a["booking_id"]], {**by_id[a["booking_id"]], "cleaner_id": a["cleaner_id"], "status": "confirmed"})
+        for a in applied
+    ])
+    
+    await invalidate_date_caches(booking_date, event={
+        "type": "assignment", "booking_ids": [a["booking_id"] for a in applied], "optimized": True
+    })
+    return {"updated": len(applied), "stale": sorted(stale)}
+
+@api_router.post("/admin/calendar/optimize-day")
+async def optimize_calendar_day(
+    date: str,
+    mode: str = Query("dry_run", description="'dry_run' (propose only) or 'apply' (write the assignments)"),
+    reassign: bool = Query(False, description="Also re-solve pending/confirmed bookings that already have a cleaner"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Assign a day's open bookings to cleaners as one min-cost matching (see services.day_optimizer)"""
+    if mode not in ("dry_run", "apply"):
+        raise HTTPException(status_code=400, detail="mode must be 'dry_run' or 'apply'")
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    try:
+        bookings = await db.bookings.find(
+            {"booking_date": date},
+            {"_id": 0, "id": 1, "cleaner_id": 1, "status": 1, "booking_date": 1, "time_slot": 1,
+             "slot_index": 1, "house_size": 1, "total_amount": 1, "address.zip_code": 1}
+        ).to_list(None)
+        cleaners = await cleaner_profiles.cleaners(approved_only=True)
+        cleaner_ids = [cleaner["id"] for cleaner in cleaners]
+        availability = await db.cleaner_availability.find(
+            {"date": date, "cleaner_id": {"$in": cleaner_ids}},
+            {"_id": 0, "cleaner_id": 1, "time_slot": 1, "slot_index": 1, "is_available": 1, "is_booked": 1, "booking_id": 1}
+        ).to_list(None)
+        recent_jobs = cleaner_profiles.recent_jobs(cleaner_ids)
+        
+        result = optimize_day(bookings, cleaners, availability, recent_jobs, reassign=reassign, travel=travel_matrix)
+        result.update({"date": date, "mode": mode, "reassign": reassign})
+        if mode == "apply":
+            result["applied"] = await apply_day_assignments(date, bookings, result["assignments"])
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to optimize day: {str(e)}")
+
+# Most dates one block/unblock call may touch
+CALENDAR_BLOCK_MAX_DATES = 366
+WEEKDAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+def split_csv(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+def resolve_blackout_dates(
+    date: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    weekdays: Optional[str],
+    holidays: Optional[str]
+) -> List[str]:
+    """Dates selected by a single date, a from/to range (optionally limited to
+    some weekdays) and a list of holidays"""
+    def parse_day(value: str):
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid date '{value}'. Use YYYY-MM-DD")
+    
+    selected = set()
+    if date:
+        selected.add(parse_day(date))
+    for holiday in split_csv(holidays):
+        selected.add(parse_day(holiday))
+    
+    if start_date or end_date:
+        if not (start_date and end_date):
+            raise HTTPException(status_code=400, detail="start_date and end_date must be given together")
+        start, end = parse_day(start_date), parse_day(end_date)
+        if end < start:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        if (end - start).days + 1 > CALENDAR_BLOCK_MAX_DATES:
+            raise HTTPException(status_code=400, detail=f"Range is limited to {CALENDAR_BLOCK_MAX_DATES} days")
+        
+        allowed_days = set(range(7))
+        if weekdays:
+            allowed_days = set()
+            for day in split_csv(weekdays):
+                day = day.lower()[:3]
+                if day.isdigit() and 0 <= int(day) <= 6:
+                    allowed_days.add(int(day))
+                elif day in WEEKDAY_NAMES:
+                    allowed_days.add(WEEKDAY_NAMES.index(day))
+                else:
+                    raise HTTPException(status_code=400, detail=f"Invalid weekday '{day}'. Use mon-sun or 0-6 (Monday=0)")
+        current = start
+        while current <= end:
+            if current.weekday() in allowed_days:
+                selected.add(current)
+            current += timedelta(days=1)
+    elif weekdays:
+        raise HTTPException(status_code=400, detail="weekdays requires start_date and end_date")
+    
+    if not selected:
+        raise HTTPException(status_code=400, detail="Give a date, a start_date/end_date range or holidays")
+    if len(selected) > CALENDAR_BLOCK_MAX_DATES:
+        raise HTTPException(status_code=400, detail=f"At most {CALENDAR_BLOCK_MAX_DATES} dates per call")
+    return sorted(day.strftime("%Y-%m-%d") for day in selected)
+
+def resolve_blackout_slots(time_slot: Optional[str], time_slots: Optional[str]) -> List[str]:
+    """Requested calendar slots; every slot of the day when none are given"""
+    slots = ([time_slot] if time_slot else []) + split_csv(time_slots)
+    unknown = [slot for slot in slots if slot_index(slot) is None]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown time slots: {', '.join(unknown)}")
+    # Stored under the catalog label, whatever spelling was passed
+    return list(dict.fromkeys(SLOT_LABELS[slot_index(slot)] for slot in slots)) or SLOT_LABELS
+
+async def set_slots_blocked(dates: List[str], time_slots: List[str], is_blocked: bool, reason: Optional[str] = None) -> int:
+    """Block or unblock every (date, slot) pair in one bulk write.
+    
+    Missing slot documents are created so a blackout also holds for days the
+    availability horizon has not reached yet.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    operations = []
+    for date_str in dates:
+        for time_slot in time_slots:
+            new_record = prepare_for_mongo(TimeSlotAvailability(
+                date=date_str,
+                time_slot=time_slot,
+                **slot_fields(time_slot)
+            ).dict())
+            for field in ("is_blocked", "blocked_reason", "updated_at"):
+                new_record.pop(field, None)
+            operations.append(UpdateOne(
+                {"date": date_str, "time_slot": time_slot},
                 {
                     "$set": {
-                        "is_blocked": False,
-                        "blocked_reason": None,
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
-            )
-        
-        return {"message": "Date/time slot unblocked successfully", "date": date, "time_slot": time_slot}
+                        "is_blocked": is_blocked,
+                        "blocked_reason": reason if is_blocked else None,
+                        "updated_at": now
+                    },
+                    "$setOnInsert": new_record
+                },
+                upsert=True
+            ))
+    result = await db.time_slot_availability.bulk_write(operations, ordered=False)
+    await invalidate_date_caches(*dates, index=False, event={"type": "slot", "time_slots": time_slots, "is_blocked": is_blocked})
+    return result.modified_count + result.upserted_count
+
+@api_router.post("/admin/calendar/block-date")
+async def block_date(
+    date: Optional[str] = None,
+    time_slot: Optional[str] = None,
+    reason: str = "",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    weekdays: Optional[str] = Query(None, description="Comma-separated weekdays within start_date..end_date (mon-sun or 0-6)"),
+    holidays: Optional[str] = Query(None, description="Comma-separated extra dates (YYYY-MM-DD)"),
+    time_slots: Optional[str] = Query(None, description="Comma-separated slots; defaults to every calendar slot"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Block dates or specific time slots from bookings (one date, a range, recurring weekdays, holidays)"""
+    try:
+        dates = resolve_blackout_dates(date, start_date, end_date, weekdays, holidays)
+        slots = resolve_blackout_slots(time_slot, time_slots)
+        updated = await set_slots_blocked(dates, slots, True, reason)
+        return {
+            "message": "Date/time slot blocked successfully",
+            "date": date,
+            "time_slot": time_slot,
+            "dates": dates,
+            "time_slots": slots,
+            "updated": updated
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to block date: {str(e)}")
+
+@api_router.post("/admin/calendar/unblock-date")
+async def unblock_date(
+    date: Optional[str] = None,
+    time_slot: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    weekdays: Optional[str] = Query(None, description="Comma-separated weekdays within start_date..end_date (mon-sun or 0-6)"),
+    holidays: Optional[str] = Query(None, description="Comma-separated extra dates (YYYY-MM-DD)"),
+    time_slots: Optional[str] = Query(None, description="Comma-separated slots; defaults to every calendar slot"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Unblock dates or specific time slots (one date, a range, recurring weekdays, holidays)"""
+    try:
+        dates = resolve_blackout_dates(date, start_date, end_date, weekdays, holidays)
+        slots = resolve_blackout_slots(time_slot, time_slots)
+        updated = await set_slots_blocked(dates, slots, False)
+        return {
+            "message": "Date/time slot unblocked successfully",
+            "date": date,
+            "time_slot": time_slot,
+            "dates": dates,
+            "time_slots": slots,
+            "updated": updated
+        }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to unblock date: {str(e)}")
 
@@ -6233,7 +7125,7 @@ async def get_cleaner_availability(
                 "$lte": end_date
             }
         })
-        bookings = await bookings_cursor.to_list(1000)
+        bookings = await bookings_cursor.to_list(None)
         
         # Get calendar events
         events_cursor = db.calendar_events.find({
@@ -6243,7 +7135,7 @@ async def get_cleaner_availability(
                 "$lte": end.isoformat()
             }
         })
-        events = await events_cursor.to_list(1000)
+        events = await events_cursor.to_list(None)
         
         # Organize by date
         availability_data = []
@@ -6325,29 +7217,31 @@ async def assign_cleaner_to_booking(
                 detail=f"Cleaner already has a booking in this time slot"
             )
         
+        # Claim the cleaner's slot before touching the booking
+        if not await claim_cleaner_slot(cleaner_id, booking_date, time_slot, booking_id, allow_blocked=True):
+            raise HTTPException(status_code=409, detail="Cleaner is already booked in this time slot")
+        
         # Update booking with cleaner assignment
-        await db.bookings.update_one(
+        previous = await transition_booking_status(
+            db,
             {"id": booking_id},
-            {
-                "$set": {
-                    "cleaner_id": cleaner_id,
-                    "status": "confirmed",
-                    "assignment_type": "manual",
-                    "assigned_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
-        
-        # Update cleaner availability
-        await db.cleaner_availability.update_one(
             {
                 "cleaner_id": cleaner_id,
-                "date": booking_date,
-                "time_slot": time_slot
-            },
-            {"$set": {"is_booked": True, "booking_id": booking_id}}
+                "status": "confirmed",
+                "assignment_type": "manual",
+                "assigned_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }
         )
+        if previous is None:
+            await release_cleaner_claim(cleaner_id, booking_date, time_slot, booking_id)
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if previous.get("cleaner_id") and previous["cleaner_id"] != cleaner_id:
+            await release_cleaner_claim(previous["cleaner_id"], booking_date, time_slot, booking_id)
+        await invalidate_date_caches(booking_date, event={
+            "type": "assignment", "booking_id": booking_id, "cleaner_id": cleaner_id,
+            "booking_date": booking_date, "time_slot": booking.get("time_slot")
+        })
         
         # Send notification to cleaner
         try:
@@ -6400,23 +7294,31 @@ async def assign_booking_to_cleaner(
         if existing_bookings >= 3:
             raise HTTPException(status_code=409, detail="Cleaner is fully booked for this date")
         
+        # Claim the cleaner's slot before touching the booking
+        if not await claim_cleaner_slot(cleaner_id, booking_date, booking.get("time_slot"), booking_id, allow_blocked=True):
+            raise HTTPException(status_code=409, detail="Cleaner is already booked in this time slot")
+        
         # Update booking with cleaner assignment
-        await db.bookings.update_one(
+        previous = await transition_booking_status(
+            db,
             {"id": booking_id},
             {
-                "$set": {
-                    "cleaner_id": cleaner_id,
-                    "status": "confirmed",
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
+                "cleaner_id": cleaner_id,
+                "status": "confirmed",
+                "updated_at": datetime.now(timezone.utc).isoformat()
             }
         )
+        if previous is None:
+            await release_cleaner_claim(cleaner_id, booking_date, booking.get("time_slot"), booking_id)
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if previous.get("cleaner_id") and previous["cleaner_id"] != cleaner_id:
+            await release_cleaner_claim(previous["cleaner_id"], booking_date, booking.get("time_slot"), booking_id)
         
         # Create calendar event
-        time_slot = booking.get("time_slot", "09:00-12:00")
-        time_parts = time_slot.split("-")
-        start_time_str = f"{booking_date}T{time_parts[0]}:00"
-        end_time_str = f"{booking_date}T{time_parts[1] if len(time_parts) > 1 else '12:00'}:00"
+        time_slot = booking.get("time_slot")
+        start_clock, end_clock = slot_clock_range(time_slot)
+        start_time_str = f"{booking_date}T{start_clock}:00"
+        end_time_str = f"{booking_date}T{end_clock}:00"
         
         customer = await db.users.find_one({"id": booking.get("customer_id")})
         customer_name = "Guest"
@@ -6446,10 +7348,14 @@ async def assign_booking_to_cleaner(
             {"date": booking_date, "time_slot": time_slot},
             {
                 "$inc": {"booked_count": 1},
-                "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+                "$set": {"updated_at": datetime.now(timezone.utc).isoformat(), **slot_fields(time_slot)}
             },
             upsert=True
         )
+        await invalidate_date_caches(booking_date, event={
+            "type": "assignment", "booking_id": booking_id, "cleaner_id": cleaner_id,
+            "booking_date": booking_date, "time_slot": booking.get("time_slot")
+        })
         
         # Send notifications if cleaner changed
         new_cleaner_name = f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}"
@@ -6552,7 +7458,7 @@ async def get_calendar_events(
             query["cleaner_id"] = cleaner_id
         
         events_cursor = db.calendar_events.find(query)
-        events = await events_cursor.to_list(1000)
+        events = await events_cursor.to_list(None)
         
         formatted_events = []
         for event in events:
@@ -6577,185 +7483,148 @@ async def get_calendar_events(
         raise HTTPException(status_code=500, detail=f"Failed to get calendar events: {str(e)}")
 
 # Enhanced auto-assign cleaner algorithm
-async def auto_assign_best_cleaner(booking_date: str, time_slot: str, house_size: str = None) -> Optional[str]:
+async def rank_cleaners_for_slot(booking_date: str, time_slot: str, house_size: str = None,
+                                 zip_code: str = None) -> List[Dict[str, Any]]:
+    """
+    Cleaners who can take a booking, best first.
+    Scores house size fit, rating, experience and load (see services.cleaner_scoring)
+    from the cached cleaner profiles; outside the availability index's horizon
+    the day's load comes from at most two aggregations grouped by cleaner.
+    With a zip_code the detour from the cleaners' jobs in the neighbouring
+    slots counts too (from the index's day, else one bookings query).
+    """
+    # Inside the booking horizon the index already knows who is free in the slot
+    use_index = availability_index.covers(booking_date)
+    if use_index:
+        candidate_ids = await availability_index.available_cleaners(booking_date, time_slot, approved_only=True)
+        if not candidate_ids:
+            return []
+        jobs_today = await availability_index.jobs_on(booking_date)
+        profiles = await cleaner_profiles.get_many(candidate_ids)
+        cleaners = [profiles[cleaner_id] for cleaner_id in candidate_ids if cleaner_id in profiles]
+    else:
+        # All approved and active cleaners
+        cleaners = await cleaner_profiles.cleaners(approved_only=True)
+    if not cleaners:
+        return []
+    
+    cleaner_ids = [cleaner["id"] for cleaner in cleaners]
+    if use_index:
+        bookings_today = [jobs_today.get(cleaner_id, 0) for cleaner_id in cleaner_ids]
+        excluded = [False] * len(cleaner_ids)
+    else:
+        load = await load_cleaner_load(db, cleaner_ids, booking_date, time_slot)
+        # Manual availability record (optional). If none, treat as available.
+        unavailable = set(await load_unavailable(db, cleaner_ids, booking_date, time_slot))
+        bookings_today = [load.get(cleaner_id, {}).get("today", 0) for cleaner_id in cleaner_ids]
+        excluded = [
+            load.get(cleaner_id, {}).get("in_slot", 0) > 0 or cleaner_id in unavailable
+            for cleaner_id in cleaner_ids
+        ]
+    recent = cleaner_profiles.recent_jobs(cleaner_ids)
+    recent_jobs = [recent[cleaner_id] for cleaner_id in cleaner_ids]
+    travel_minutes = None
+    slot = slot_index(time_slot)
+    if zip_code and slot is not None:
+        if use_index:
+            # The index loaded the day's bookings already, with their zips
+            day_bookings = await availability_index.route_stops(booking_date)
+        else:
+            day_bookings = await db.bookings.find(
+                {"booking_date": booking_date, "cleaner_id": {"$in": cleaner_ids}},
+                {"_id": 0, "cleaner_id": 1, "status": 1, "time_slot": 1, "slot_index": 1,
+                 "address.zip_code": 1, "zip_code": 1}
+            ).to_list(None)
+        before, after = travel_matrix.route_neighbours(cleaner_ids, day_bookings)
+        travel_minutes = travel_matrix.detour_minutes(
+            before[:, slot], travel_matrix.position(zip_code), after[:, slot]
+        )
+    return rank_cleaners(cleaners, bookings_today, recent_jobs, excluded, house_size, travel_minutes)
+
+async def auto_assign_best_cleaner(booking_date: str, time_slot: str, house_size: str = None,
+                                   zip_code: str = None, booking_id: str = None) -> Optional[str]:
     """
     Automatically assign the best available cleaner for a booking.
     Enhanced algorithm considers house size, cleaner experience, and load balancing.
+    With a booking_id the cleaner's slot is claimed for the booking
+    (claim_cleaner_slot); if a concurrent booking claimed it first, the next
+    cleaner of the same ranking is tried.
     Returns cleaner_id or None if no cleaner available.
     """
     try:
-        # Get all approved and active cleaners
-        cleaners = await db.cleaners.find({
-            "is_approved": True,
-            "is_active": True
-        }).to_list(1000)
-
-        if not cleaners:
-            print("No approved cleaners available")
-            return None
-
-        cleaner_scores = []
-        for cleaner in cleaners:
-            cleaner_id = cleaner.get("id")
-
-            # Count existing confirmed/in_progress bookings on this date
-            bookings_count = await db.bookings.count_documents({
-                "cleaner_id": cleaner_id,
-                "booking_date": booking_date,
-                "status": {"$in": ["confirmed", "in_progress"]}
-            })
-            
-            # Dynamic daily cap based on cleaner experience
-            max_daily_jobs = 3
-            if cleaner.get("total_jobs", 0) > 100:  # Experienced cleaners can handle more
-                max_daily_jobs = 4
-            elif cleaner.get("total_jobs", 0) < 20:  # New cleaners get fewer jobs
-                max_daily_jobs = 2
-                
-            if bookings_count >= max_daily_jobs:
-                continue
-
-            # Check for existing bookings in the same time slot
-            existing_booking = await db.bookings.find_one({
-                "cleaner_id": cleaner_id,
-                "booking_date": booking_date,
-                "time_slot": time_slot,
-                "status": {"$in": ["confirmed", "in_progress"]}
-            })
-            if existing_booking:
-                continue
-
-            # Manual availability record (optional). If none, treat as available.
-            availability = await db.cleaner_availability.find_one({
-                "cleaner_id": cleaner_id,
-                "date": booking_date,
-                "time_slot": time_slot
-            })
-            is_available = True
-            if availability is not None:
-                is_available = availability.get("is_available", True) and not availability.get("is_booked", False)
-            if not is_available:
-                continue
-
-            # Calculate score based on multiple factors
-            rating = cleaner.get("rating", 5.0)
-            total_jobs = cleaner.get("total_jobs", 0)
-            experience_months = cleaner.get("experience_months", 0)
-            
-            # Base score from rating and experience
-            base_score = (rating * 10) + (experience_months * 0.1)
-            
-            # Penalty for current load
-            load_penalty = bookings_count * 5
-            
-            # Bonus for house size compatibility (if specified)
-            size_bonus = 0
-            if house_size:
-                cleaner_preferred_sizes = cleaner.get("preferred_house_sizes", [])
-                if house_size in cleaner_preferred_sizes:
-                    size_bonus = 10
-                elif not cleaner_preferred_sizes:  # No preference = good for all sizes
-                    size_bonus = 5
-            
-            # Penalty for too many jobs recently (load balancing)
-            recent_jobs = await db.bookings.count_documents({
-                "cleaner_id": cleaner_id,
-                "booking_date": {"$gte": (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")},
-                "status": {"$in": ["confirmed", "in_progress", "completed"]}
-            })
-            recent_load_penalty = recent_jobs * 0.5
-            
-            final_score = base_score - load_penalty + size_bonus - recent_load_penalty
-            
-            cleaner_scores.append({
-                "cleaner_id": cleaner_id,
-                "score": final_score,
-                "rating": rating,
-                "total_jobs": total_jobs,
-                "bookings_today": bookings_count
-            })
-
-        if not cleaner_scores:
+        ranked = await rank_cleaners_for_slot(booking_date, time_slot, house_size, zip_code)
+        if not ranked:
             print(f"No available cleaners for {booking_date} at {time_slot}")
             return None
 
-        cleaner_scores.sort(key=lambda x: x["score"], reverse=True)
-        best_cleaner = cleaner_scores[0]
-        print(f"Auto-assigned cleaner {best_cleaner['cleaner_id']} with score {best_cleaner['score']}")
-        return best_cleaner["cleaner_id"]
+        for candidate in ranked:
+            if booking_id and not await claim_cleaner_slot(candidate["cleaner_id"], booking_date, time_slot, booking_id):
+                print(f"Cleaner {candidate['cleaner_id']} was claimed concurrently for {booking_date} at {time_slot}")
+                continue
+            print(f"Auto-assigned cleaner {candidate['cleaner_id']} with score {candidate['score']}")
+            return candidate["cleaner_id"]
+        print(f"All ranked cleaners were claimed for {booking_date} at {time_slot}")
+        return None
 
     except Exception as e:
         print(f"Error in auto_assign_best_cleaner: {e}")
         return None
 
 # Initialize time slot availability (helper function)
-async def initialize_cleaner_availability(cleaner_id: str, days_ahead: int = 90):
+async def initialize_cleaner_availability(cleaner_id: str, days_ahead: int = AVAILABILITY_HORIZON_DAYS):
     """Initialize availability for a specific cleaner for next N days"""
-    time_slots = [
-        "08:00-10:00",
-        "10:00-12:00",
-        "12:00-14:00",
-        "14:00-16:00",
-        "16:00-18:00"
-    ]
-    
-    today = datetime.now()
-    
-    for day_offset in range(days_ahead):
-        date = today + timedelta(days=day_offset)
-        date_str = date.strftime("%Y-%m-%d")
-        
-        for time_slot in time_slots:
-            # Check if already exists
-            existing = await db.cleaner_availability.find_one({
-                "cleaner_id": cleaner_id,
-                "date": date_str,
-                "time_slot": time_slot
-            })
-            
-            if not existing:
-                availability_data = CleanerAvailability(
-                    cleaner_id=cleaner_id,
-                    date=date_str,
-                    time_slot=time_slot,
-                    is_available=True,
-                    is_booked=False
-                )
-                await db.cleaner_availability.insert_one(prepare_for_mongo(availability_data.dict()))
-    
-    print(f"Initialized availability for cleaner {cleaner_id} for next {days_ahead} days")
+    inserted = await initialize_cleaners_availability([cleaner_id], days_ahead)
+    print(f"Initialized availability for cleaner {cleaner_id} for next {days_ahead} days ({inserted} new slots)")
+
+async def initialize_cleaners_availability(cleaner_ids: List[str], days_ahead: int = AVAILABILITY_HORIZON_DAYS) -> int:
+    """Create the missing availability rows of several cleaners in one bulk write"""
+    def make_document(cleaner_id: str, date_str: str, time_slot: str) -> dict:
+        return prepare_for_mongo(CleanerAvailability(
+            cleaner_id=cleaner_id,
+            date=date_str,
+            time_slot=time_slot,
+            is_available=True,
+            is_booked=False,
+            **slot_fields(time_slot)
+        ).dict())
+    
+    return await fill_missing_slots(
+        db.cleaner_availability, horizon_dates(days_ahead), SLOT_LABELS, make_document,
+        owner_field="cleaner_id", owners=cleaner_ids
+    )
 
-async def initialize_time_slot_availability(days_ahead: int = 90):
+async def initialize_time_slot_availability(days_ahead: int = AVAILABILITY_HORIZON_DAYS) -> int:
     """Initialize time slot availability for next N days"""
-    time_slots = [
-        "08:00-10:00",
-        "10:00-12:00",
-        "12:00-14:00",
-        "14:00-16:00",
-        "16:00-18:00"
+    def make_document(_owner, date_str: str, time_slot: str) -> dict:
+        return prepare_for_mongo(TimeSlotAvailability(
+            date=date_str,
+            time_slot=time_slot,
+            total_capacity=5,  # 5 cleaners can work this slot
+            booked_count=0,
+            **slot_fields(time_slot)
+        ).dict())
+    
+    dates = horizon_dates(days_ahead)
+    inserted = await fill_missing_slots(db.time_slot_availability, dates, SLOT_LABELS, make_document)
+    if inserted:
+        # Newly opened days change what the date picker and slot views return
+        await invalidate_date_caches(*dates, index=False)
+    return inserted
+
+async def extend_availability_horizon(days_ahead: int = AVAILABILITY_HORIZON_DAYS) -> dict:
+    """Roll the availability tables forward so they always cover the next N days.
+    
+    Only the missing days are written, so after the first run this adds one
+    day per slot table and cleaner.
+    """
+    cleaner_ids = [
+        c["id"] async for c in db.cleaners.find({"is_approved": True, "is_active": True}, {"_id": 0, "id": 1})
     ]
-    
-    today = datetime.now()
-    
-    for day_offset in range(days_ahead):
-        date = today + timedelta(days=day_offset)
-        date_str = date.strftime("%Y-%m-%d")
-        
-        for time_slot in time_slots:
-            # Check if already exists
-            existing = await db.time_slot_availability.find_one({
-                "date": date_str,
-                "time_slot": time_slot
-            })
-            
-            if not existing:
-                slot_data = TimeSlotAvailability(
-                    date=date_str,
-                    time_slot=time_slot,
-                    total_capacity=5,  # 5 cleaners can work this slot
-                    booked_count=0
-                )
-                await db.time_slot_availability.insert_one(prepare_for_mongo(slot_data.dict()))
+    return {
+        "time_slot_rows": await initialize_time_slot_availability(days_ahead),
+        "cleaner_rows": await initialize_cleaners_availability(cleaner_ids, days_ahead),
+        "cleaners": len(cleaner_ids)
+    }
 
 # ============================================================================
 # END CUSTOM CALENDAR API ENDPOINTS
@@ -6847,68 +7716,55 @@ async def initialize_database():
     # Create time slots for next 30 days if they don't exist
     slots_count = await db.time_slots.count_documents({})
     if slots_count == 0:
-        time_slots = ["08:00-10:00", "10:00-12:00", "12:00-14:00", "14:00-16:00", "16:00-18:00"]
-        
         for i in range(30):  # Next 30 days
             slot_date = (datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d")
             
-            for time_slot in time_slots:
-                slot = TimeSlot(date=slot_date, time_slot=time_slot)
+            for time_slot in SLOT_LABELS:
+                slot = TimeSlot(date=slot_date, time_slot=time_slot, **slot_fields(time_slot))
                 await db.time_slots.insert_one(prepare_for_mongo(slot.dict()))
         
         print("Created time slots for next 30 days")
     
-    # Initialize custom calendar time slot availability
-    availability_count = await db.time_slot_availability.count_documents({})
-    if availability_count == 0:
-        await initialize_time_slot_availability(90)  # Initialize for next 90 days
-        print("Initialized calendar time slot availability for next 90 days")
+    # Custom calendar time slot availability is kept AVAILABILITY_HORIZON_DAYS
+    # ahead by availability_horizon_loop()
 
 # Startup event moved to lifespan handler
 
 # Reports endpoints
-@api_router.get("/admin/reports/weekly")
-async def get_weekly_report(admin_user: User = Depends(get_admin_user)):
-    """Get weekly report data"""
-    from datetime import datetime, timedelta
-    
-    # Get current week start and end
-    today = datetime.now()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
-    
-    # Get bookings for this week
-    bookings = await db.bookings.find({
-        "booking_date": {
-            "$gte": week_start.strftime("%Y-%m-%d"),
-            "$lte": week_end.strftime("%Y-%m-%d")
-        }
-    }).to_list(1000)
-    
-    # Calculate stats
-    total_bookings = len(bookings)
-    revenue = sum(booking.get("total_amount", 0) for booking in bookings)
-    cancellations = len([b for b in bookings if b.get("status") == "cancelled"])
-    reschedules = len([b for b in bookings if b.get("status") == "rescheduled"])
-    completed = len([b for b in bookings if b.get("status") == "completed"])
+async def build_bookings_report(start_date: str, end_date: str) -> dict:
+    """Summarize a period's bookings for the weekly and monthly reports"""
+    # Counts and revenue from the per-date counters
+    counters = sum_counters((await get_daily_counters(analytics_db, start_date, end_date)).values())
+    total_bookings = counters["total"]
+    revenue = counters["revenue_total"]
+    cancellations = counters["status"].get("cancelled", 0)
+    reschedules = counters["status"].get("rescheduled", 0)
+    completed = counters["status"].get("completed", 0)
     
     completion_rate = (completed / total_bookings * 100) if total_bookings > 0 else 0
     avg_booking_value = (revenue / total_bookings) if total_bookings > 0 else 0
     
-    # Get cleaner job completion data
+    # Only completed bookings are loaded, for the per-cleaner breakdown
+    range_start, range_end = local_date_range(start_date, end_date)
+    completed_bookings = await analytics_db.bookings.find(
+        {"start_at": {"$gte": range_start, "$lt": range_end}, "status": "completed", "cleaner_id": {"$ne": None}},
+        {"_id": 0, "id": 1, "cleaner_id": 1, "completed_at": 1, "completion_notes": 1, "total_amount": 1}
+    ).to_list(None)
+    
+    # Get cleaner job completion data (names from the cleaner profile cache)
+    cleaners = await cleaner_profiles.get_many({b["cleaner_id"] for b in completed_bookings})
     cleaner_completions = []
-    for booking in bookings:
-        if booking.get("status") == "completed" and booking.get("cleaner_id"):
-            cleaner = await db.cleaners.find_one({"id": booking["cleaner_id"]})
-            if cleaner:
-                cleaner_completions.append({
-                    "cleaner_id": booking["cleaner_id"],
-                    "cleaner_name": f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}".strip(),
-                    "job_id": booking["id"],
-                    "completed_at": booking.get("completed_at"),
-                    "completion_notes": booking.get("completion_notes", ""),
-                    "total_amount": booking.get("total_amount", 0)
-                })
+    for booking in completed_bookings:
+        cleaner = cleaners.get(booking["cleaner_id"])
+        if cleaner:
+            cleaner_completions.append({
+                "cleaner_id": booking["cleaner_id"],
+                "cleaner_name": f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}".strip(),
+                "job_id": booking["id"],
+                "completed_at": booking.get("completed_at"),
+                "completion_notes": booking.get("completion_notes", ""),
+                "total_amount": booking.get("total_amount", 0)
+            })
     
     # Group completions by cleaner
     cleaner_stats = {}
@@ -6937,8 +7793,24 @@ async def get_weekly_report(admin_user: User = Depends(get_admin_user)):
         "totalCleanerCompletions": len(cleaner_completions)
     }
 
+@api_router.get("/admin/reports/weekly")
+async def get_weekly_report(
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get weekly report data"""
+    from datetime import datetime, timedelta
+    
+    # Get current week start and end
+    today = datetime.now()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+    
+    return await build_bookings_report(week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d"))
+
 @api_router.get("/admin/reports/monthly")
-async def get_monthly_report(admin_user: User = Depends(get_admin_user)):
+async def get_monthly_report(
+    admin_user: User = Depends(get_admin_user)
+):
     """Get monthly report data"""
     from datetime import datetime, timedelta
     
@@ -6950,65 +7822,7 @@ async def get_monthly_report(admin_user: User = Depends(get_admin_user)):
     else:
         month_end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
     
-    # Get bookings for this month
-    bookings = await db.bookings.find({
-        "booking_date": {
-            "$gte": month_start.strftime("%Y-%m-%d"),
-            "$lte": month_end.strftime("%Y-%m-%d")
-        }
-    }).to_list(1000)
-    
-    # Calculate stats
-    total_bookings = len(bookings)
-    revenue = sum(booking.get("total_amount", 0) for booking in bookings)
-    cancellations = len([b for b in bookings if b.get("status") == "cancelled"])
-    reschedules = len([b for b in bookings if b.get("status") == "rescheduled"])
-    completed = len([b for b in bookings if b.get("status") == "completed"])
-    
-    completion_rate = (completed / total_bookings * 100) if total_bookings > 0 else 0
-    avg_booking_value = (revenue / total_bookings) if total_bookings > 0 else 0
-    
-    # Get cleaner job completion data
-    cleaner_completions = []
-    for booking in bookings:
-        if booking.get("status") == "completed" and booking.get("cleaner_id"):
-            cleaner = await db.cleaners.find_one({"id": booking["cleaner_id"]})
-            if cleaner:
-                cleaner_completions.append({
-                    "cleaner_id": booking["cleaner_id"],
-                    "cleaner_name": f"{cleaner.get('first_name', '')} {cleaner.get('last_name', '')}".strip(),
-                    "job_id": booking["id"],
-                    "completed_at": booking.get("completed_at"),
-                    "completion_notes": booking.get("completion_notes", ""),
-                    "total_amount": booking.get("total_amount", 0)
-                })
-    
-    # Group completions by cleaner
-    cleaner_stats = {}
-    for completion in cleaner_completions:
-        cleaner_id = completion["cleaner_id"]
-        if cleaner_id not in cleaner_stats:
-            cleaner_stats[cleaner_id] = {
-                "cleaner_name": completion["cleaner_name"],
-                "jobs_completed": 0,
-                "total_revenue": 0,
-                "completions": []
-            }
-        cleaner_stats[cleaner_id]["jobs_completed"] += 1
-        cleaner_stats[cleaner_id]["total_revenue"] += completion["total_amount"]
-        cleaner_stats[cleaner_id]["completions"].append(completion)
-    
-    return {
-        "totalBookings": total_bookings,
-        "revenue": round(revenue, 2),
-        "cancellations": cancellations,
-        "reschedules": reschedules,
-        "completionRate": round(completion_rate, 1),
-        "customerSatisfaction": 95.0,  # Placeholder - would come from feedback system
-        "avgBookingValue": round(avg_booking_value, 2),
-        "cleanerCompletions": list(cleaner_stats.values()),
-        "totalCleanerCompletions": len(cleaner_completions)
-    }
+    return await build_bookings_report(month_start.strftime("%Y-%m-%d"), month_end.strftime("%Y-%m-%d"))
 
 @api_router.get("/admin/reports/{report_type}/export")
 async def export_report(report_type: str, admin_user: User = Depends(get_admin_user)):
@@ -7020,12 +7834,7 @@ async def export_report(report_type: str, admin_user: User = Depends(get_admin_u
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
         
-        bookings = await db.bookings.find({
-            "booking_date": {
-                "$gte": week_start.strftime("%Y-%m-%d"),
-                "$lte": week_end.strftime("%Y-%m-%d")
-            }
-        }).to_list(1000)
+        range_start, range_end = local_date_range(week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d"))
     else:  # monthly
         today = datetime.now()
         month_start = today.replace(day=1)
@@ -7034,16 +7843,15 @@ async def export_report(report_type: str, admin_user: User = Depends(get_admin_u
         else:
             month_end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
         
-        bookings = await db.bookings.find({
-            "booking_date": {
-                "$gte": month_start.strftime("%Y-%m-%d"),
-                "$lte": month_end.strftime("%Y-%m-%d")
-            }
-        }).to_list(1000)
+        range_start, range_end = local_date_range(month_start.strftime("%Y-%m-%d"), month_end.strftime("%Y-%m-%d"))
+    
+    bookings = analytics_db.bookings.find({
+        "start_at": {"$gte": range_start, "$lt": range_end}
+    }).sort("start_at", 1)
     
     # Format data for CSV export
     export_data = []
-    for booking in bookings:
+    async for booking in bookings:
         export_data.append({
             "booking_id": booking.get("id", ""),
             "customer_id": booking.get("customer_id", ""),
@@ -7066,7 +7874,7 @@ async def get_pending_orders(admin_user: User = Depends(get_admin_user)):
     # Get bookings with pending status changes
     pending_bookings = await db.bookings.find({
         "status": {"$in": ["pending_cancellation", "pending_reschedule"]}
-    }).to_list(1000)
+    }).to_list(None)
     
     cancellations = []
     reschedules = []
@@ -7116,25 +7924,29 @@ async def get_order_history(admin_user: User = Depends(get_admin_user)):
 @api_router.post("/admin/orders/{order_id}/approve_cancellation")
 async def approve_cancellation(order_id: str, admin_user: User = Depends(get_admin_user)):
     """Approve a cancellation request"""
-    result = await db.bookings.update_one(
+    cancelled = await db.bookings.find_one_and_update(
         {"id": order_id, "status": "pending_cancellation"},
         {"$set": {"status": "cancelled", "updated_at": datetime.now(timezone.utc).isoformat()}}
     )
     
-    if result.modified_count == 0:
+    if cancelled is None:
         raise HTTPException(status_code=404, detail="Pending cancellation not found")
     
+    await record_booking_change(db, cancelled, {"status": "cancelled"})
+    await release_capacity(db, cancelled.get("booking_date"))
+    await release_cleaner_slot(cancelled)
     return {"message": "Cancellation approved"}
 
 @api_router.post("/admin/orders/{order_id}/deny_cancellation")
 async def deny_cancellation(order_id: str, admin_user: User = Depends(get_admin_user)):
     """Deny a cancellation request"""
-    result = await db.bookings.update_one(
+    previous = await transition_booking(
         {"id": order_id, "status": "pending_cancellation"},
-        {"$set": {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()},
+        index=False
     )
     
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Pending cancellation not found")
     
     return {"message": "Cancellation denied"}
@@ -7142,12 +7954,13 @@ async def deny_cancellation(order_id: str, admin_user: User = Depends(get_admin_
 @api_router.post("/admin/orders/{order_id}/approve_reschedule")
 async def approve_reschedule(order_id: str, admin_user: User = Depends(get_admin_user)):
     """Approve a reschedule request"""
-    result = await db.bookings.update_one(
+    previous = await transition_booking(
         {"id": order_id, "status": "pending_reschedule"},
-        {"$set": {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()},
+        index=False
     )
     
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Pending reschedule not found")
     
     return {"message": "Reschedule approved"}
@@ -7155,12 +7968,13 @@ async def approve_reschedule(order_id: str, admin_user: User = Depends(get_admin
 @api_router.post("/admin/orders/{order_id}/deny_reschedule")
 async def deny_reschedule(order_id: str, admin_user: User = Depends(get_admin_user)):
     """Deny a reschedule request"""
-    result = await db.bookings.update_one(
+    previous = await transition_booking(
         {"id": order_id, "status": "pending_reschedule"},
-        {"$set": {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"status": "confirmed", "updated_at": datetime.now(timezone.utc).isoformat()},
+        index=False
     )
     
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Pending reschedule not found")
     
     return {"message": "Reschedule denied"}
@@ -7640,16 +8454,23 @@ async def send_single_email_reminder(
 async def send_batch_email_reminders(
     booking_ids: List[str],
     reminder_type: str = "upcoming",
-    admin_user: User = Depends(get_admin_user)
+    admin_user: User = Depends(get_admin_user),
+    loaders: RequestLoaders = Depends(get_request_loaders)
 ):
     """Send email reminders for multiple bookings"""
     try:
         # Get booking data for all specified bookings
-        bookings = await db.bookings.find({"id": {"$in": booking_ids}}).to_list(1000)
+        bookings = await db.bookings.find({"id": {"$in": booking_ids}}).to_list(None)
         
         if not bookings:
             raise HTTPException(status_code=404, detail="No bookings found")
         
+        # Registered users for bookings without embedded customer details
+        users = await loaders.users.load_many(
+            booking['user_id'] for booking in bookings
+            if not booking.get('customer') and booking.get('user_id')
+        )
+        
         # Prepare email data
         email_list = []
         for booking in bookings:
@@ -7658,7 +8479,7 @@ async def send_batch_email_reminders(
                 customer_email = booking['customer'].get('email')
             elif booking.get('user_id'):
                 # Try to get email from user data
-                user = await db.users.find_one({"id": booking['user_id']})
+                user = users.get(booking['user_id'])
                 if user:
                     customer_email = user.get('email')
             
@@ -7705,7 +8526,7 @@ async def get_upcoming_bookings_for_reminders(
                 "$lte": future_date.strftime("%Y-%m-%d")
             },
             "status": {"$in": ["confirmed", "pending"]}
-        }).sort("booking_date", 1).to_list(1000)
+        }).sort("booking_date", 1).to_list(None)
         
         # Format booking data for frontend
         formatted_bookings = []
@@ -7894,11 +8715,19 @@ async def add_to_waitlist(waitlist_data: WaitlistEntryCreate):
         raise HTTPException(status_code=500, detail=f"Error adding to waitlist: {str(e)}")
 
 @api_router.get("/waitlist", response_model=List[WaitlistEntry])
-async def get_waitlist(admin_user: User = Depends(get_admin_user)):
-    """Get all waitlist entries (admin only)"""
+async def get_waitlist(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get waitlist entries (admin only, paginated, newest first)"""
     try:
-        entries = await db.waitlist.find().sort("created_at", -1).to_list(1000)
-        return [WaitlistEntry(**entry) for entry in entries]
+        page = await fetch_page(db.waitlist, {}, response, limit=limit, cursor=cursor, include_total=include_total)
+        return [WaitlistEntry(**entry) for entry in page["items"]]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving waitlist: {str(e)}")
 
@@ -7927,11 +8756,8 @@ async def update_waitlist_entry(
 async def check_daily_capacity(date: str):
     """Check if we have capacity for a specific date"""
     try:
-        # Count bookings for the date
-        booking_count = await db.bookings.count_documents({
-            "booking_date": date,
-            "status": {"$in": ["confirmed", "in_progress"]}
-        })
+        # Capacity reserved on the date
+        booking_count = (await get_reserved(db, [date]))[date]
         
         has_capacity = booking_count < MAX_DAILY_BOOKINGS
         available_slots = max(0, MAX_DAILY_BOOKINGS - booking_count)
@@ -7953,14 +8779,12 @@ async def get_capacity_status():
         today = datetime.now().date()
         capacity_data = []
         
-        for i in range(30):
-            check_date = today + timedelta(days=i)
-            date_str = check_date.strftime('%Y-%m-%d')
-            
-            booking_count = await db.bookings.count_documents({
-                "booking_date": date_str,
-                "status": {"$in": ["confirmed", "in_progress"]}
-            })
+        # One ledger read for the whole window
+        dates = [(today + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(30)]
+        reserved = await get_reserved(db, dates)
+        
+        for date_str in dates:
+            booking_count = reserved[date_str]
             
             has_capacity = booking_count < MAX_DAILY_BOOKINGS
             available_slots = max(0, MAX_DAILY_BOOKINGS - booking_count)
@@ -8150,6 +8974,142 @@ async def send_immediate_reminder(booking_id: str, reminder_type: str, custom_me
 
 # Reminder service initialization moved to lifespan handler
 
+# Database index diagnostics
+@api_router.get("/admin/db/index-report")
+async def get_index_report(admin_user: User = Depends(get_admin_user)):
+    """Explain the registered hot queries and report any that fall back to COLLSCAN"""
+    try:
+        report = await explain_hot_queries(db)
+        report["index_build_running"] = index_build_task is not None and not index_build_task.done()
+        return report
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating index report: {str(e)}")
+
+@api_router.post("/admin/db/ensure-indexes")
+async def rebuild_indexes(admin_user: User = Depends(get_admin_user)):
+    """Re-apply the index manifest (idempotent)"""
+    try:
+        results = await ensure_indexes(db)
+        return {"success": True, "results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying indexes: {str(e)}")
+
+# Database command metrics
+@api_router.get("/admin/metrics/db")
+async def get_db_metrics(admin_user: User = Depends(get_admin_user)):
+    """Per-endpoint MongoDB command counts, latency, documents returned and N+1 warnings"""
+    if not DB_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Database metrics are disabled")
+    return db_metrics.snapshot()
+
+@api_router.delete("/admin/metrics/db")
+async def reset_db_metrics(admin_user: User = Depends(get_admin_user)):
+    """Reset the collected database metrics"""
+    db_metrics.reset()
+    return {"message": "Database metrics reset"}
+
+# Daily capacity ledger maintenance
+@api_router.post("/admin/capacity/reconcile")
+async def reconcile_capacity_ledger(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Recount bookings per date and repair the capacity ledger where it drifted"""
+    try:
+        return await reconcile_capacity(db, start_date=start_date, end_date=end_date)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reconciling capacity: {str(e)}")
+
+@api_router.post("/admin/counters/rebuild")
+async def rebuild_booking_counters(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Recompute the per-date booking counters from the bookings collection"""
+    try:
+        return await rebuild_daily_counters(db, start_date=start_date, end_date=end_date)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rebuilding counters: {str(e)}")
+
+# Admin calendar push channel
+@api_router.post("/admin/calendar/stream-ticket")
+async def create_calendar_stream_ticket(admin_user: User = Depends(get_admin_user)):
+    """Ticket for opening /admin/calendar/stream; valid for CALENDAR_STREAM_TICKET_SECONDS"""
+    return {"ticket": create_stream_ticket(admin_user.id), "expires_in": CALENDAR_STREAM_TICKET_SECONDS}
+
+@api_router.get("/admin/calendar/stream")
+async def stream_calendar_events(
+    request: Request,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    admin_user: User = Depends(get_admin_user_from_stream_ticket)
+):
+    """Server-sent events with booking, assignment and availability deltas for a date range"""
+    subscription = calendar_events.subscribe(start_date, end_date)
+    
+    async def event_source():
+        try:
+            yield format_sse({"type": "ready", "dates": [], "source": calendar_events.source})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), CALENDAR_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+                if event["type"] == "resync" and subscription.overflowed:
+                    break
+        finally:
+            calendar_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# In-memory availability index
+@api_router.get("/admin/availability-index")
+async def get_availability_index_status(admin_user: User = Depends(get_admin_user)):
+    """Loaded dates, roster size and hit/load/repair counters of the availability index"""
+    return availability_index.status()
+
+@api_router.post("/admin/availability-index/check")
+async def check_availability_index(admin_user: User = Depends(get_admin_user)):
+    """Compare the availability index with MongoDB now and repair drifted dates"""
+    try:
+        return await availability_index.check_consistency()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error checking availability index: {str(e)}")
+
+# In-memory cleaner profiles
+@api_router.get("/admin/cleaner-profiles")
+async def get_cleaner_profile_status(admin_user: User = Depends(get_admin_user)):
+    """Cached cleaner count and refresh/reload/booking change counters of the profile cache"""
+    return cleaner_profiles.status()
+
+@api_router.post("/admin/cleaner-profiles/refresh")
+async def refresh_cleaner_profiles(admin_user: User = Depends(get_admin_user)):
+    """Rebuild the cleaner profile cache from MongoDB now"""
+    try:
+        return await cleaner_profiles.refresh()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error refreshing cleaner profiles: {str(e)}")
+
 # Include the API router in the main app (already has /api prefix)
 app.include_router(api_router)
 
@@ -8162,7 +9122,7 @@ async def handle_api_options(path: str):
         headers={
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, X-CSRFToken, Cache-Control, Pragma, Origin, Referer, User-Agent",
+            "Access-Control-Allow-Headers": "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, X-CSRFToken, Cache-Control, If-None-Match, Pragma, Origin, Referer, User-Agent",
             "Access-Control-Allow-Credentials": "true",
             "Access-Control-Expose-Headers": "*",
             "Access-Control-Max-Age": "3600"
@@ -8228,12 +9188,9 @@ async def update_job_status(job_id: str, status_data: dict):
             update_data["completed_at"] = datetime.now(timezone.utc).isoformat()
             update_data["completion_notes"] = status_data.get("completion_notes", "")
         
-        result = await db.bookings.update_one(
-            {"id": job_id},
-            {"$set": update_data}
-        )
+        previous = await transition_booking({"id": job_id}, update_data, index=False)
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Update Google Calendar event if job is completed
@@ -0,0 +1,80 @@
+"""
+Analytics Database Access
+A second Motor client for reports, exports and admin statistics. It has its
+own small connection pool and prefers secondaries, so heavy reads never
+compete with booking traffic for connections. Every query it issues carries
+a server-side time limit and a large cursor batch size.
+"""
+import os
+from typing import Any, Dict, List, Optional, Sequence
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ANALYTICS_MAX_POOL_SIZE = int(os.getenv("ANALYTICS_MAX_POOL_SIZE", "10"))
+ANALYTICS_READ_PREFERENCE = os.getenv("ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+# Server-side limit applied to every analytics query (maxTimeMS)
+ANALYTICS_MAX_TIME_MS = int(os.getenv("ANALYTICS_MAX_TIME_MS", "30000"))
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "1000"))
+
+
+def create_analytics_client(mongo_url: str, event_listeners: Sequence[Any] = ()) -> AsyncIOMotorClient:
+    """Client with its own pool and read preference for read-heavy endpoints"""
+    return AsyncIOMotorClient(
+        mongo_url,
+        maxPoolSize=ANALYTICS_MAX_POOL_SIZE,
+        minPoolSize=0,
+        readPreference=ANALYTICS_READ_PREFERENCE,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=10000,
+        socketTimeoutMS=ANALYTICS_MAX_TIME_MS + 10000,  # Outlive the server-side limit
+        retryReads=True,
+        event_listeners=list(event_listeners)
+    )
+
+
+class AnalyticsCollection:
+    """Read-only collection wrapper that applies the analytics query defaults"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        kwargs.setdefault("max_time_ms", ANALYTICS_MAX_TIME_MS)
+        kwargs.setdefault("batch_size", ANALYTICS_BATCH_SIZE)
+        return self._collection.find(filter, *args, **kwargs)
+
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        kwargs.setdefault("max_time_ms", ANALYTICS_MAX_TIME_MS)
+        return await self._collection.find_one(filter, *args, **kwargs)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs):
+        kwargs.setdefault("maxTimeMS", ANALYTICS_MAX_TIME_MS)
+        kwargs.setdefault("batchSize", ANALYTICS_BATCH_SIZE)
+        kwargs.setdefault("allowDiskUse", True)
+        return self._collection.aggregate(pipeline, **kwargs)
+
+    async def count_documents(self, filter: Dict[str, Any], **kwargs) -> int:
+        kwargs.setdefault("maxTimeMS", ANALYTICS_MAX_TIME_MS)
+        return await self._collection.count_documents(filter, **kwargs)
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        kwargs.setdefault("maxTimeMS", ANALYTICS_MAX_TIME_MS)
+        return await self._collection.estimated_document_count(**kwargs)
+
+
+class AnalyticsDatabase:
+    """Database handle whose collections are AnalyticsCollection wrappers"""
+
+    def __init__(self, database):
+        self._database = database
+        self._collections: Dict[str, AnalyticsCollection] = {}
+
+    def __getitem__(self, name: str) -> AnalyticsCollection:
+        if name not in self._collections:
+            self._collections[name] = AnalyticsCollection(self._database[name])
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> AnalyticsCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
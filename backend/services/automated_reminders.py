@@ -31,7 +31,7 @@ class AutomatedReminderService:
             bookings = await self.db.bookings.find({
                 "booking_date": tomorrow,
                 "status": {"$in": ["confirmed", "pending"]}
-            }).to_list(1000)
+            }).to_list(None)
             
             results = {
                 "date": tomorrow,
@@ -78,7 +78,7 @@ class AutomatedReminderService:
             bookings = await self.db.bookings.find({
                 "booking_date": next_week,
                 "status": {"$in": ["confirmed", "pending"]}
-            }).to_list(1000)
+            }).to_list(None)
             
             results = {
                 "date": next_week,
@@ -126,7 +126,7 @@ class AutomatedReminderService:
                 "status": "confirmed",
                 "updated_at": {"$gte": one_hour_ago.isoformat()},
                 "confirmation_email_sent": {"$ne": True}
-            }).to_list(1000)
+            }).to_list(None)
             
             results = {
                 "total_bookings": len(bookings),
@@ -0,0 +1,89 @@
+"""
+Availability Horizon
+Bulk initialization of the per-day slot tables (cleaner_availability and
+time_slot_availability). Existing rows are found with one aggregation and
+only the missing (owner, date, slot) rows are written, as $setOnInsert
+upserts in a single unordered bulk_write backed by the unique slot indexes.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_CODE = 11000
+
+# (owner, date, time_slot); owner is None for tables without an owner field
+MissingSlot = Tuple[Optional[str], str, str]
+
+
+def horizon_dates(days_ahead: int, start: Optional[datetime] = None) -> List[str]:
+    """YYYY-MM-DD strings for `days_ahead` days starting today"""
+    start = start or datetime.now()
+    return [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days_ahead)]
+
+
+async def find_missing_slots(collection, dates: Sequence[str], time_slots: Sequence[str],
+                             owner_field: Optional[str] = None,
+                             owners: Optional[Sequence[str]] = None) -> List[MissingSlot]:
+    """Every (owner, date, slot) in the horizon that has no row yet, in one query"""
+    if not dates or not time_slots:
+        return []
+    match: Dict[str, Any] = {"date": {"$gte": min(dates), "$lte": max(dates)}}
+    group_id: Dict[str, str] = {"date": "$date"}
+    if owner_field:
+        if not owners:
+            return []
+        match[owner_field] = {"$in": list(owners)}
+        group_id["owner"] = f"${owner_field}"
+
+    existing: Dict[Tuple[Optional[str], str], set] = {}
+    async for row in collection.aggregate([
+        {"$match": match},
+        {"$group": {"_id": group_id, "slots": {"$addToSet": "$time_slot"}}},
+    ]):
+        existing[(row["_id"].get("owner"), row["_id"]["date"])] = set(row["slots"])
+
+    return [
+        (owner, date, slot)
+        for owner in (owners if owner_field else [None])
+        for date in dates
+        for slot in time_slots
+        if slot not in existing.get((owner, date), ())
+    ]
+
+
+async def upsert_missing(collection, documents: List[Dict[str, Any]], key_fields: Sequence[str]) -> int:
+    """Insert documents whose key is absent; returns the number inserted"""
+    if not documents:
+        return 0
+    operations = [
+        UpdateOne({field: doc[field] for field in key_fields}, {"$setOnInsert": doc}, upsert=True)
+        for doc in documents
+    ]
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_CODE for error in errors):
+            raise
+        # A concurrent initializer inserted the same keys first; the rows exist either way
+        return e.details.get("nUpserted", 0)
+
+
+async def fill_missing_slots(collection, dates: Sequence[str], time_slots: Sequence[str],
+                             make_document: Callable[[Optional[str], str, str], Dict[str, Any]],
+                             owner_field: Optional[str] = None,
+                             owners: Optional[Sequence[str]] = None) -> int:
+    """Create the rows missing from the horizon: one aggregation and one bulk write"""
+    missing = await find_missing_slots(collection, dates, time_slots, owner_field, owners)
+    key_fields = ([owner_field] if owner_field else []) + ["date", "time_slot"]
+    inserted = await upsert_missing(
+        collection, [make_document(owner, date, slot) for owner, date, slot in missing], key_fields
+    )
+    if inserted:
+        logger.info(f"Initialized {inserted} {collection.name} rows")
+    return inserted
@@ -0,0 +1,361 @@
+"""
+In-Memory Availability Index
+Answers "which cleaners are free on this date and slot" without touching
+MongoDB. Active cleaners get a fixed bit position; each loaded date keeps,
+per catalog slot id, bitmasks of cleaners that are manually blocked, hold a booked
+availability row, or have an active booking in the slot.
+
+Dates are loaded lazily (two queries) the first time they are asked for and
+kept current by the write paths (record_assignment, set_manual_availability,
+invalidate). Dates outside the horizon are computed with the same two
+queries on every call and never cached. A periodic consistency check reloads loaded dates from MongoDB
+and repairs any drift. Runs in a single process (PM2 instances: 1); with
+several workers each keeps its own copy and relies on the periodic check.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .slots import SLOT_COUNT, slot_index
+
+logger = logging.getLogger(__name__)
+
+# Bookings in these statuses no longer occupy the cleaner's slot or count towards
+# their jobs that day (shared with cleaner_scoring.load_cleaner_load)
+INACTIVE_BOOKING_STATUSES = ["cancelled"]
+
+
+def booking_zip(booking: Dict[str, Any]) -> Optional[str]:
+    """Service zip of a booking (address.zip_code, else a top-level zip_code)"""
+    address = booking.get("address")
+    if isinstance(address, dict) and address.get("zip_code"):
+        return str(address["zip_code"]).strip()
+    return booking.get("zip_code")
+
+
+class CleanerRoster:
+    """Bit positions of the active cleaners"""
+
+    def __init__(self, cleaners: Iterable[Dict[str, Any]]):
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.approved_mask = 0
+        for cleaner in cleaners:
+            position = len(self.ids)
+            self.ids.append(cleaner["id"])
+            self.positions[cleaner["id"]] = position
+            if cleaner.get("is_approved", True):
+                self.approved_mask |= 1 << position
+        self.mask = (1 << len(self.ids)) - 1
+
+    def bit(self, cleaner_id: Optional[str]) -> int:
+        position = self.positions.get(cleaner_id)
+        return 0 if position is None else 1 << position
+
+    def members(self, mask: int) -> List[str]:
+        """Cleaner ids whose bits are set in `mask`, in roster order"""
+        members = []
+        while mask:
+            low = mask & -mask
+            members.append(self.ids[low.bit_length() - 1])
+            mask ^= low
+        return members
+
+
+def _slot_of(doc: Dict[str, Any]) -> Optional[int]:
+    """Catalog id of a document's slot (stored slot_index, else resolved from the label)"""
+    index = doc.get("slot_index")
+    return index if isinstance(index, int) and 0 <= index < SLOT_COUNT else slot_index(doc.get("time_slot"))
+
+
+class DayAvailability:
+    """Availability bitmasks of one date, indexed by catalog slot id"""
+
+    def __init__(self):
+        self.blocked: List[int] = [0] * SLOT_COUNT   # manually unavailable
+        self.booked: List[int] = [0] * SLOT_COUNT    # availability row marked booked
+        self.busy: List[Dict[str, int]] = [{} for _ in range(SLOT_COUNT)]  # cleaner -> active bookings
+        self.stops: List[Dict[str, Optional[str]]] = [{} for _ in range(SLOT_COUNT)]  # cleaner -> booking zip
+        self.jobs: Dict[str, int] = {}      # cleaner -> active bookings that day
+
+    @classmethod
+    def from_documents(cls, roster: CleanerRoster, availability: Iterable[Dict[str, Any]],
+                       bookings: List[Dict[str, Any]]) -> "DayAvailability":
+        day = cls()
+        active_ids: Set[str] = set()
+        for booking in bookings:
+            if booking.get("status") in INACTIVE_BOOKING_STATUSES:
+                continue
+            active_ids.add(booking.get("id"))
+            day.add_booking(booking["cleaner_id"], _slot_of(booking), zip_code=booking_zip(booking))
+        for row in availability:
+            bit = roster.bit(row.get("cleaner_id"))
+            slot = _slot_of(row)
+            if not bit or slot is None:
+                continue
+            if row.get("is_available", True) is False:
+                day.blocked[slot] |= bit
+            # A booked row whose booking was cancelled no longer blocks the slot
+            if row.get("is_booked") and (not row.get("booking_id") or row.get("booking_id") in active_ids):
+                day.booked[slot] |= bit
+        return day
+
+    def add_booking(self, cleaner_id: str, slot: Optional[int], count: int = 1,
+                    zip_code: Optional[str] = None) -> None:
+        self.jobs[cleaner_id] = max(0, self.jobs.get(cleaner_id, 0) + count)
+        if slot is None:
+            return  # Counts towards the day's jobs but holds no catalog slot
+        busy = self.busy[slot]
+        busy[cleaner_id] = max(0, busy.get(cleaner_id, 0) + count)
+        if count > 0:
+            self.stops[slot][cleaner_id] = zip_code
+        if not busy[cleaner_id]:
+            del busy[cleaner_id]
+            self.stops[slot].pop(cleaner_id, None)
+
+    def busy_mask(self, roster: CleanerRoster, slot: int) -> int:
+        mask = 0
+        for cleaner_id in self.busy[slot]:
+            mask |= roster.bit(cleaner_id)
+        return mask
+
+    def available_mask(self, roster: CleanerRoster, slot: Optional[int]) -> int:
+        if slot is None:
+            return 0  # Not a calendar slot
+        unavailable = self.blocked[slot] | self.booked[slot] | self.busy_mask(roster, slot)
+        return roster.mask & ~unavailable
+
+    def signature(self) -> Tuple:
+        """Comparable snapshot used by the consistency check"""
+        return (
+            tuple(self.blocked),
+            tuple(self.booked),
+            tuple(tuple(sorted(busy.items())) for busy in self.busy),
+            tuple(tuple(sorted(stops.items())) for stops in self.stops),
+            {k: v for k, v in self.jobs.items() if v},
+        )
+
+
+class AvailabilityIndex:
+    def __init__(self, db: AsyncIOMotorDatabase, horizon_days: int = 90, past_days: int = 1):
+        self.db = db
+        self.horizon_days = horizon_days
+        self.past_days = past_days
+        self._roster: Optional[CleanerRoster] = None
+        self._roster_lock = asyncio.Lock()
+        self._days: Dict[str, DayAvailability] = {}
+        self._versions: Dict[str, int] = {}
+        self._roster_version = 0
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "loads": 0, "repairs": 0}
+
+    # Coverage ---------------------------------------------------------------
+
+    def covers(self, date: str) -> bool:
+        """Whether `date` is inside the window this index serves"""
+        today = datetime.now().date()
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return False
+        return today - timedelta(days=self.past_days) <= day <= today + timedelta(days=self.horizon_days)
+
+    # Loading ----------------------------------------------------------------
+
+    async def roster(self) -> CleanerRoster:
+        if self._roster is None:
+            async with self._roster_lock:
+                if self._roster is None:
+                    version = self._roster_version
+                    cleaners = await self.db.cleaners.find(
+                        {"is_active": True}, {"_id": 0, "id": 1, "is_approved": 1}
+                    ).to_list(None)
+                    if version == self._roster_version:
+                        self._roster = CleanerRoster(cleaners)
+                    else:
+                        return CleanerRoster(cleaners)
+        return self._roster
+
+    async def _load_day(self, date: str, roster: CleanerRoster) -> DayAvailability:
+        availability = await self.db.cleaner_availability.find(
+            {"date": date, "cleaner_id": {"$in": roster.ids}},
+            {"_id": 0, "cleaner_id": 1, "time_slot": 1, "slot_index": 1, "is_available": 1, "is_booked": 1, "booking_id": 1}
+        ).to_list(None)
+        bookings = await self.db.bookings.find(
+            {"booking_date": date, "cleaner_id": {"$in": roster.ids}},
+            {"_id": 0, "id": 1, "cleaner_id": 1, "time_slot": 1, "slot_index": 1, "status": 1,
+             "address.zip_code": 1, "zip_code": 1}
+        ).to_list(None)
+        return DayAvailability.from_documents(roster, availability, bookings)
+
+    async def day(self, date: str) -> Tuple[CleanerRoster, DayAvailability]:
+        """Roster and availability of `date`; only dates inside the horizon are kept"""
+        roster = await self.roster()
+        day = self._days.get(date)
+        if day is not None:
+            self.stats["hits"] += 1
+            return roster, day
+        lock = self._locks.setdefault(date, asyncio.Lock())
+        async with lock:
+            day = self._days.get(date)
+            if day is None:
+                version = (self._roster_version, self._versions.get(date, 0))
+                day = await self._load_day(date, roster)
+                self.stats["loads"] += 1
+                # A write that landed while loading makes this snapshot stale
+                if version == (self._roster_version, self._versions.get(date, 0)) and self.covers(date):
+                    self._days[date] = day
+        self._locks.pop(date, None)
+        return roster, day
+
+    # Queries ----------------------------------------------------------------
+
+    async def available_cleaners(self, date: str, slot: str, approved_only: bool = False) -> List[str]:
+        roster, day = await self.day(date)
+        mask = day.available_mask(roster, slot_index(slot))
+        if approved_only:
+            mask &= roster.approved_mask
+        return roster.members(mask)
+
+    async def available_count(self, date: str, slot: str) -> Tuple[int, int]:
+        """(available, total) active cleaners for the slot"""
+        counts, total = await self.slot_counts(date, [slot])
+        return counts[slot], total
+
+    async def slot_counts(self, date: str, slots: List[str]) -> Tuple[Dict[str, int], int]:
+        """({slot: available cleaners}, total active cleaners) for several slots at once.
+
+        Labels outside the slot catalog have no available cleaners.
+        """
+        roster, day = await self.day(date)
+        return {slot: day.available_mask(roster, slot_index(slot)).bit_count() for slot in slots}, len(roster.ids)
+
+    async def slot_states(self, date: str, slots: List[str]) -> Dict[str, Dict[str, Dict[str, bool]]]:
+        """cleaner_id -> slot -> {"available", "manual_blocked"}"""
+        roster, day = await self.day(date)
+        states: Dict[str, Dict[str, Dict[str, bool]]] = {cleaner_id: {} for cleaner_id in roster.ids}
+        for slot in slots:
+            index = slot_index(slot)
+            available = day.available_mask(roster, index)
+            blocked = 0 if index is None else day.blocked[index]
+            for cleaner_id in roster.ids:
+                bit = roster.bit(cleaner_id)
+                states[cleaner_id][slot] = {"available": bool(available & bit), "manual_blocked": bool(blocked & bit)}
+        return states
+
+    async def jobs_on(self, date: str) -> Dict[str, int]:
+        """cleaner_id -> active bookings on `date`"""
+        _, day = await self.day(date)
+        return dict(day.jobs)
+
+    async def route_stops(self, date: str) -> List[Dict[str, Any]]:
+        """Active bookings on `date` as {cleaner_id, slot_index, zip_code}, for travel scoring"""
+        _, day = await self.day(date)
+        return [
+            {"cleaner_id": cleaner_id, "slot_index": slot, "zip_code": zip_code}
+            for slot, stops in enumerate(day.stops)
+            for cleaner_id, zip_code in stops.items()
+        ]
+
+    # Writes -----------------------------------------------------------------
+
+    def _touch(self, date: Optional[str]) -> Optional[DayAvailability]:
+        if not date:
+            return None
+        self._versions[date] = self._versions.get(date, 0) + 1
+        return self._days.get(date)
+
+    def record_assignment(self, date: str, slot: str, cleaner_id: str, booking_id: Optional[str] = None,
+                          zip_code: Optional[str] = None) -> None:
+        """A booking was assigned to `cleaner_id` and its availability row marked booked"""
+        day = self._touch(date)
+        if day is None or self._roster is None:
+            return
+        index = slot_index(slot)
+        day.add_booking(cleaner_id, index, zip_code=zip_code)
+        if index is not None:
+            day.booked[index] |= self._roster.bit(cleaner_id)
+
+    def record_release(self, date: str, slot: str, cleaner_id: str) -> None:
+        """A booking left the cleaner's slot (cancelled, moved or reassigned)"""
+        day = self._touch(date)
+        if day is None or self._roster is None:
+            return
+        index = slot_index(slot)
+        day.add_booking(cleaner_id, index, -1)
+        if index is not None and not day.busy[index].get(cleaner_id):
+            day.booked[index] &= ~self._roster.bit(cleaner_id)
+
+    def set_manual_availability(self, date: str, slot: str, cleaner_id: str, is_available: bool) -> None:
+        day = self._touch(date)
+        index = slot_index(slot)
+        if day is None or self._roster is None or index is None:
+            return
+        bit = self._roster.bit(cleaner_id)
+        if is_available:
+            day.blocked[index] &= ~bit
+        else:
+            day.blocked[index] |= bit
+
+    def invalidate(self, *dates: Optional[str]) -> None:
+        """Drop dates so they are reloaded on next use"""
+        for date in dates:
+            if self._touch(date) is not None:
+                del self._days[date]
+
+    def invalidate_roster(self) -> None:
+        """Cleaners were added, removed or (de)activated; bit positions change"""
+        self._roster_version += 1
+        self._roster = None
+        self._days.clear()
+
+    def clear(self) -> None:
+        for date in list(self._days):
+            self._touch(date)
+        self._days.clear()
+
+    # Consistency ------------------------------------------------------------
+
+    async def check_consistency(self) -> Dict[str, Any]:
+        """Reload every loaded date from MongoDB and repair any that drifted"""
+        for date in [d for d in self._days if not self.covers(d)]:
+            del self._days[date]
+        # Cleaner changes made outside the API are picked up here too
+        self._roster_version += 1
+        fresh_roster = None
+        async with self._roster_lock:
+            cleaners = await self.db.cleaners.find(
+                {"is_active": True}, {"_id": 0, "id": 1, "is_approved": 1}
+            ).to_list(None)
+            fresh_roster = CleanerRoster(cleaners)
+        if self._roster is None or self._roster.ids != fresh_roster.ids \
+                or self._roster.approved_mask != fresh_roster.approved_mask:
+            self._roster = fresh_roster
+            self._days.clear()
+            return {"checked": 0, "repaired": [], "roster_changed": True}
+
+        repaired = []
+        dates = list(self._days)
+        for date in dates:
+            version = self._versions.get(date, 0)
+            fresh = await self._load_day(date, self._roster)
+            current = self._days.get(date)
+            if current is None or version != self._versions.get(date, 0):
+                continue  # Written to (or dropped) while checking; the write path is authoritative
+            if current.signature() != fresh.signature():
+                self._days[date] = fresh
+                repaired.append(date)
+        if repaired:
+            self.stats["repairs"] += len(repaired)
+            logger.warning(f"Availability index repaired {len(repaired)} dates: {', '.join(repaired)}")
+        return {"checked": len(dates), "repaired": repaired, "roster_changed": False}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded_dates": len(self._days),
+            "cleaners": len(self._roster.ids) if self._roster else None,
+            "horizon_days": self.horizon_days,
+            **self.stats,
+        }
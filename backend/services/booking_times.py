@@ -0,0 +1,102 @@
+"""
+Booking Time Windows
+Bookings are entered as a local date ("2025-01-10") and a time slot
+("08:00-10:00"). This module turns them into timezone-correct UTC datetimes
+(start_at / end_at) so schedules can be queried with indexed range scans.
+"""
+import os
+import re
+from datetime import datetime, date, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# All booking dates and slots are wall-clock times at the business location
+BUSINESS_TIMEZONE = ZoneInfo(os.getenv("BUSINESS_TIMEZONE", "America/Chicago"))
+
+# Used when a slot only carries a start time
+DEFAULT_SLOT_MINUTES = 120
+
+_TIME_24H = re.compile(r"^(\d{1,2}):(\d{2})$")
+_TIME_12H = re.compile(r"^(\d{1,2}):(\d{2})\s*(AM|PM)$")
+
+
+def _parse_clock(value: str) -> Optional[int]:
+    """Parse "14:30" or "2:30 PM" into minutes after midnight"""
+    value = value.strip().upper()
+    match = _TIME_24H.match(value)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if 0 <= hour <= 24 and 0 <= minute <= 59:
+            return hour * 60 + minute
+        return None
+    match = _TIME_12H.match(value)
+    if match:
+        hour, minute, period = int(match.group(1)), int(match.group(2)), match.group(3)
+        if not 1 <= hour <= 12 or not 0 <= minute <= 59:
+            return None
+        if period == "AM":
+            hour = 0 if hour == 12 else hour
+        else:
+            hour = hour if hour == 12 else hour + 12
+        return hour * 60 + minute
+    return None
+
+
+@lru_cache(maxsize=256)
+def parse_time_slot(time_slot: str) -> Optional[Tuple[int, int]]:
+    """Parse a slot label into (start, end) minutes after midnight"""
+    if not time_slot:
+        return None
+    parts = [part for part in re.split(r"\s*-\s*", time_slot.strip()) if part]
+    if not parts or len(parts) > 2:
+        return None
+    start = _parse_clock(parts[0])
+    if start is None:
+        return None
+    end = _parse_clock(parts[1]) if len(parts) == 2 else start + DEFAULT_SLOT_MINUTES
+    if end is None or end <= start:
+        return None
+    return start, end
+
+
+def _local_to_utc(day: date, minutes: int) -> datetime:
+    # Wall-clock arithmetic first, then attach the zone so DST offsets are right
+    local = datetime.combine(day, time(0)) + timedelta(minutes=minutes)
+    return local.replace(tzinfo=BUSINESS_TIMEZONE).astimezone(timezone.utc)
+
+
+def booking_window(booking_date: str, time_slot: str) -> Optional[Tuple[datetime, datetime]]:
+    """UTC start and end of a booking, or None if the date is unparseable.
+
+    A slot that cannot be parsed spans the whole day, so the booking still
+    falls inside date range queries.
+    """
+    try:
+        day = date.fromisoformat(str(booking_date)[:10])
+    except (TypeError, ValueError):
+        return None
+    slot = parse_time_slot(time_slot or "") or (0, 24 * 60)
+    return _local_to_utc(day, slot[0]), _local_to_utc(day, slot[1])
+
+
+def booking_window_fields(booking_date: str, time_slot: str) -> Dict[str, datetime]:
+    """start_at/end_at fields to store on a booking document ({} without a valid date)"""
+    window = booking_window(booking_date, time_slot)
+    if window is None:
+        return {}
+    return {"start_at": window[0], "end_at": window[1]}
+
+
+def local_date_range(start_date: str, end_date: str) -> Tuple[datetime, datetime]:
+    """UTC bounds [start, end) covering the local calendar days start_date..end_date"""
+    start_day = date.fromisoformat(str(start_date)[:10])
+    end_day = date.fromisoformat(str(end_date)[:10]) + timedelta(days=1)
+    return _local_to_utc(start_day, 0), _local_to_utc(end_day, 0)
+
+
+def to_local_iso(value: datetime) -> str:
+    """Render a stored UTC datetime as local wall-clock ISO time (no offset)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(BUSINESS_TIMEZONE).strftime("%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,149 @@
+"""
+Calendar Utilization Heatmap
+Cleaner x day x slot availability for a date range, built from one query
+on cleaner_availability and one on bookings. Documents are turned into
+index arrays once; every state and aggregate is then a NumPy array
+operation over the (cleaners, days, slots) cube instead of a dict walk per
+day.
+
+Cell states in the returned matrix:
+    0 available, 1 booked, 2 blocked (manually unavailable)
+"""
+from datetime import date as date_cls, timedelta
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .availability_index import INACTIVE_BOOKING_STATUSES
+from .slots import SLOT_COUNT, SLOT_LABELS, slot_index
+
+AVAILABLE, BOOKED, BLOCKED = 0, 1, 2
+
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    """YYYY-MM-DD strings from start_date to end_date (inclusive)"""
+    start = date_cls.fromisoformat(start_date)
+    end = date_cls.fromisoformat(end_date)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def _slot_of(doc: Dict[str, Any]) -> int:
+    index = doc.get("slot_index")
+    if not isinstance(index, int) or not 0 <= index < SLOT_COUNT:
+        index = slot_index(doc.get("time_slot"))
+    return -1 if index is None else index
+
+
+def _cells(docs: Sequence[Dict[str, Any]], cleaner_pos: Dict[str, int], date_pos: Dict[str, int],
+           date_field: str) -> np.ndarray:
+    """(n, 3) array of cleaner, day and slot positions; -1 where unknown"""
+    if not docs:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.array([
+        (cleaner_pos.get(doc.get("cleaner_id"), -1), date_pos.get(doc.get(date_field), -1), _slot_of(doc))
+        for doc in docs
+    ], dtype=np.int64)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.zeros(numerator.shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return np.round(out, 3)
+
+
+def build_heatmap(cleaner_ids: List[str], dates: List[str], availability: List[Dict[str, Any]],
+                  bookings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Utilization cube and its aggregates from raw availability rows and bookings"""
+    cleaner_pos = {cleaner_id: i for i, cleaner_id in enumerate(cleaner_ids)}
+    date_pos = {d: i for i, d in enumerate(dates)}
+    shape = (len(cleaner_ids), len(dates), SLOT_COUNT)
+
+    active = [b for b in bookings if b.get("status") not in INACTIVE_BOOKING_STATUSES]
+    active_ids = {b.get("id") for b in active}
+
+    # Bookings: assigned ones occupy their cleaner's cell, unassigned ones are demand
+    booking_cells = _cells(active, cleaner_pos, date_pos, "booking_date")
+    on_calendar = (booking_cells[:, 1] >= 0) & (booking_cells[:, 2] >= 0)
+    assigned = on_calendar & (booking_cells[:, 0] >= 0)
+    unassigned = on_calendar & np.array([not b.get("cleaner_id") for b in active], dtype=bool)
+
+    busy = np.zeros(shape, dtype=np.int32)
+    c, d, s = booking_cells[assigned].T
+    np.add.at(busy, (c, d, s), 1)
+    demand = np.zeros(shape[1:], dtype=np.int32)
+    _, d, s = booking_cells[unassigned].T
+    np.add.at(demand, (d, s), 1)
+
+    # Availability rows: manual blocks, and booked rows whose booking is still active
+    row_cells = _cells(availability, cleaner_pos, date_pos, "date")
+    valid = (row_cells >= 0).all(axis=1)
+    row_blocked = np.array([row.get("is_available", True) is False for row in availability], dtype=bool)
+    row_booked = np.array([
+        bool(row.get("is_booked")) and (not row.get("booking_id") or row.get("booking_id") in active_ids)
+        for row in availability
+    ], dtype=bool)
+
+    blocked = np.zeros(shape, dtype=bool)
+    c, d, s = row_cells[valid & row_blocked].T
+    blocked[c, d, s] = True
+    booked = busy > 0
+    c, d, s = row_cells[valid & row_booked].T
+    booked[c, d, s] = True
+
+    states = np.where(booked, BOOKED, np.where(blocked, BLOCKED, AVAILABLE)).astype(np.int8)
+    # A booked cell counts as capacity even if it was also marked unavailable
+    capacity = booked | ~blocked
+
+    booked_by_day_slot = booked.sum(axis=0)
+    capacity_by_day_slot = capacity.sum(axis=0)
+    booked_by_day = booked_by_day_slot.sum(axis=1)
+    capacity_by_day = capacity_by_day_slot.sum(axis=1)
+    booked_by_cleaner = booked.sum(axis=(1, 2))
+    capacity_by_cleaner = capacity.sum(axis=(1, 2))
+    booked_by_slot = booked_by_day_slot.sum(axis=0)
+    capacity_by_slot = capacity_by_day_slot.sum(axis=0)
+
+    return {
+        "cleaner_ids": cleaner_ids,
+        "dates": dates,
+        "time_slots": SLOT_LABELS,
+        "states": states.tolist(),
+        "by_day_slot": {
+            "booked": booked_by_day_slot.tolist(),
+            "available": (capacity_by_day_slot - booked_by_day_slot).tolist(),
+            "unassigned": demand.tolist(),
+            "utilization": _ratio(booked_by_day_slot, capacity_by_day_slot).tolist(),
+        },
+        "by_day": [
+            {"date": d, "booked": int(b), "capacity": int(cap), "unassigned": int(u), "utilization": float(r)}
+            for d, b, cap, u, r in zip(dates, booked_by_day, capacity_by_day, demand.sum(axis=1),
+                                      _ratio(booked_by_day, capacity_by_day))
+        ],
+        "by_cleaner": [
+            {"cleaner_id": cleaner_id, "booked": int(b), "capacity": int(cap), "utilization": float(r)}
+            for cleaner_id, b, cap, r in zip(cleaner_ids, booked_by_cleaner, capacity_by_cleaner,
+                                             _ratio(booked_by_cleaner, capacity_by_cleaner))
+        ],
+        "by_slot": [
+            {"time_slot": label, "booked": int(b), "capacity": int(cap), "utilization": float(r)}
+            for label, b, cap, r in zip(SLOT_LABELS, booked_by_slot, capacity_by_slot,
+                                        _ratio(booked_by_slot, capacity_by_slot))
+        ],
+        "utilization": float(_ratio(booked.sum(), capacity.sum())),
+    }
+
+
+async def load_heatmap(db: AsyncIOMotorDatabase, cleaner_ids: List[str], start_date: str,
+                       end_date: str) -> Dict[str, Any]:
+    """Heatmap of `cleaner_ids` between two dates (inclusive) from two range queries"""
+    dates = date_range(start_date, end_date)
+    availability = await db.cleaner_availability.find(
+        {"date": {"$gte": start_date, "$lte": end_date}, "cleaner_id": {"$in": cleaner_ids}},
+        {"_id": 0, "cleaner_id": 1, "date": 1, "time_slot": 1, "slot_index": 1,
+         "is_available": 1, "is_booked": 1, "booking_id": 1}
+    ).to_list(None)
+    bookings = await db.bookings.find(
+        {"booking_date": {"$gte": start_date, "$lte": end_date}},
+        {"_id": 0, "id": 1, "cleaner_id": 1, "booking_date": 1, "time_slot": 1, "slot_index": 1, "status": 1}
+    ).to_list(None)
+    return build_heatmap(cleaner_ids, dates, availability, bookings)
@@ -0,0 +1,162 @@
+"""
+Calendar Change Stream
+In-process publish/subscribe for calendar deltas (bookings, assignments,
+cleaner availability, slot blocks) pushed to admin dashboards over SSE.
+
+Events are dicts with a "type" and the "dates" they touch; subscribers only
+receive events overlapping their date range. Write paths publish through
+CalendarEventBus.publish(). When MongoDB runs as a replica set,
+watch_collections() feeds the bus from change streams instead, which also
+covers writes made by other processes; local publishing is then switched
+off so each change is delivered once. Events the change stream cannot
+produce (roster resyncs: cleaners live in unwatched collections) are
+published with source="any" and delivered in either mode.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Events a slow subscriber may fall behind by before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Collections watched in change stream mode and the date field of each
+WATCHED_COLLECTIONS = {
+    "bookings": "booking_date",
+    "cleaner_availability": "date",
+    "time_slot_availability": "date",
+}
+
+
+class CalendarSubscription:
+    def __init__(self, start_date: Optional[str], end_date: Optional[str]):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        dates = event.get("dates") or []
+        if not dates:
+            return True  # Not tied to dates (e.g. resync)
+        return any(
+            (self.start_date is None or d >= self.start_date) and (self.end_date is None or d <= self.end_date)
+            for d in dates if d
+        )
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client refetches its range instead
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "dates": [], "reason": "overflow"})
+
+
+class CalendarEventBus:
+    def __init__(self):
+        self._subscriptions: Set[CalendarSubscription] = set()
+        self.source = "local"  # "change_stream" while watch_collections() runs
+        self.published = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> CalendarSubscription:
+        subscription = CalendarSubscription(start_date, end_date)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: CalendarSubscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: Dict[str, Any], source: str = "local") -> None:
+        """Deliver `event` to every subscriber whose range it touches (source "any":
+        whichever source feeds the bus)"""
+        if source not in (self.source, "any") or not self._subscriptions:
+            return
+        event = {**event, "at": datetime.now(timezone.utc).isoformat()}
+        self.published += 1
+        for subscription in list(self._subscriptions):
+            if subscription.wants(event):
+                subscription.offer(event)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _event_from_change(collection: str, change: Dict[str, Any]) -> Dict[str, Any]:
+    operation = change.get("operationType")
+    doc = change.get("fullDocument") or {}
+    date = doc.get(WATCHED_COLLECTIONS[collection])
+    if not doc or not date:
+        # Deletes carry no document; the affected dates are unknown
+        return {"type": "resync", "dates": [], "reason": f"{collection} {operation}"}
+    if collection == "bookings":
+        return {
+            "type": "booking",
+            "dates": [date],
+            "operation": operation,
+            "booking": {
+                "id": doc.get("id"),
+                "status": doc.get("status"),
+                "cleaner_id": doc.get("cleaner_id"),
+                "booking_date": date,
+                "time_slot": doc.get("time_slot"),
+            },
+        }
+    if collection == "cleaner_availability":
+        return {
+            "type": "availability",
+            "dates": [date],
+            "cleaner_id": doc.get("cleaner_id"),
+            "time_slot": doc.get("time_slot"),
+            "is_available": doc.get("is_available", True),
+            "is_booked": doc.get("is_booked", False),
+        }
+    return {
+        "type": "slot",
+        "dates": [date],
+        "time_slot": doc.get("time_slot"),
+        "is_blocked": doc.get("is_blocked", False),
+        "booked_count": doc.get("booked_count", 0),
+    }
+
+
+async def supports_change_streams(client: AsyncIOMotorClient) -> bool:
+    """Change streams need a replica set (or sharded cluster). Raises if MongoDB
+    cannot be reached, so callers can retry instead of settling on "no"."""
+    hello = await client.admin.command("hello")
+    return bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+
+
+async def watch_collections(db: AsyncIOMotorDatabase, bus: CalendarEventBus) -> None:
+    """Feed the bus from change streams on the calendar collections until cancelled
+    or the stream fails (the error propagates; the bus falls back to local events)"""
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"ns.coll": {"$in": list(WATCHED_COLLECTIONS)}}},
+    ]
+    try:
+        async with db.watch(pipeline, full_document="updateLookup") as stream:
+            bus.source = "change_stream"
+            logger.info("Calendar events fed from MongoDB change streams")
+            async for change in stream:
+                collection = change.get("ns", {}).get("coll")
+                if collection in WATCHED_COLLECTIONS:
+                    bus.publish(_event_from_change(collection, change), source="change_stream")
+    finally:
+        if bus.source == "change_stream":
+            logger.warning("Calendar change stream stopped, using in-process events")
+            # Changes between the failure and the fallback were not delivered
+            bus.publish({"type": "resync", "dates": [], "reason": "change_stream"}, source="any")
+        bus.source = "local"
@@ -0,0 +1,173 @@
+"""
+Daily Capacity Ledger
+One document per booking date holding the number of bookings that occupy the
+daily cap. Reservations are a single conditional $inc, so concurrent
+checkouts cannot overbook; cancellations and reschedules release. Any drift
+(e.g. a crash between reserving and inserting) is repaired by
+reconcile_capacity().
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+CAPACITY_COLLECTION = "daily_capacity"
+
+# A booking holds its date's capacity from creation until it reaches one of
+# these statuses
+RELEASED_STATUSES = {"cancelled"}
+
+# Ledger entries written more recently than this are left alone by the
+# reconciler: their reservation may not have been inserted as a booking yet
+RECONCILE_SETTLE_SECONDS = 60
+
+
+def holds_capacity(status: Optional[str]) -> bool:
+    """Whether a booking in `status` counts against its date's cap"""
+    return status not in RELEASED_STATUSES
+
+
+async def reserve_capacity(db: AsyncIOMotorDatabase, booking_date: str, limit: Optional[int]) -> bool:
+    """Take one unit of capacity on `booking_date`; False if the date is full.
+
+    limit=None reserves unconditionally (admin overrides still need to be
+    counted).
+    """
+    query: Dict[str, Any] = {"_id": booking_date}
+    if limit is not None:
+        if limit <= 0:
+            return False
+        query["reserved"] = {"$lt": limit}
+    try:
+        await db[CAPACITY_COLLECTION].find_one_and_update(
+            query,
+            {"$inc": {"reserved": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # The date exists but is full: the filter missed and the upsert collided
+        return False
+    return True
+
+
+async def release_capacity(db: AsyncIOMotorDatabase, booking_date: Optional[str], count: int = 1) -> None:
+    """Return `count` units of capacity on `booking_date` (never below zero)"""
+    if not booking_date or count <= 0:
+        return
+    await db[CAPACITY_COLLECTION].update_one(
+        {"_id": booking_date},
+        [{"$set": {
+            "reserved": {"$max": [0, {"$subtract": [{"$ifNull": ["$reserved", 0]}, count]}]},
+            "updated_at": datetime.now(timezone.utc),
+        }}],
+    )
+
+
+async def release_capacity_many(db: AsyncIOMotorDatabase, booking_dates: Iterable[Optional[str]]) -> None:
+    """Release one unit per entry, grouped into one write per date"""
+    for booking_date, count in Counter(d for d in booking_dates if d).items():
+        await release_capacity(db, booking_date, count)
+
+
+async def apply_booking_change(db: AsyncIOMotorDatabase, before: Dict[str, Any], after: Dict[str, Any]) -> None:
+    """Move capacity for a booking whose status or booking_date changed.
+
+    Both dicts carry "status" and "booking_date". The new date is reserved
+    unconditionally: callers are admin edits that may exceed the cap.
+    """
+    held_before = holds_capacity(before.get("status"))
+    held_after = holds_capacity(after.get("status"))
+    date_before, date_after = before.get("booking_date"), after.get("booking_date")
+    if held_before and held_after and date_before == date_after:
+        return
+    if held_after and date_after:
+        await reserve_capacity(db, date_after, None)
+    if held_before:
+        await release_capacity(db, date_before)
+
+
+async def get_reserved(db: AsyncIOMotorDatabase, booking_dates: Iterable[str]) -> Dict[str, int]:
+    """Reserved count for each date (0 for dates without a ledger entry)"""
+    dates = list(dict.fromkeys(booking_dates))
+    cursor = db[CAPACITY_COLLECTION].find({"_id": {"$in": dates}}, {"reserved": 1})
+    found = {doc["_id"]: doc.get("reserved", 0) async for doc in cursor}
+    return {d: found.get(d, 0) for d in dates}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def reconcile_capacity(db: AsyncIOMotorDatabase, start_date: Optional[str] = None,
+                             end_date: Optional[str] = None) -> Dict[str, Any]:
+    """Rewrite ledger entries that disagree with the bookings collection.
+
+    The ledger is read before the bookings are counted and corrections are
+    compare-and-set on the value read, so a reservation racing the repair
+    makes the write miss instead of being overwritten.
+    """
+    date_range: Dict[str, str] = {}
+    if start_date:
+        date_range["$gte"] = start_date
+    if end_date:
+        date_range["$lte"] = end_date
+
+    ledger_query = {"_id": date_range} if date_range else {}
+    ledger = {doc["_id"]: doc async for doc in db[CAPACITY_COLLECTION].find(ledger_query)}
+
+    match: Dict[str, Any] = {"status": {"$nin": list(RELEASED_STATUSES)}}
+    if date_range:
+        match["booking_date"] = date_range
+    actual = {
+        row["_id"]: row["count"]
+        async for row in db.bookings.aggregate([
+            {"$match": match},
+            {"$group": {"_id": "$booking_date", "count": {"$sum": 1}}},
+        ])
+        if row["_id"]
+    }
+
+    now = datetime.now(timezone.utc)
+    settle_cutoff = now - timedelta(seconds=RECONCILE_SETTLE_SECONDS)
+    corrected: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+
+    for booking_date in sorted(set(ledger) | set(actual)):
+        entry = ledger.get(booking_date)
+        recorded = entry.get("reserved", 0) if entry else 0
+        expected = actual.get(booking_date, 0)
+        if recorded == expected:
+            continue
+
+        if entry is None:
+            try:
+                await db[CAPACITY_COLLECTION].insert_one(
+                    {"_id": booking_date, "reserved": expected, "updated_at": now}
+                )
+            except DuplicateKeyError:
+                skipped.append(booking_date)
+                continue
+        else:
+            updated_at = _as_utc(entry.get("updated_at"))
+            if updated_at and updated_at > settle_cutoff:
+                skipped.append(booking_date)
+                continue
+            result = await db[CAPACITY_COLLECTION].update_one(
+                {"_id": booking_date, "reserved": entry.get("reserved")},
+                {"$set": {"reserved": expected, "updated_at": now}},
+            )
+            if result.modified_count == 0:
+                skipped.append(booking_date)
+                continue
+
+        corrected.append({"date": booking_date, "recorded": recorded, "actual": expected})
+
+    if corrected:
+        logger.warning(f"Capacity ledger corrected for {len(corrected)} dates")
+    return {"checked": len(set(ledger) | set(actual)), "corrected": corrected, "skipped": skipped}
@@ -0,0 +1,181 @@
+"""
+Cleaner Profile Cache
+In-process copy of every cleaner's scoring features so assignment, the
+availability summary, the day optimizer and the booking reports do not
+re-read the cleaners collection:
+
+    {id, first_name, last_name, email, rating, total_jobs, experience_months,
+     preferred_house_sizes, is_active, is_approved, daily_cap}
+
+plus each cleaner's counted bookings by date, from which the recent load
+(jobs in the last RECENT_LOAD_DAYS days and ahead) is summed. Booking
+changes reach it through the daily counter listeners, cleaner edits through
+reload(); refresh() rebuilds everything from one cleaners query and one
+aggregation and runs on a timer to repair any drift. Cleaners and
+(cleaner, date) loads changed while refresh() reads are re-read after its
+swap, so those updates are not lost to the older snapshot. Runs in a single
+process (PM2 instances: 1), like the availability index.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .cleaner_scoring import RECENT_LOAD_DAYS, RECENT_LOAD_STATUSES, daily_caps
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PROJECTION = {
+    "_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1, "rating": 1, "total_jobs": 1,
+    "experience_months": 1, "preferred_house_sizes": 1, "is_active": 1, "is_approved": 1,
+}
+
+
+def _recent_cutoff() -> str:
+    return (datetime.now() - timedelta(days=RECENT_LOAD_DAYS)).strftime("%Y-%m-%d")
+
+
+# Rounds of re-reading what changed during a refresh; anything still
+# changing after that is repaired by the next refresh
+REFRESH_CATCH_UP_ROUNDS = 3
+
+
+def _profile(doc: Dict[str, Any]) -> Dict[str, Any]:
+    profile = {field: doc.get(field) for field in PROFILE_PROJECTION if field != "_id"}
+    profile["daily_cap"] = int(daily_caps(doc.get("total_jobs") or 0))
+    return profile
+
+
+class CleanerProfileCache:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._jobs: Dict[str, Dict[str, int]] = {}  # cleaner -> booking_date -> counted bookings
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Changes seen while refresh() runs, re-read after its swap
+        self._refreshing = False
+        self._changed_cleaners: Set[str] = set()
+        self._changed_jobs: Set[Tuple[str, str]] = set()
+        self.stats = {"refreshes": 0, "reloads": 0, "booking_changes": 0}
+
+    # Loading ----------------------------------------------------------------
+
+    async def _count_jobs(self, match: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        jobs: Dict[str, Dict[str, int]] = {}
+        async for row in self.db.bookings.aggregate([
+            {"$match": {**match, "status": {"$in": RECENT_LOAD_STATUSES}}},
+            {"$group": {"_id": {"cleaner_id": "$cleaner_id", "date": "$booking_date"}, "count": {"$sum": 1}}},
+        ]):
+            key = row["_id"]
+            jobs.setdefault(key["cleaner_id"], {})[key["date"]] = row["count"]
+        return jobs
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Rebuild every profile and the recent loads"""
+        async with self._lock:
+            self._refreshing = True
+            self._changed_cleaners, self._changed_jobs = set(), set()
+            try:
+                docs = await self.db.cleaners.find({}, PROFILE_PROJECTION).to_list(None)
+                jobs = await self._count_jobs({"cleaner_id": {"$ne": None}, "booking_date": {"$gte": _recent_cutoff()}})
+                self._profiles = {doc["id"]: _profile(doc) for doc in docs if doc.get("id")}
+                self._jobs = jobs
+                self._loaded = True
+                # The snapshot may predate writes that landed while it was read
+                for _ in range(REFRESH_CATCH_UP_ROUNDS):
+                    cleaner_ids, job_keys = self._changed_cleaners, self._changed_jobs
+                    if not cleaner_ids and not job_keys:
+                        break
+                    self._changed_cleaners, self._changed_jobs = set(), set()
+                    await self._read_profiles(cleaner_ids)
+                    await self._recount_jobs(job_keys)
+            finally:
+                self._refreshing = False
+            self.stats["refreshes"] += 1
+        return {"cleaners": len(self._profiles), "cleaners_with_jobs": len(self._jobs)}
+
+    async def _read_profiles(self, cleaner_ids: Iterable[str]) -> None:
+        ids = list(cleaner_ids)
+        if not ids:
+            return
+        docs = {doc["id"]: doc async for doc in self.db.cleaners.find({"id": {"$in": ids}}, PROFILE_PROJECTION)}
+        for cleaner_id in ids:
+            if cleaner_id in docs:
+                self._profiles[cleaner_id] = _profile(docs[cleaner_id])
+            else:
+                self._profiles.pop(cleaner_id, None)
+                self._jobs.pop(cleaner_id, None)
+
+    async def _recount_jobs(self, job_keys: Set[Tuple[str, str]]) -> None:
+        """Replace the counts of (cleaner_id, booking_date) pairs with fresh ones"""
+        if not job_keys:
+            return
+        counted = await self._count_jobs({
+            "cleaner_id": {"$in": sorted({cleaner_id for cleaner_id, _ in job_keys})},
+            "booking_date": {"$in": sorted({date for _, date in job_keys})},
+        })
+        for cleaner_id, date in job_keys:
+            self._jobs.setdefault(cleaner_id, {})[date] = counted.get(cleaner_id, {}).get(date, 0)
+
+    async def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.refresh()
+
+    async def reload(self, *cleaner_ids: Optional[str]) -> None:
+        """Re-read cleaners that were created, edited or deleted"""
+        ids = [cleaner_id for cleaner_id in cleaner_ids if cleaner_id]
+        if self._refreshing:
+            self._changed_cleaners.update(ids)
+        if not ids or not self._loaded:
+            return
+        await self._read_profiles(ids)
+        self.stats["reloads"] += 1
+
+    # Booking changes --------------------------------------------------------
+
+    def record_booking_changes(self, changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+        """(before, after) booking pairs; None for a new or deleted booking"""
+        if not self._loaded and not self._refreshing:
+            return
+        cutoff = _recent_cutoff()
+        for before, after in changes:
+            for booking, sign in ((before, -1), (after, 1)):
+                if not booking or not booking.get("cleaner_id") or booking.get("status") not in RECENT_LOAD_STATUSES:
+                    continue
+                date = booking.get("booking_date")
+                if not date or date < cutoff:
+                    continue
+                if self._refreshing:
+                    self._changed_jobs.add((booking["cleaner_id"], date))
+                if self._loaded:
+                    dates = self._jobs.setdefault(booking["cleaner_id"], {})
+                    dates[date] = max(0, dates.get(date, 0) + sign)
+            self.stats["booking_changes"] += 1
+
+    # Queries ----------------------------------------------------------------
+
+    async def get_many(self, cleaner_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Profiles of the given cleaners (unknown ids are left out)"""
+        await self._ensure_loaded()
+        return {cleaner_id: self._profiles[cleaner_id] for cleaner_id in cleaner_ids if cleaner_id in self._profiles}
+
+    async def cleaners(self, active_only: bool = True, approved_only: bool = False) -> List[Dict[str, Any]]:
+        """Cached profiles, filtered like {"is_active": True} / {"is_approved": True} queries"""
+        await self._ensure_loaded()
+        return [
+            profile for profile in self._profiles.values()
+            if (not active_only or profile.get("is_active")) and (not approved_only or profile.get("is_approved"))
+        ]
+
+    def recent_jobs(self, cleaner_ids: Iterable[str]) -> Dict[str, int]:
+        """cleaner_id -> counted bookings from RECENT_LOAD_DAYS ago onwards"""
+        cutoff = _recent_cutoff()
+        return {
+            cleaner_id: sum(count for date, count in self._jobs.get(cleaner_id, {}).items() if date >= cutoff)
+            for cleaner_id in cleaner_ids
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {"loaded": self._loaded, "cleaners": len(self._profiles), **self.stats}
@@ -0,0 +1,156 @@
+"""
+Cleaner Scoring for Auto-Assignment
+Ranks the cleaners who can take a booking. Per-cleaner load comes from
+aggregations grouped by cleaner_id (one over bookings, one over the slot's
+availability rows) instead of several queries per cleaner, and the scoring
+terms are computed as NumPy arrays over all candidates at once:
+
+    score = rating * 10 + experience_months * 0.1
+            - bookings_today * 5 + size_bonus - recent_jobs * 0.5
+            - travel_minutes * 0.2
+
+travel_minutes is the detour the booking adds between the cleaner's jobs in
+the neighbouring slots (services.travel_matrix); 0 when not known.
+
+Cleaners at their daily cap, already booked in the slot or marked
+unavailable are left out. Ties keep the order the cleaners were passed in.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .availability_index import INACTIVE_BOOKING_STATUSES
+from .slots import slot_index
+
+# A cleaner's jobs that day (and whether they are booked in the slot) count
+# every booking the availability index treats as active, so ranking is the
+# same inside and outside its horizon. The last week counts work done or due.
+RECENT_LOAD_STATUSES = ["confirmed", "in_progress", "completed"]
+RECENT_LOAD_DAYS = 7
+# Score points per extra minute of driving
+TRAVEL_MINUTE_PENALTY = 0.2
+
+# Cleaner fields the score reads
+SCORING_PROJECTION = {
+    "_id": 0, "id": 1, "rating": 1, "total_jobs": 1, "experience_months": 1, "preferred_house_sizes": 1,
+}
+
+
+def daily_caps(total_jobs: np.ndarray) -> np.ndarray:
+    """Jobs per day: 4 for experienced cleaners (>100 jobs), 2 for new ones (<20), else 3"""
+    return np.where(total_jobs > 100, 4, np.where(total_jobs < 20, 2, 3))
+
+
+def cleaner_column(cleaners: Sequence[Dict[str, Any]], field: str, default: float) -> np.ndarray:
+    return np.array([
+        default if cleaner.get(field) is None else cleaner.get(field) for cleaner in cleaners
+    ], dtype=np.float64)
+
+
+def base_scores(cleaners: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Rating and experience part of the score"""
+    return cleaner_column(cleaners, "rating", 5.0) * 10 + cleaner_column(cleaners, "experience_months", 0) * 0.1
+
+
+def size_bonuses(cleaners: Sequence[Dict[str, Any]], house_size: Optional[str]) -> np.ndarray:
+    """10 for a preferred house size, 5 for cleaners without preferences"""
+    if not house_size:
+        return np.zeros(len(cleaners))
+    return np.array([
+        10.0 if house_size in (cleaner.get("preferred_house_sizes") or [])
+        else 0.0 if cleaner.get("preferred_house_sizes") else 5.0
+        for cleaner in cleaners
+    ])
+
+
+def rank_cleaners(cleaners: Sequence[Dict[str, Any]], bookings_today: Sequence[int], recent_jobs: Sequence[int],
+                  excluded: Sequence[bool], house_size: Optional[str] = None,
+                  travel_minutes: Optional[Sequence[float]] = None) -> List[Dict[str, Any]]:
+    """Eligible cleaners ordered best first, with the score terms of each.
+
+    bookings_today, recent_jobs, excluded and travel_minutes are aligned with `cleaners`.
+    """
+    if not len(cleaners):
+        return []
+    bookings_today = np.asarray(bookings_today, dtype=np.int64)
+    recent_jobs = np.asarray(recent_jobs, dtype=np.int64)
+    excluded = np.asarray(excluded, dtype=bool)
+    travel = np.zeros(len(cleaners)) if travel_minutes is None else np.asarray(travel_minutes, dtype=np.float64)
+    rating = cleaner_column(cleaners, "rating", 5.0)
+    total_jobs = cleaner_column(cleaners, "total_jobs", 0)
+
+    scores = (
+        base_scores(cleaners)
+        - bookings_today * 5
+        + size_bonuses(cleaners, house_size)
+        - recent_jobs * 0.5
+        - travel * TRAVEL_MINUTE_PENALTY
+    )
+    eligible = ~excluded & (bookings_today < daily_caps(total_jobs))
+    candidates = np.flatnonzero(eligible)
+    # Stable sort on the negated score: equal scores keep the order passed in
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [
+        {
+            "cleaner_id": cleaners[i].get("id"),
+            "score": float(scores[i]),
+            "rating": float(rating[i]),
+            "total_jobs": int(total_jobs[i]),
+            "bookings_today": int(bookings_today[i]),
+            "recent_jobs": int(recent_jobs[i]),
+            "travel_minutes": float(travel[i]),
+        }
+        for i in order
+    ]
+
+
+async def load_cleaner_load(db: AsyncIOMotorDatabase, cleaner_ids: List[str], booking_date: str,
+                            time_slot: Optional[str], today: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+    """cleaner_id -> {"today", "in_slot", "recent"} booking counts from one aggregation.
+
+    Without a time_slot "in_slot" is always 0.
+    """
+    week_ago = ((today or datetime.now()) - timedelta(days=RECENT_LOAD_DAYS)).strftime("%Y-%m-%d")
+    on_date = {"$eq": ["$booking_date", booking_date]}
+    daily_status = {"$not": {"$in": ["$status", INACTIVE_BOOKING_STATUSES]}}
+    recent_status = {"$in": ["$status", RECENT_LOAD_STATUSES]}
+    same_slot: Dict[str, Any] = {"$eq": ["$time_slot", time_slot]} if time_slot else {"$literal": False}
+    index = slot_index(time_slot)
+    if index is not None:
+        same_slot = {"$or": [same_slot, {"$eq": ["$slot_index", index]}]}
+
+    load: Dict[str, Dict[str, int]] = {}
+    async for row in db.bookings.aggregate([
+        {"$match": {
+            "cleaner_id": {"$in": cleaner_ids},
+            "booking_date": {"$gte": min(week_ago, booking_date)},
+            "status": {"$nin": INACTIVE_BOOKING_STATUSES},
+        }},
+        {"$group": {
+            "_id": "$cleaner_id",
+            "today": {"$sum": {"$cond": [{"$and": [on_date, daily_status]}, 1, 0]}},
+            "in_slot": {"$sum": {"$cond": [{"$and": [on_date, daily_status, same_slot]}, 1, 0]}},
+            "recent": {"$sum": {"$cond": [{"$and": [{"$gte": ["$booking_date", week_ago]}, recent_status]}, 1, 0]}},
+        }},
+    ]):
+        load[row["_id"]] = {"today": row["today"], "in_slot": row["in_slot"], "recent": row["recent"]}
+    return load
+
+
+async def load_unavailable(db: AsyncIOMotorDatabase, cleaner_ids: List[str], booking_date: str,
+                           time_slot: str) -> List[str]:
+    """Cleaners whose availability row for the slot is blocked or booked (no row means available)"""
+    return [
+        row["_id"] async for row in db.cleaner_availability.aggregate([
+            {"$match": {"cleaner_id": {"$in": cleaner_ids}, "date": booking_date, "time_slot": time_slot}},
+            {"$group": {
+                "_id": "$cleaner_id",
+                "unavailable": {"$max": {"$or": [
+                    {"$eq": ["$is_available", False]},
+                    {"$eq": ["$is_booked", True]},
+                ]}},
+            }},
+            {"$match": {"unavailable": True}},
+        ])
+    ]
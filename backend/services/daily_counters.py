@@ -0,0 +1,225 @@
+"""
+Daily Booking Counters
+One document per booking date with booking counts by status and by time
+slot plus revenue sums, so dashboards and reports read a handful of
+documents instead of recounting the bookings collection:
+
+    {_id: "2025-03-14", total: 7, revenue_total: 1260.0,
+     status: {confirmed: 5, cancelled: 2}, revenue: {confirmed: 900.0, ...},
+     slots: {"08:00-10:00": 2, ...}, updated_at: ...}
+
+`slots` only counts bookings that hold capacity (not cancelled). Counters are
+moved incrementally by the code paths that create bookings or change their
+status, date, slot or amount; rebuild_daily_counters() recomputes them from
+the bookings collection for repair.
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+
+from services.capacity import holds_capacity
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "daily_counters"
+
+# Booking fields the counters depend on
+COUNTED_FIELDS = ("booking_date", "status", "time_slot", "total_amount")
+# Fields change listeners are told about
+LISTENED_FIELDS = COUNTED_FIELDS + ("cleaner_id",)
+
+
+# Revenue of a booking: total_amount as a number, with missing, null and
+# unparseable values counting 0. _amount() and AMOUNT_EXPRESSION (for the
+# rebuild aggregation) must stay the same coercion, or incremental counters
+# drift from rebuilt ones (e.g. "129.00" strings from legacy writes).
+AMOUNT_EXPRESSION = {"$convert": {"input": "$total_amount", "to": "double", "onError": 0.0, "onNull": 0.0}}
+
+
+def _amount(booking: Dict[str, Any]) -> float:
+    try:
+        return float(booking.get("total_amount") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _field_key(value: Any) -> str:
+    # Field names may not contain "." or start with "$"
+    return str(value).replace(".", "_").lstrip("$") or "unknown"
+
+
+def _contribution(booking: Optional[Dict[str, Any]], sign: int, incs: Dict[str, Dict[str, float]]) -> None:
+    if not booking or not booking.get("booking_date"):
+        return
+    date_incs = incs.setdefault(booking["booking_date"], {})
+    status = _field_key(booking.get("status") or "pending")
+    amount = _amount(booking)
+    for field, value in (
+        ("total", 1),
+        ("revenue_total", amount),
+        (f"status.{status}", 1),
+        (f"revenue.{status}", amount),
+    ):
+        date_incs[field] = date_incs.get(field, 0) + sign * value
+    if holds_capacity(booking.get("status")) and booking.get("time_slot"):
+        field = f"slots.{_field_key(booking['time_slot'])}"
+        date_incs[field] = date_incs.get(field, 0) + sign
+
+
+def counter_increments(changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> Dict[str, Dict[str, float]]:
+    """Per-date $inc documents for (before, after) booking pairs.
+
+    before=None is a new booking, after=None a deleted one.
+    """
+    incs: Dict[str, Dict[str, float]] = {}
+    for before, after in changes:
+        _contribution(before, -1, incs)
+        _contribution(after, 1, incs)
+    return {
+        date: {field: value for field, value in fields.items() if value}
+        for date, fields in incs.items()
+        if any(fields.values())
+    }
+
+
+BookingChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Called with the (before, after) pairs of every booking change recorded here
+_change_listeners: List[Callable[[List[BookingChange]], None]] = []
+
+
+def add_change_listener(listener: Callable[[List[BookingChange]], None]) -> None:
+    """Have `listener` see every booking change that moves the counters
+    (e.g. to keep an in-process cache in step)"""
+    _change_listeners.append(listener)
+
+
+def _notify(changes: List[BookingChange]) -> None:
+    for listener in _change_listeners:
+        try:
+            listener(changes)
+        except Exception as e:
+            logger.warning(f"Booking change listener failed: {e}")
+
+
+async def apply_counter_changes(db: AsyncIOMotorDatabase, changes: Iterable[BookingChange]) -> None:
+    """Move the counters for several booking changes; one write per affected date"""
+    changes = list(changes)
+    _notify(changes)
+    await _apply_increments(db, changes)
+
+
+async def _apply_increments(db: AsyncIOMotorDatabase, changes: List[BookingChange]) -> None:
+    incs = counter_increments(changes)
+    if not incs:
+        return
+    now = datetime.now(timezone.utc)
+    await db[COUNTERS_COLLECTION].bulk_write([
+        UpdateOne({"_id": date}, {"$inc": fields, "$set": {"updated_at": now}}, upsert=True)
+        for date, fields in incs.items()
+    ], ordered=False)
+
+
+async def record_booking_created(db: AsyncIOMotorDatabase, booking: Dict[str, Any]) -> None:
+    await apply_counter_changes(db, [(None, booking)])
+
+
+async def record_booking_change(db: AsyncIOMotorDatabase, before: Optional[Dict[str, Any]],
+                                changes: Dict[str, Any]) -> None:
+    """`before` is the stored booking, `changes` the fields that were $set on it"""
+    if before is None:
+        return
+    change = [(before, {**before, **changes})]
+    if any(field in changes for field in LISTENED_FIELDS):
+        _notify(change)
+    if any(field in changes for field in COUNTED_FIELDS):
+        await _apply_increments(db, change)
+
+
+async def transition_booking_status(db: AsyncIOMotorDatabase, query: Dict[str, Any],
+                                    changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """$set `changes` on the booking matching `query` and move its counters.
+
+    Returns the booking as it was before the update (None if nothing
+    matched). The read and the write are one find_one_and_update, so the
+    counters always move from the status the booking actually had.
+    """
+    before = await db.bookings.find_one_and_update(
+        query, {"$set": changes}, return_document=ReturnDocument.BEFORE
+    )
+    await record_booking_change(db, before, changes)
+    return before
+
+
+async def get_daily_counters(db: AsyncIOMotorDatabase, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+    """Counter documents between two dates (inclusive), keyed by date"""
+    cursor = db[COUNTERS_COLLECTION].find({"_id": {"$gte": start_date, "$lte": end_date}})
+    return {doc["_id"]: doc async for doc in cursor}
+
+
+def sum_counters(documents: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals of several counter documents in the same shape"""
+    totals: Dict[str, Any] = {"total": 0, "revenue_total": 0.0, "status": {}, "revenue": {}, "slots": {}}
+    for doc in documents:
+        totals["total"] += doc.get("total", 0)
+        totals["revenue_total"] += doc.get("revenue_total", 0)
+        for group in ("status", "revenue", "slots"):
+            for key, value in (doc.get(group) or {}).items():
+                totals[group][key] = totals[group].get(key, 0) + value
+    return totals
+
+
+async def rebuild_daily_counters(db: AsyncIOMotorDatabase, start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None) -> Dict[str, Any]:
+    """Recompute counter documents from the bookings collection.
+
+    Bookings changed while the rebuild runs can leave the affected dates off
+    by those changes; run it when traffic is low or run it twice.
+    """
+    date_range: Dict[str, str] = {}
+    if start_date:
+        date_range["$gte"] = start_date
+    if end_date:
+        date_range["$lte"] = end_date
+    match: Dict[str, Any] = {"booking_date": date_range} if date_range else {"booking_date": {"$type": "string"}}
+
+    rebuilt: Dict[str, Dict[str, Any]] = {}
+    async for row in db.bookings.aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": {"date": "$booking_date", "status": "$status", "time_slot": "$time_slot"},
+            "count": {"$sum": 1},
+            "revenue": {"$sum": AMOUNT_EXPRESSION},
+        }},
+    ]):
+        key = row["_id"]
+        if not key.get("date"):
+            continue
+        doc = rebuilt.setdefault(key["date"], {"total": 0, "revenue_total": 0.0, "status": {}, "revenue": {}, "slots": {}})
+        status = _field_key(key.get("status") or "pending")
+        doc["total"] += row["count"]
+        doc["revenue_total"] += row["revenue"]
+        doc["status"][status] = doc["status"].get(status, 0) + row["count"]
+        doc["revenue"][status] = doc["revenue"].get(status, 0) + row["revenue"]
+        if holds_capacity(key.get("status")) and key.get("time_slot"):
+            slot = _field_key(key["time_slot"])
+            doc["slots"][slot] = doc["slots"].get(slot, 0) + row["count"]
+
+    now = datetime.now(timezone.utc)
+    operations: List[Any] = [
+        ReplaceOne({"_id": date}, {**doc, "updated_at": now}, upsert=True)
+        for date, doc in rebuilt.items()
+    ]
+    if operations:
+        await db[COUNTERS_COLLECTION].bulk_write(operations, ordered=False)
+
+    # Dates that no longer have any bookings
+    stale_query: Dict[str, Any] = {"_id": {"$nin": list(rebuilt)}}
+    if date_range:
+        stale_query["_id"].update(date_range)
+    removed = await db[COUNTERS_COLLECTION].delete_many(stale_query)
+
+    logger.info(f"Rebuilt daily counters for {len(rebuilt)} dates, removed {removed.deleted_count}")
+    return {"rebuilt": len(rebuilt), "removed": removed.deleted_count}
@@ -0,0 +1,60 @@
+"""
+Per-Date Versions
+A counter per calendar date that is bumped by every write affecting the
+date (bookings, cleaner and time slot availability, blocks). Read endpoints
+derive ETags from it so pollers get 304 Not Modified after one small read:
+
+    {_id: "2025-03-14", v: 12}
+
+The ROSTER_KEY entry is bumped when the set of cleaners changes or data is
+reset in bulk; it is part of every ETag.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+VERSIONS_COLLECTION = "date_versions"
+ROSTER_KEY = "__roster__"
+
+
+async def bump_versions(db: AsyncIOMotorDatabase, keys: Iterable[Optional[str]]) -> None:
+    """Increment the version of each date (or ROSTER_KEY) in one bulk write"""
+    keys = list(dict.fromkeys(k for k in keys if k))
+    if not keys:
+        return
+    now = datetime.now(timezone.utc)
+    await db[VERSIONS_COLLECTION].bulk_write([
+        UpdateOne({"_id": key}, {"$inc": {"v": 1}, "$set": {"updated_at": now}}, upsert=True)
+        for key in keys
+    ], ordered=False)
+
+
+async def get_versions(db: AsyncIOMotorDatabase, keys: Iterable[str]) -> Dict[str, int]:
+    """Current version of each key (0 if never bumped)"""
+    keys = list(dict.fromkeys(keys))
+    cursor = db[VERSIONS_COLLECTION].find({"_id": {"$in": keys}}, {"v": 1})
+    found = {doc["_id"]: doc.get("v", 0) async for doc in cursor}
+    return {key: found.get(key, 0) for key in keys}
+
+
+def make_etag(scope: str, versions: Dict[str, int]) -> str:
+    """Weak ETag naming the endpoint scope and every version it depends on"""
+    parts = ".".join(f"{versions[key]}" for key in sorted(versions))
+    return f'W/"{scope}-{parts}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match semantics with weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
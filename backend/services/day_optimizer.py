@@ -0,0 +1,214 @@
+"""
+Whole-Day Assignment Optimizer
+Assigns all open bookings of a date at once as a min-cost bipartite
+matching instead of one greedy pick per booking, under the auto-assign
+rules: daily caps by total_jobs, one job per cleaner and slot, manual
+availability and preferred house sizes.
+
+The matching graph (rows x columns):
+
+    rows     one per open booking, then "blocker" rows per cleaner
+    columns  one per (cleaner, slot), then one "unassigned" column per booking
+
+A booking has an edge to the (cleaner, slot) column of its own slot for
+every cleaner free in it, weighted by -score, and one to its own unassigned
+column at UNASSIGNED_COST. A cleaner who may take r more jobs that day gets
+(slots - r) blocker rows joined to each of that cleaner's slot columns,
+which leaves at most r of them for bookings. Forbidden pairs have no edge,
+and every row can always be matched, so the problem is always feasible.
+The graph is sparse (a booking only meets its own slot), so it is solved
+with scipy's sparse min-cost full matching rather than a dense
+linear_sum_assignment matrix.
+
+With a travel matrix, each edge also pays for the detour the booking adds
+between the cleaner's fixed jobs in the neighbouring slots. Bookings solved
+in the same run do not see each other's route, which keeps the costs per
+edge and the problem a plain matching.
+"""
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+from .availability_index import INACTIVE_BOOKING_STATUSES
+from .cleaner_scoring import TRAVEL_MINUTE_PENALTY, base_scores, cleaner_column, daily_caps, size_bonuses
+from .slots import SLOT_LABELS, slot_index
+from .travel_matrix import TravelMatrix, booking_zip
+
+# Bookings the optimizer may (re)assign
+OPEN_STATUSES = ["pending", "confirmed"]
+
+# Cost of leaving a booking unassigned; dwarfs any score difference
+UNASSIGNED_COST = 1e6
+# Preference for a booking's current cleaner when reassigning, to limit churn
+KEEP_CLEANER_BONUS = 15.0
+
+
+def _booking_slot(booking: Dict[str, Any]) -> Optional[int]:
+    index = booking.get("slot_index")
+    return index if isinstance(index, int) and 0 <= index < len(SLOT_LABELS) else slot_index(booking.get("time_slot"))
+
+
+def split_bookings(bookings: List[Dict[str, Any]], reassign: bool) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(open, fixed): open bookings are optimized, fixed ones keep their cleaner and hold capacity"""
+    open_bookings, fixed = [], []
+    for booking in bookings:
+        if booking.get("status") in INACTIVE_BOOKING_STATUSES:
+            continue
+        if booking.get("status") in OPEN_STATUSES and (reassign or not booking.get("cleaner_id")):
+            open_bookings.append(booking)
+        elif booking.get("cleaner_id"):
+            fixed.append(booking)
+    return open_bookings, fixed
+
+
+def optimize_day(bookings: List[Dict[str, Any]], cleaners: List[Dict[str, Any]],
+                 availability: List[Dict[str, Any]], recent_jobs: Dict[str, int],
+                 reassign: bool = False, travel: Optional[TravelMatrix] = None) -> Dict[str, Any]:
+    """Best assignment of a date's open bookings to eligible cleaners.
+
+    `bookings` are all bookings of the date, `cleaners` the eligible ones
+    (approved and active), `availability` the date's cleaner_availability
+    rows and `recent_jobs` cleaner_id -> jobs in the last week. `travel`
+    adds the route detour to each score.
+    """
+    started = time.perf_counter()
+    open_bookings, fixed = split_bookings(bookings, reassign)
+    open_ids: Set[str] = {b.get("id") for b in open_bookings}
+    cleaner_pos = {cleaner["id"]: i for i, cleaner in enumerate(cleaners)}
+    slot_count = len(SLOT_LABELS)
+
+    # Cells a cleaner cannot take: manual blocks, booked rows and fixed bookings
+    taken = np.zeros((len(cleaners), slot_count), dtype=bool)
+    fixed_jobs = np.zeros(len(cleaners), dtype=np.int64)
+    for booking in fixed:
+        c = cleaner_pos.get(booking.get("cleaner_id"))
+        if c is None:
+            continue
+        fixed_jobs[c] += 1
+        s = _booking_slot(booking)
+        if s is not None:
+            taken[c, s] = True
+    for row in availability:
+        c = cleaner_pos.get(row.get("cleaner_id"))
+        s = _booking_slot(row)
+        if c is None or s is None:
+            continue
+        # A row booked by a booking being re-solved is free for this solve
+        if row.get("is_available", True) is False or (row.get("is_booked") and row.get("booking_id") not in open_ids):
+            taken[c, s] = True
+
+    remaining = np.clip(daily_caps(cleaner_column(cleaners, "total_jobs", 0)) - fixed_jobs, 0, slot_count)
+    base = (
+        base_scores(cleaners)
+        - fixed_jobs * 5
+        - np.array([recent_jobs.get(cleaner["id"], 0) for cleaner in cleaners]) * 0.5
+    )
+
+    solvable = [b for b in open_bookings if _booking_slot(b) is not None]
+    active = np.flatnonzero(remaining > 0)  # Cleaners with room for another job
+    booking_slots = np.array([_booking_slot(b) for b in solvable], dtype=np.int64)
+    # Only the slots that have open bookings need columns
+    used_slots = np.unique(booking_slots)
+    slot_col = np.full(slot_count, -1, dtype=np.int64)
+    slot_col[used_slots] = np.arange(len(used_slots))
+
+    n_bookings, n_cleaners, n_slots = len(solvable), len(active), len(used_slots)
+    blockers = np.clip(n_slots - remaining[active], 0, None)
+    n_cells = n_cleaners * n_slots
+    n_rows = n_bookings + int(blockers.sum())
+    shape = (n_rows, n_cells + n_bookings)
+
+    chosen: Dict[int, Tuple[int, float]] = {}
+    detour = None
+    if n_bookings:
+        # Booking edges: own slot of every free cleaner, scored per booking
+        size_terms = {}
+        for house_size in {b.get("house_size") for b in solvable}:
+            size_terms[house_size] = size_bonuses([cleaners[c] for c in active], house_size)
+        score = base[active][None, :] + np.stack([size_terms[b.get("house_size")] for b in solvable])
+        if reassign:
+            current = np.array([cleaner_pos.get(b.get("cleaner_id"), -1) for b in solvable])
+            score += KEEP_CLEANER_BONUS * (active[None, :] == current[:, None])
+        if travel is not None:
+            before, after = travel.route_neighbours([cleaner["id"] for cleaner in cleaners], fixed)
+            zips = np.array([travel.position(booking_zip(b)) for b in solvable], dtype=np.int64)
+            detour = travel.detour_minutes(
+                before[active][:, booking_slots].T, zips[:, None], after[active][:, booking_slots].T
+            )
+            score -= TRAVEL_MINUTE_PENALTY * detour
+        free = ~taken[active][:, booking_slots].T  # bookings x cleaners
+        booking_rows, cleaner_idx = np.nonzero(free)
+        booking_cols = cleaner_idx * n_slots + slot_col[booking_slots][booking_rows]
+        booking_scores = score[booking_rows, cleaner_idx]
+        # Weights must be positive; a constant offset per assigned booking keeps the optimum
+        offset = (booking_scores.max() + 1) if len(booking_scores) else 1.0
+
+        # Blocker edges: each of cleaner k's blockers to each of k's slot columns
+        blocker_cleaner = np.repeat(np.arange(n_cleaners), blockers)
+        blocker_rows = np.repeat(n_bookings + np.arange(len(blocker_cleaner)), n_slots)
+        blocker_cols = (blocker_cleaner[:, None] * n_slots + np.arange(n_slots)[None, :]).ravel()
+
+        rows = np.concatenate([booking_rows, np.arange(n_bookings), blocker_rows])
+        cols = np.concatenate([booking_cols, n_cells + np.arange(n_bookings), blocker_cols])
+        weights = np.concatenate([
+            offset - booking_scores,
+            np.full(n_bookings, UNASSIGNED_COST),
+            np.ones(len(blocker_rows)),
+        ])
+        graph = csr_matrix((weights, (rows, cols)), shape=shape)
+        row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+        for r, c in zip(row_ind, col_ind):
+            if r < n_bookings and c < n_cells:
+                chosen[int(r)] = (int(c), float(score[r, c // n_slots]))
+
+    assignments = []
+    for b, booking in enumerate(solvable):
+        cleaner_id = None
+        score_value = None
+        travel_minutes = None
+        if b in chosen:
+            col, score_value = chosen[b]
+            cleaner_id = cleaners[active[col // n_slots]]["id"]
+            score_value = round(score_value, 2)
+            if detour is not None:
+                travel_minutes = float(detour[b, col // n_slots])
+        assignments.append({
+            "booking_id": booking.get("id"),
+            "time_slot": booking.get("time_slot"),
+            "status": booking.get("status"),
+            "current_cleaner_id": booking.get("cleaner_id"),
+            "cleaner_id": cleaner_id,
+            "score": score_value,
+            "travel_minutes": travel_minutes,
+            "changed": cleaner_id is not None and cleaner_id != booking.get("cleaner_id"),
+        })
+    for booking in open_bookings:
+        if _booking_slot(booking) is None:
+            assignments.append({
+                "booking_id": booking.get("id"),
+                "time_slot": booking.get("time_slot"),
+                "status": booking.get("status"),
+                "current_cleaner_id": booking.get("cleaner_id"),
+                "cleaner_id": None,
+                "score": None,
+                "travel_minutes": None,
+                "changed": False,
+                "reason": "time slot is not a calendar slot",
+            })
+
+    assigned = [a for a in assignments if a["cleaner_id"]]
+    return {
+        "assignments": assignments,
+        "open_bookings": len(open_bookings),
+        "fixed_bookings": len(fixed),
+        "eligible_cleaners": n_cleaners,
+        "assigned": len(assigned),
+        "unassigned": len(assignments) - len(assigned),
+        "changed": sum(1 for a in assignments if a["changed"]),
+        "total_score": round(sum(a["score"] for a in assigned), 2),
+        "travel_minutes": None if detour is None else sum(a["travel_minutes"] for a in assigned),
+        "matrix": list(shape),
+        "solve_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
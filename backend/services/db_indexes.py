@@ -0,0 +1,290 @@
+"""
+MongoDB Index Manifest
+Declares the indexes backing the hot query paths, applies them idempotently at
+startup and explains registered queries so collection scans are easy to spot
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Server error codes returned when an index with the same name or key pattern
+# already exists with different options. The existing index is kept; changing
+# it is an explicit step (rebuild_index / manage_indexes.py), never a startup one
+INDEX_CONFLICT_CODES = {85, 86}  # IndexOptionsConflict, IndexKeySpecsConflict
+DUPLICATE_KEY_CODE = 11000
+
+
+def _index(keys, name: str, **options) -> IndexModel:
+    """Build an IndexModel that is always created as a background build"""
+    return IndexModel(keys, name=name, background=True, **options)
+
+
+# Collection name -> indexes. Names are explicit so the manifest can evolve
+# without leaving auto-named duplicates behind.
+INDEX_MANIFEST: Dict[str, List[IndexModel]] = {
+    "bookings": [
+        _index([("id", ASCENDING)], "id_1"),
+        _index([("booking_date", ASCENDING), ("status", ASCENDING)], "booking_date_1_status_1"),
+        _index(
+            [("cleaner_id", ASCENDING), ("booking_date", ASCENDING), ("time_slot", ASCENDING)],
+            "cleaner_id_1_booking_date_1_time_slot_1",
+        ),
+        _index([("user_id", ASCENDING), ("created_at", DESCENDING)], "user_id_1_created_at_-1"),
+        _index([("customer_id", ASCENDING)], "customer_id_1"),
+        _index([("payment_intent_id", ASCENDING)], "payment_intent_id_1", sparse=True),
+        _index([("start_at", ASCENDING), ("status", ASCENDING)], "start_at_1_status_1"),
+        _index([("cleaner_id", ASCENDING), ("start_at", ASCENDING)], "cleaner_id_1_start_at_1"),
+    ],
+    "cleaner_availability": [
+        # Unique so availability can be initialized with blind bulk upserts, and
+        # slot claims (conditional upserts) cannot double book a cleaner
+        _index(
+            [("cleaner_id", ASCENDING), ("date", ASCENDING), ("time_slot", ASCENDING)],
+            "cleaner_id_1_date_1_time_slot_1",
+            unique=True,
+        ),
+        _index([("date", ASCENDING), ("time_slot", ASCENDING)], "date_1_time_slot_1"),
+    ],
+    "time_slot_availability": [
+        _index([("date", ASCENDING), ("time_slot", ASCENDING)], "date_1_time_slot_1", unique=True),
+    ],
+    "reminder_logs": [
+        _index(
+            [("booking_id", ASCENDING), ("template_id", ASCENDING), ("status", ASCENDING)],
+            "booking_id_1_template_id_1_status_1",
+        ),
+    ],
+    "promo_code_usage": [
+        _index([("customer_id", ASCENDING), ("promo_code_id", ASCENDING)], "customer_id_1_promo_code_id_1"),
+    ],
+    "users": [
+        _index([("id", ASCENDING)], "id_1"),
+        _index([("email", ASCENDING)], "email_1"),
+    ],
+    "cleaners": [
+        _index([("id", ASCENDING)], "id_1"),
+        _index([("user_id", ASCENDING)], "user_id_1"),
+    ],
+    "calendar_events": [
+        _index([("cleaner_id", ASCENDING), ("start_time", ASCENDING)], "cleaner_id_1_start_time_1"),
+    ],
+}
+
+# Queries that run on every request or every scheduler tick. Values are
+# placeholders: explain() only needs the shape to choose a plan.
+HOT_QUERIES: List[Dict[str, Any]] = [
+    {
+        "name": "bookings_by_date_status",
+        "collection": "bookings",
+        "filter": {"booking_date": "2024-01-01", "status": {"$in": ["confirmed", "in_progress"]}},
+    },
+    {
+        "name": "bookings_cleaner_slot_conflict",
+        "collection": "bookings",
+        "filter": {"cleaner_id": "cleaner", "booking_date": "2024-01-01", "time_slot": "08:00-10:00"},
+    },
+    {
+        "name": "bookings_by_user",
+        "collection": "bookings",
+        "filter": {"user_id": "user"},
+        "sort": {"created_at": -1},
+    },
+    {
+        "name": "bookings_by_customer",
+        "collection": "bookings",
+        "filter": {"customer_id": "customer"},
+    },
+    {
+        "name": "bookings_by_payment_intent",
+        "collection": "bookings",
+        "filter": {"payment_intent_id": "pi_placeholder"},
+    },
+    {
+        "name": "bookings_starting_between",
+        "collection": "bookings",
+        "filter": {"start_at": {"$gte": datetime(2024, 1, 1), "$lte": datetime(2024, 1, 1, 2)},
+                   "status": {"$in": ["confirmed", "pending"]}},
+    },
+    {
+        "name": "bookings_cleaner_schedule",
+        "collection": "bookings",
+        "filter": {"cleaner_id": "cleaner", "start_at": {"$gte": datetime(2024, 1, 1), "$lt": datetime(2024, 1, 8)}},
+        "sort": {"start_at": 1},
+    },
+    {
+        "name": "cleaner_availability_slot",
+        "collection": "cleaner_availability",
+        "filter": {"cleaner_id": "cleaner", "date": "2024-01-01", "time_slot": "08:00-10:00"},
+    },
+    {
+        "name": "reminder_log_sent",
+        "collection": "reminder_logs",
+        "filter": {"booking_id": "booking", "template_id": "template", "status": "sent"},
+    },
+    {
+        "name": "promo_usage_by_customer",
+        "collection": "promo_code_usage",
+        "filter": {"customer_id": "customer", "promo_code_id": "promo"},
+    },
+    {
+        "name": "time_slot_availability_by_date",
+        "collection": "time_slot_availability",
+        "filter": {"date": "2024-01-01", "time_slot": "08:00-10:00"},
+    },
+]
+
+
+# Unique indexes writers rely on for correctness: when duplicates keep one
+# from being built it is logged as an error, and writers check for it with
+# has_unique_index() so they fail closed
+REQUIRED_UNIQUE_INDEXES = {("cleaner_availability", "cleaner_id_1_date_1_time_slot_1")}
+
+
+async def _create_index(collection, model: IndexModel) -> str:
+    """Create a single index. Existing indexes are never dropped: a conflicting
+    definition is reported as "conflict" and left in place."""
+    name = model.document["name"]
+    try:
+        await collection.create_indexes([model])
+        return "ok"
+    except OperationFailure as e:
+        if e.code in INDEX_CONFLICT_CODES:
+            logger.warning(
+                f"Index {collection.name}.{name} exists with a different definition; keeping it "
+                f"(run manage_indexes.py rebuild {collection.name} {name} to apply the manifest)"
+            )
+            return "conflict"
+        if e.code == DUPLICATE_KEY_CODE:
+            if (collection.name, name) in REQUIRED_UNIQUE_INDEXES:
+                logger.error(f"Unique index {collection.name}.{name} not built: duplicate keys present")
+                return "missing_duplicates"
+            # Existing data violates a unique constraint; keep serving without it
+            logger.warning(f"Skipped unique index {collection.name}.{name}: duplicate keys present")
+            return "skipped_duplicates"
+        raise
+
+
+def _manifest_model(collection_name: str, name: str) -> IndexModel:
+    for model in INDEX_MANIFEST.get(collection_name, []):
+        if model.document["name"] == name:
+            return model
+    raise KeyError(f"{collection_name}.{name} is not in the index manifest")
+
+
+async def rebuild_index(db: AsyncIOMotorDatabase, collection_name: str, name: str,
+                        allow_weaker: bool = False) -> str:
+    """Replace an existing index with its manifest definition (explicit operator step).
+
+    The collection is without the index while it builds, so run it when
+    traffic is low and with a single app worker. Replacing a unique index
+    with a non-unique definition is refused unless allow_weaker.
+    """
+    model = _manifest_model(collection_name, name)
+    collection = db[collection_name]
+    existing = (await collection.index_information()).get(name)
+    if existing and existing.get("unique") and not model.document.get("unique") and not allow_weaker:
+        raise ValueError(f"{collection_name}.{name} is unique in the database but not in the manifest")
+    if existing:
+        await collection.drop_index(name)
+    await collection.create_indexes([model])
+    logger.info(f"Rebuilt index {collection_name}.{name} from the manifest")
+    return "rebuilt"
+
+
+async def has_unique_index(db: AsyncIOMotorDatabase, collection_name: str, name: str) -> bool:
+    """Whether the named index exists on the collection and is unique"""
+    indexes = await db[collection_name].index_information()
+    return bool(indexes.get(name, {}).get("unique"))
+
+
+async def ensure_collection_indexes(db: AsyncIOMotorDatabase, collection_name: str) -> Dict[str, str]:
+    """Apply the manifest entries of a single collection"""
+    collection = db[collection_name]
+    results: Dict[str, str] = {}
+    for model in INDEX_MANIFEST.get(collection_name, []):
+        name = model.document["name"]
+        try:
+            results[name] = await _create_index(collection, model)
+        except Exception as e:
+            logger.error(f"Failed to create index {collection_name}.{name}: {str(e)}")
+            results[name] = f"error: {str(e)}"
+    return results
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, str]]:
+    """Apply the index manifest. Safe to call on every startup."""
+    results: Dict[str, Dict[str, str]] = {}
+    for collection_name in INDEX_MANIFEST:
+        results[collection_name] = await ensure_collection_indexes(db, collection_name)
+    return results
+
+
+def _collect_stages(plan: Any, stages: List[str]) -> List[str]:
+    """Walk an explain plan tree and collect stage names"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            if isinstance(value, (dict, list)):
+                _collect_stages(value, stages)
+    elif isinstance(plan, list):
+        for item in plan:
+            _collect_stages(item, stages)
+    return stages
+
+
+async def explain_query(db: AsyncIOMotorDatabase, collection: str, filter: Dict[str, Any],
+                        sort: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Explain a find() and report the winning plan's stages"""
+    find_command: Dict[str, Any] = {"find": collection, "filter": filter}
+    if sort:
+        find_command["sort"] = sort
+    explanation = await db.command({"explain": find_command, "verbosity": "queryPlanner"})
+    winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+    stages = _collect_stages(winning_plan, [])
+    index_names = sorted(set(_collect_index_names(winning_plan, [])))
+    return {
+        "stages": stages,
+        "indexes": index_names,
+        "collscan": "COLLSCAN" in stages,
+    }
+
+
+def _collect_index_names(plan: Any, names: List[str]) -> List[str]:
+    """Walk an explain plan tree and collect the indexes it uses"""
+    if isinstance(plan, dict):
+        if plan.get("indexName"):
+            names.append(plan["indexName"])
+        for value in plan.values():
+            if isinstance(value, (dict, list)):
+                _collect_index_names(value, names)
+    elif isinstance(plan, list):
+        for item in plan:
+            _collect_index_names(item, names)
+    return names
+
+
+async def explain_hot_queries(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Explain every registered hot query and flag collection scans"""
+    queries = []
+    for query in HOT_QUERIES:
+        entry = {"name": query["name"], "collection": query["collection"]}
+        try:
+            entry.update(await explain_query(db, query["collection"], query["filter"], query.get("sort")))
+        except Exception as e:
+            entry["error"] = str(e)
+        queries.append(entry)
+
+    collscans = [q["name"] for q in queries if q.get("collscan")]
+    if collscans:
+        logger.warning(f"Hot queries using COLLSCAN: {', '.join(collscans)}")
+    return {
+        "queries": queries,
+        "collscans": collscans,
+        "total": len(queries),
+    }
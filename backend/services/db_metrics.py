@@ -0,0 +1,209 @@
+"""
+Database Command Metrics
+A pymongo CommandListener that attributes every MongoDB command to the HTTP
+request that issued it. The request's stats live in a context variable;
+Motor copies the context into its executor threads, so listener callbacks
+see the stats object of the request that awaited the operation.
+
+Per request this records command count, latency and documents returned by
+collection, and flags "N+1" patterns: more than DB_N_PLUS_ONE_THRESHOLD
+commands with the same shape (command, collection and filter keys).
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+DB_METRICS_ENABLED = os.getenv("DB_METRICS_ENABLED", "true").lower() == "true"
+# Add an X-DB-Stats header to every response (debugging only)
+DB_METRICS_DEBUG_HEADER = os.getenv("DB_METRICS_DEBUG_HEADER", "false").lower() == "true"
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+
+# Commands whose first value is not a collection name or carry no user data
+_IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "buildInfo", "saslStart",
+                     "saslContinue", "endSessions", "killCursors"}
+# Where each command keeps the filter that defines its shape
+_FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query",
+                  "findAndModify": "query", "delete": "deletes", "update": "updates"}
+
+
+def _filter_shape(command_name: str, command: Dict[str, Any]) -> str:
+    """Sorted top-level filter keys, e.g. "cleaner_id,date" """
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        query = pipeline[0].get("$match", {}) if pipeline and isinstance(pipeline[0], dict) else {}
+    else:
+        query = command.get(_FILTER_FIELDS.get(command_name, ""), {})
+        if isinstance(query, list):
+            statement = query[0] if query else {}
+            query = statement.get("q", {}) if isinstance(statement, dict) else {}
+    if not isinstance(query, dict):
+        return ""
+    return ",".join(sorted(query))
+
+
+def _documents_returned(command_name: str, reply: Dict[str, Any]) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+        return len(batch)
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") else 0
+    if command_name in ("count", "insert", "update", "delete"):
+        return int(reply.get("n", 0))
+    return 0
+
+
+class RequestDbStats:
+    """Commands issued while serving one HTTP request"""
+
+    def __init__(self):
+        self.commands = 0
+        self.failures = 0
+        self.duration_ms = 0.0
+        self.collections: Dict[str, Dict[str, float]] = {}
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, collection: str, shape: Optional[str], duration_ms: float,
+               documents: int, failed: bool = False) -> None:
+        with self._lock:
+            self.commands += 1
+            self.duration_ms += duration_ms
+            if failed:
+                self.failures += 1
+            stats = self.collections.setdefault(collection, {"commands": 0, "duration_ms": 0.0, "documents": 0})
+            stats["commands"] += 1
+            stats["duration_ms"] += duration_ms
+            stats["documents"] += documents
+            if shape:
+                self.shapes[shape] += 1
+
+    @property
+    def documents(self) -> int:
+        return int(sum(c["documents"] for c in self.collections.values()))
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Shapes issued more than `threshold` times"""
+        return {shape: count for shape, count in self.shapes.items() if count > threshold}
+
+    def header_value(self) -> str:
+        return f"commands={self.commands};time_ms={self.duration_ms:.1f};docs={self.documents}"
+
+
+_current_request: ContextVar[Optional[RequestDbStats]] = ContextVar("db_request_stats", default=None)
+
+
+def begin_request() -> RequestDbStats:
+    """Start attributing commands in this context to a new stats object"""
+    stats = RequestDbStats()
+    _current_request.set(stats)
+    return stats
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Feeds command events into the stats of the current request"""
+
+    def __init__(self):
+        self._pending: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        stats = _current_request.get()
+        if stats is None or event.command_name in _IGNORED_COMMANDS:
+            return
+        if event.command_name == "getMore":
+            collection = event.command.get("collection", "")
+            shape = None  # Continuations of a query already counted
+        else:
+            collection = event.command.get(event.command_name, "")
+            shape = f"{event.command_name} {collection} {{{_filter_shape(event.command_name, event.command)}}}"
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (stats, str(collection), shape)
+
+    def _finish(self, event, reply: Optional[Dict[str, Any]], failed: bool) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        stats, collection, shape = pending
+        documents = _documents_returned(event.command_name, reply) if reply else 0
+        stats.record(collection, shape, event.duration_micros / 1000.0, documents, failed)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, event.reply, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, None, failed=True)
+
+
+class DbMetricsRegistry:
+    """Process-wide totals per endpoint plus the most recent N+1 warnings"""
+
+    def __init__(self, max_warnings: int = 50):
+        self.started_at = time.time()
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.collections: Dict[str, Dict[str, float]] = {}
+        self.warnings: Deque[Dict[str, Any]] = deque(maxlen=max_warnings)
+
+    def observe(self, endpoint: str, stats: RequestDbStats, threshold: int = DB_N_PLUS_ONE_THRESHOLD) -> List[str]:
+        """Fold one request's stats in; returns the shapes that crossed the threshold"""
+        entry = self.endpoints.setdefault(endpoint, {
+            "requests": 0, "commands": 0, "failures": 0, "duration_ms": 0.0,
+            "documents": 0, "max_commands": 0, "n_plus_one": 0,
+        })
+        entry["requests"] += 1
+        entry["commands"] += stats.commands
+        entry["failures"] += stats.failures
+        entry["duration_ms"] += stats.duration_ms
+        entry["documents"] += stats.documents
+        entry["max_commands"] = max(entry["max_commands"], stats.commands)
+
+        for collection, values in stats.collections.items():
+            totals = self.collections.setdefault(collection, {"commands": 0, "duration_ms": 0.0, "documents": 0})
+            for key, value in values.items():
+                totals[key] += value
+
+        repeated = stats.repeated_shapes(threshold)
+        if repeated:
+            entry["n_plus_one"] += 1
+            for shape, count in repeated.items():
+                self.warnings.append({"endpoint": endpoint, "shape": shape, "count": count, "at": time.time()})
+                logger.warning(f"Possible N+1 in {endpoint}: {count} x {shape}")
+        return list(repeated)
+
+    def snapshot(self) -> Dict[str, Any]:
+        endpoints = []
+        for name, entry in self.endpoints.items():
+            requests = entry["requests"] or 1
+            endpoints.append({
+                "endpoint": name,
+                **entry,
+                "duration_ms": round(entry["duration_ms"], 1),
+                "avg_commands": round(entry["commands"] / requests, 2),
+                "avg_duration_ms": round(entry["duration_ms"] / requests, 2),
+            })
+        endpoints.sort(key=lambda e: e["commands"], reverse=True)
+        return {
+            "since": self.started_at,
+            "n_plus_one_threshold": DB_N_PLUS_ONE_THRESHOLD,
+            "endpoints": endpoints,
+            "collections": {
+                name: {**values, "duration_ms": round(values["duration_ms"], 1)}
+                for name, values in sorted(self.collections.items())
+            },
+            "recent_n_plus_one": list(self.warnings),
+        }
+
+    def reset(self) -> None:
+        self.__init__(self.warnings.maxlen)
+
+
+command_listener = CommandMetricsListener()
+db_metrics = DbMetricsRegistry()
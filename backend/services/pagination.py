@@ -0,0 +1,191 @@
+"""
+Keyset Pagination
+Shared cursor pagination for list endpoints. Pages are ordered on a sort field
+plus a unique tiebreaker (the document `id`), and the position of the last row
+is handed back to the client as an opaque cursor.
+
+A request with neither a limit nor a cursor is not paged: it returns every
+matching row, as the endpoints did before pagination, so clients that never
+follow cursors are not truncated.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import DESCENDING
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# BSON compares values of different types by type before value. Stored
+# timestamps are a mix of ISO strings and datetimes, so a boundary on one type
+# has to include every document of the types that sort after it.
+_TYPE_ORDER = ["null", "string", "date"]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a cursor that cannot be decoded"""
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Apply the default and maximum page size"""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def page_size(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """Rows to return, or None for an unpaged request (no limit and no cursor)"""
+    if limit is None and not cursor:
+        return None
+    return clamp_page_size(limit)
+
+
+def cursor_filter(cursor: Optional[str], sort_field: str = "created_at", direction: int = DESCENDING,
+                  tiebreak_field: str = "id") -> Optional[Dict[str, Any]]:
+    """The keyset predicate of a cursor, for pipelines that apply the page boundary
+    early themselves (None without a cursor)"""
+    if not cursor:
+        return None
+    sort_value, tiebreak_value = decode_cursor(cursor)
+    return keyset_filter(sort_field, direction, sort_value, tiebreak_value, tiebreak_field)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(sort_value: Any, tiebreak_value: Any) -> str:
+    """Encode the position of a row as an opaque, URL-safe token"""
+    payload = json.dumps([_encode_value(sort_value), tiebreak_value], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, tiebreak_value = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return [_decode_value(sort_value), tiebreak_value]
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def _bson_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, datetime):
+        return "date"
+    return "string"
+
+
+def _type_match(field: str, type_name: str) -> Dict[str, Any]:
+    if type_name == "null":
+        return {field: None}
+    return {field: {"$type": type_name}}
+
+
+def keyset_filter(sort_field: str, direction: int, sort_value: Any, tiebreak_value: Any,
+                  tiebreak_field: str = "id") -> Dict[str, Any]:
+    """Build the predicate selecting rows strictly after the cursor position"""
+    op = "$lt" if direction == DESCENDING else "$gt"
+    value_type = _bson_type(sort_value)
+
+    clauses: List[Dict[str, Any]] = [{sort_field: sort_value, tiebreak_field: {op: tiebreak_value}}]
+    if value_type != "null":
+        clauses.append({sort_field: {op: sort_value}})
+
+    # Values of other BSON types that sort after the boundary in this direction
+    position = _TYPE_ORDER.index(value_type)
+    following = _TYPE_ORDER[:position] if direction == DESCENDING else _TYPE_ORDER[position + 1:]
+    clauses.extend(_type_match(sort_field, type_name) for type_name in following)
+    return {"$or": clauses}
+
+
+def _page_result(rows: List[Dict[str, Any]], limit: Optional[int], sort_field: str,
+                 tiebreak_field: str, total: Optional[int]) -> Dict[str, Any]:
+    if limit is None:
+        return {"items": rows, "next_cursor": None, "has_more": False, "total": total}
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last.get(tiebreak_field))
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "total": total,
+    }
+
+
+async def paginate(collection, query: Optional[Dict[str, Any]] = None, sort_field: str = "created_at",
+                   direction: int = DESCENDING, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   include_total: bool = False, projection: Optional[Dict[str, Any]] = None,
+                   tiebreak_field: str = "id") -> Dict[str, Any]:
+    """Fetch one page of a find() ordered by (sort_field, tiebreak_field)"""
+    query = query or {}
+    limit = page_size(limit, cursor)
+
+    page_query = query
+    boundary = cursor_filter(cursor, sort_field, direction, tiebreak_field)
+    if boundary:
+        page_query = {"$and": [query, boundary]} if query else boundary
+
+    total = await collection.count_documents(query) if include_total else None
+    rows_cursor = collection.find(page_query, projection).sort(
+        [(sort_field, direction), (tiebreak_field, direction)]
+    )
+    if limit is not None:
+        rows_cursor = rows_cursor.limit(limit + 1)
+    rows = await rows_cursor.to_list(None if limit is None else limit + 1)
+    return _page_result(rows, limit, sort_field, tiebreak_field, total)
+
+
+async def paginate_pipeline(collection, pipeline: List[Dict[str, Any]], sort_field: str = "created_at",
+                            direction: int = DESCENDING, limit: Optional[int] = None,
+                            cursor: Optional[str] = None, include_total: bool = False,
+                            tiebreak_field: str = "id",
+                            count_pipeline: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Fetch one page of an aggregation whose output rows carry sort_field and tiebreak_field.
+
+    `count_pipeline` counts the total when `pipeline` already narrows itself to
+    the page (see cursor_filter); it defaults to `pipeline`.
+    """
+    limit = page_size(limit, cursor)
+
+    page_pipeline = list(pipeline)
+    boundary = cursor_filter(cursor, sort_field, direction, tiebreak_field)
+    if boundary:
+        page_pipeline.append({"$match": boundary})
+    page_pipeline.append({"$sort": {sort_field: direction, tiebreak_field: direction}})
+    if limit is not None:
+        page_pipeline.append({"$limit": limit + 1})
+
+    total = None
+    if include_total:
+        counted_rows = list(pipeline if count_pipeline is None else count_pipeline)
+        counted = await collection.aggregate(counted_rows + [{"$count": "total"}]).to_list(1)
+        total = counted[0]["total"] if counted else 0
+    rows = await collection.aggregate(page_pipeline).to_list(None if limit is None else limit + 1)
+    return _page_result(rows, limit, sort_field, tiebreak_field, total)
+
+
+def page_headers(page: Dict[str, Any]) -> Dict[str, str]:
+    """Pagination metadata for list endpoints that return a bare JSON array"""
+    headers = {"X-Has-More": "true" if page["has_more"] else "false"}
+    if page["next_cursor"]:
+        headers["X-Next-Cursor"] = page["next_cursor"]
+    if page["total"] is not None:
+        headers["X-Total-Count"] = str(page["total"])
+    return headers
+
@@ -4,11 +4,12 @@ Handles scheduling and sending of automatic reminders based on booking dates
 """
 import asyncio
 import logging
-import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from .reminder_service import ReminderService, ReminderType
+from .booking_times import parse_time_slot as parse_slot_minutes
+from .slots import get_slot
 
 logger = logging.getLogger(__name__)
 
@@ -21,59 +22,15 @@ class ReminderScheduler:
     
     def parse_time_slot(self, time_slot: str) -> Optional[Tuple[int, int]]:
         """
-        Parse time slot string and return (hour, minute) in 24-hour format
-        Handles various formats like:
-        - "9:00 AM - 11:00 AM"
-        - "2:30 PM - 4:30 PM"
-        - "10:00 AM"
-        - "14:30" (24-hour format)
+        Start of a time slot as (hour, minute) in 24-hour format.
+        Catalog slots ("08:00-10:00") come from the slot catalog; other
+        labels ("9:00 AM - 11:00 AM", "14:30") are parsed once and cached.
         """
-        if not time_slot:
-            return None
-        
-        try:
-            # Extract the start time (before the dash)
-            start_time_str = time_slot.split(" - ")[0].strip()
-            
-            # Handle 24-hour format (e.g., "14:30")
-            if re.match(r'^\d{1,2}:\d{2}$', start_time_str):
-                hour, minute = map(int, start_time_str.split(':'))
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    return (hour, minute)
-                return None
-            
-            # Handle 12-hour format (e.g., "2:30 PM", "10:00 AM")
-            time_match = re.match(r'^(\d{1,2}):(\d{2})\s*(AM|PM)$', start_time_str.upper())
-            if time_match:
-                hour = int(time_match.group(1))
-                minute = int(time_match.group(2))
-                period = time_match.group(3)
-                
-                # Validate hour for 12-hour format (1-12)
-                if hour < 1 or hour > 12:
-                    return None
-                
-                # Validate minute
-                if minute < 0 or minute > 59:
-                    return None
-                
-                # Convert to 24-hour format
-                if period == 'AM':
-                    if hour == 12:
-                        hour = 0
-                elif period == 'PM':
-                    if hour != 12:
-                        hour += 12
-                
-                # Validate final hour
-                if 0 <= hour <= 23:
-                    return (hour, minute)
-            
-            return None
-            
-        except Exception as e:
-            logger.warning(f"Error parsing time slot '{time_slot}': {str(e)}")
+        slot = get_slot(time_slot)
+        bounds = (slot.start_minute, slot.end_minute) if slot else parse_slot_minutes(time_slot or "")
+        if bounds is None or bounds[0] >= 24 * 60:
             return None
+        return divmod(bounds[0], 60)
     
     async def start_scheduler(self):
         """Start the automatic reminder scheduler"""
@@ -167,62 +124,44 @@ class ReminderScheduler:
     async def _process_hour_before_reminders(self, template_map: Dict[str, Any]):
         """Process hour-before reminders"""
         try:
-            # Get bookings for today within the next 2 hours
-            now = datetime.now()
-            two_hours_from_now = now + timedelta(hours=2)
+            template = template_map.get(ReminderType.HOUR_BEFORE_REMINDER)
+            if not template:
+                return
             
-            # Get today's bookings
-            today_str = now.strftime('%Y-%m-%d')
+            # Bookings starting within the next 2 hours (indexed range on start_at)
+            now = datetime.now(timezone.utc)
+            two_hours_from_now = now + timedelta(hours=2)
             bookings = await self.db.bookings.find({
-                "booking_date": today_str,
+                "start_at": {"$gte": now, "$lte": two_hours_from_now},
                 "status": {"$in": ["confirmed", "pending"]}
-            }).to_list(length=None)
+            }, {"_id": 0, "id": 1, "time_slot": 1}).to_list(length=None)
             
-            template = template_map.get(ReminderType.HOUR_BEFORE_REMINDER)
-            if not template:
+            # Unparseable slots are stored as whole-day windows; they have no
+            # real start time to remind about
+            bookings = [b for b in bookings if parse_slot_minutes(b.get("time_slot") or "")]
+            if not bookings:
                 return
             
+            # One query for every reminder already sent in this window
+            sent = await self.db.reminder_logs.find({
+                "booking_id": {"$in": [b["id"] for b in bookings]},
+                "template_id": template["id"],
+                "status": "sent"
+            }, {"_id": 0, "booking_id": 1}).to_list(length=None)
+            already_sent = {log["booking_id"] for log in sent}
+            
             for booking in bookings:
-                # Parse time slot to determine if it's within the next 2 hours
-                time_slot = booking.get("time_slot", "")
-                if not time_slot:
-                    continue
-                
-                # Use improved time parsing
-                try:
-                    time_result = self.parse_time_slot(time_slot)
-                    if time_result is None:
-                        logger.warning(f"Could not parse time slot for booking {booking['id']}: {time_slot}")
-                        continue
-                    
-                    hour, minute = time_result
-                    
-                    # Create datetime for today with the booking time
-                    booking_datetime = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    # Check if booking is within the next 2 hours
-                    if now <= booking_datetime <= two_hours_from_now:
-                        # Check if reminder already sent
-                        existing_log = await self.db.reminder_logs.find_one({
-                            "booking_id": booking["id"],
-                            "template_id": template["id"],
-                            "status": "sent"
-                        })
-                        
-                        if not existing_log:
-                            # Send hour-before reminder
-                            result = await self.reminder_service.send_reminder(
-                                booking["id"], 
-                                template["id"]
-                            )
-                            if result["success"]:
-                                logger.info(f"Hour-before reminder sent for booking {booking['id']}")
-                            else:
-                                logger.error(f"Failed to send hour-before reminder for booking {booking['id']}: {result['message']}")
-                                
-                except Exception as e:
-                    logger.error(f"Error parsing time slot for booking {booking['id']}: {str(e)}")
+                if booking["id"] in already_sent:
                     continue
+                # Send hour-before reminder
+                result = await self.reminder_service.send_reminder(
+                    booking["id"], 
+                    template["id"]
+                )
+                if result["success"]:
+                    logger.info(f"Hour-before reminder sent for booking {booking['id']}")
+                else:
+                    logger.error(f"Failed to send hour-before reminder for booking {booking['id']}: {result['message']}")
                     
         except Exception as e:
             logger.error(f"Error processing hour-before reminders: {str(e)}")
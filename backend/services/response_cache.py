@@ -0,0 +1,50 @@
+"""
+Date Range Response Cache
+Short-lived in-process cache for read endpoints whose result is a function
+of a date range (e.g. the customer date picker). Entries expire after a TTL
+and are dropped as soon as a write touches any date inside their range.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+# (start_date, end_date, *extra) -- dates as YYYY-MM-DD strings
+RangeKey = Tuple[Hashable, ...]
+
+
+class DateRangeCache:
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[RangeKey, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: RangeKey) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def set(self, key: RangeKey, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, dates: Iterable[Optional[str]]) -> None:
+        """Drop every entry whose range contains one of `dates`"""
+        dates = [d for d in dates if d]
+        if not dates:
+            return
+        stale = [key for key in self._entries if any(key[0] <= d <= key[1] for d in dates)]
+        for key in stale:
+            del self._entries[key]
+        self.stats["invalidations"] += len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,96 @@
+"""
+Time Slot Catalog
+The fixed daily slots the calendar is built from. Each slot has an integer
+id (its position in the day), start and end minutes after midnight and the
+label stored on documents ("08:00-10:00"):
+
+    Slot(id=0, start_minute=480, end_minute=600, label="08:00-10:00")
+
+Documents carry the id as `slot_index` next to `time_slot`, so availability
+code compares integers and indexes per-slot arrays instead of matching label
+strings. Other spellings of a catalog slot ("8:00 AM - 10:00 AM") resolve to
+the same id; labels outside the catalog have no id.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .booking_times import parse_time_slot
+
+
+class Slot(NamedTuple):
+    id: int
+    start_minute: int
+    end_minute: int
+    label: str
+
+    @property
+    def start_clock(self) -> str:
+        return _clock(self.start_minute)
+
+    @property
+    def end_clock(self) -> str:
+        return _clock(self.end_minute)
+
+
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# (start, end) minutes after midnight, in day order
+_SLOT_BOUNDS = [(8 * 60, 10 * 60), (10 * 60, 12 * 60), (12 * 60, 14 * 60), (14 * 60, 16 * 60), (16 * 60, 18 * 60)]
+
+SLOTS: Tuple[Slot, ...] = tuple(
+    Slot(index, start, end, f"{_clock(start)}-{_clock(end)}")
+    for index, (start, end) in enumerate(_SLOT_BOUNDS)
+)
+SLOT_LABELS: List[str] = [slot.label for slot in SLOTS]
+SLOT_COUNT = len(SLOTS)
+
+# Used where a booking has no (parseable) slot, e.g. for display
+DEFAULT_SLOT = SLOTS[0]
+
+_BY_LABEL = {slot.label: slot for slot in SLOTS}
+_BY_BOUNDS = {(slot.start_minute, slot.end_minute): slot for slot in SLOTS}
+
+
+@lru_cache(maxsize=512)
+def get_slot(time_slot: Optional[str]) -> Optional[Slot]:
+    """Catalog slot for a label, or None if it is not one of the calendar slots"""
+    if not time_slot:
+        return None
+    slot = _BY_LABEL.get(time_slot)
+    if slot is None:
+        slot = _BY_BOUNDS.get(parse_time_slot(time_slot))
+    return slot
+
+
+def slot_index(time_slot: Optional[str]) -> Optional[int]:
+    slot = get_slot(time_slot)
+    return None if slot is None else slot.id
+
+
+def slot_fields(time_slot: Optional[str]) -> Dict[str, int]:
+    """slot_index field to store next to a time_slot ({} outside the catalog)"""
+    index = slot_index(time_slot)
+    return {} if index is None else {"slot_index": index}
+
+
+def slot_clock_range(time_slot: Optional[str]) -> Tuple[str, str]:
+    """("HH:MM", "HH:MM") start and end of any parseable slot label, for display"""
+    bounds = parse_time_slot(time_slot or "") or (DEFAULT_SLOT.start_minute, DEFAULT_SLOT.end_minute)
+    return _clock(bounds[0]), _clock(bounds[1])
+
+
+def slot_catalog() -> List[Dict[str, Any]]:
+    """The catalog as JSON for clients"""
+    return [
+        {
+            "id": slot.id,
+            "label": slot.label,
+            "start_minute": slot.start_minute,
+            "end_minute": slot.end_minute,
+            "start_time": slot.start_clock,
+            "end_time": slot.end_clock,
+        }
+        for slot in SLOTS
+    ]
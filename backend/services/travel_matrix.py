@@ -0,0 +1,104 @@
+"""
+Zip Code Travel Matrix
+Drive minutes between the serviced zip codes, precomputed and bundled in
+data/zip_travel_minutes.json (no network lookups). The matrix is loaded once
+into a NumPy array and every lookup is array indexing by zip position:
+
+    position:  0 .. n-1  the bundled zip codes
+               UNKNOWN   any other zip (unknown_minutes to everything)
+               NONE      "no job": the start or end of the cleaner's day
+
+Assignment scores the detour a booking adds to a cleaner's day: the drive
+from the cleaner's job in the previous slot to the booking plus on to the
+job in the next slot, minus the direct drive it replaces. With the NONE
+position a day with no job before or after needs no special case. Cleaners
+have no stored home address, so NONE is costed as an average depot: the
+mean drive into (or out of) each zip from the serviced area. An idle
+cleaner therefore pays the trip out and back, and one with a job next door
+is preferred.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .availability_index import INACTIVE_BOOKING_STATUSES, booking_zip
+from .slots import SLOT_COUNT, slot_index
+
+DEFAULT_MATRIX_PATH = Path(__file__).resolve().parent.parent / "data" / "zip_travel_minutes.json"
+
+
+def _slot_of(booking: Dict[str, Any]) -> Optional[int]:
+    index = booking.get("slot_index")
+    return index if isinstance(index, int) and 0 <= index < SLOT_COUNT else slot_index(booking.get("time_slot"))
+
+
+class TravelMatrix:
+    def __init__(self, zip_codes: Sequence[str], minutes: Sequence[Sequence[float]], unknown_minutes: float):
+        size = len(zip_codes)
+        grid = np.asarray(minutes, dtype=np.float64)
+        if grid.shape != (size, size):
+            raise ValueError(f"Travel matrix must be {size}x{size}, got {grid.shape}")
+        if (grid < 0).any():
+            raise ValueError("Travel minutes must not be negative")
+        self.zip_codes: Tuple[str, ...] = tuple(zip_codes)
+        self.UNKNOWN = size
+        self.NONE = size + 1
+        self.minutes = np.zeros((size + 2, size + 2), dtype=np.float64)
+        self.minutes[:size, :size] = grid
+        self.minutes[self.UNKNOWN, :] = unknown_minutes
+        self.minutes[:, self.UNKNOWN] = unknown_minutes
+        if size:
+            # Average depot: mean drive into each zip, and out of it
+            self.minutes[self.NONE, :size] = grid.mean(axis=0)
+            self.minutes[:size, self.NONE] = grid.mean(axis=1)
+        self.minutes[self.NONE, self.NONE] = 0
+        self._positions = {zip_code: i for i, zip_code in enumerate(self.zip_codes)}
+
+    def position(self, zip_code: Optional[str]) -> int:
+        return self._positions.get(zip_code, self.UNKNOWN)
+
+    def between(self, from_zip: Optional[str], to_zip: Optional[str]) -> float:
+        return float(self.minutes[self.position(from_zip), self.position(to_zip)])
+
+    def missing(self, zip_codes: Iterable[str]) -> List[str]:
+        """Zip codes without a row in the matrix"""
+        return [zip_code for zip_code in zip_codes if zip_code not in self._positions]
+
+    def route_neighbours(self, cleaner_ids: Sequence[str],
+                         bookings: Iterable[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(before, after) zip positions, each (cleaners, slots): the zip of the
+        cleaner's nearest job in an earlier / a later slot of the day, or NONE.
+
+        `bookings` are one day's bookings; inactive and unassigned ones are skipped.
+        """
+        cleaner_pos = {cleaner_id: i for i, cleaner_id in enumerate(cleaner_ids)}
+        day = np.full((len(cleaner_ids), SLOT_COUNT), self.NONE, dtype=np.int64)
+        for booking in bookings:
+            c = cleaner_pos.get(booking.get("cleaner_id"))
+            s = _slot_of(booking)
+            if c is None or s is None or booking.get("status") in INACTIVE_BOOKING_STATUSES:
+                continue
+            day[c, s] = self.position(booking_zip(booking))
+        before = np.full_like(day, self.NONE)
+        after = np.full_like(day, self.NONE)
+        for s in range(1, SLOT_COUNT):
+            before[:, s] = np.where(day[:, s - 1] != self.NONE, day[:, s - 1], before[:, s - 1])
+        for s in range(SLOT_COUNT - 2, -1, -1):
+            after[:, s] = np.where(day[:, s + 1] != self.NONE, day[:, s + 1], after[:, s + 1])
+        return before, after
+
+    def detour_minutes(self, before: np.ndarray, zip_position: Any, after: np.ndarray) -> np.ndarray:
+        """Extra drive minutes of fitting a job at `zip_position` between `before` and `after`
+        (position arrays broadcast against each other)"""
+        m = self.minutes
+        return m[before, zip_position] + m[zip_position, after] - m[before, after]
+
+
+@lru_cache(maxsize=4)
+def load_travel_matrix(path: Path = DEFAULT_MATRIX_PATH) -> TravelMatrix:
+    """The bundled matrix, read once per path"""
+    with open(path) as f:
+        data = json.load(f)
+    return TravelMatrix(data["zip_codes"], data["minutes"], data.get("unknown_minutes", 30))
@@ -39,6 +39,7 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from
 import { Tabs, TabsContent, TabsList, TabsTrigger } from './ui/tabs';
 import { toast } from 'sonner';
 import axios from 'axios';
+import { fetchAllPages } from '../lib/pagination';
 import CalendarJobAssignment from './CalendarJobAssignment';
 import DragDropTest from './DragDropTest';
 import { useAuth } from '../contexts/AuthContext';
@@ -194,8 +195,7 @@ const AdminDashboard = () => {
 
   const loadBookings = async () => {
     try {
-      const response = await axios.get(`${API}/admin/bookings`);
-      setBookings(response.data);
+      setBookings(await fetchAllPages(`${API}/admin/bookings`));
     } catch (error) {
       console.error('Failed to load bookings:', error);
     }
@@ -203,8 +203,7 @@ const AdminDashboard = () => {
 
   const loadSubscriptions = async () => {
     try {
-      const response = await axios.get(`${API}/admin/subscriptions`);
-      setSubscriptions(response.data);
+      setSubscriptions(await fetchAllPages(`${API}/admin/subscriptions`));
     } catch (error) {
       console.error('Failed to load subscriptions:', error);
     }
@@ -232,8 +231,7 @@ const AdminDashboard = () => {
 
   const loadCustomers = async () => {
     try {
-      const response = await axios.get(`${API}/admin/customers`);
-      setCustomers(response.data);
+      setCustomers(await fetchAllPages(`${API}/admin/customers`));
     } catch (error) {
       console.error('Failed to load customers:', error);
     }
@@ -226,12 +226,66 @@ const CalendarJobAssignment = () => {
   const [selectedJob, setSelectedJob] = useState(null);
   const [showJobDetails, setShowJobDetails] = useState(false);
 
-  const timeSlots = ["08:00-10:00", "10:00-12:00", "12:00-14:00", "14:00-16:00", "16:00-18:00"];
+  const [timeSlots, setTimeSlots] = useState([]);
+
+  // Slot labels come from the backend slot catalog
+  useEffect(() => {
+    axios.get(`${API}/calendar/slots`)
+      .then((response) => setTimeSlots(response.data.slots.map((slot) => slot.label)))
+      .catch((error) => {
+        console.error('Error loading time slots:', error);
+        toast.error('Failed to load time slots');
+      });
+  }, []);
 
   useEffect(() => {
     loadData();
   }, [selectedDate]);
 
+  // Reload when another admin (or a booking) changes the selected date
+  useEffect(() => {
+    if (!localStorage.getItem('token') || typeof EventSource === 'undefined') return undefined;
+
+    let source = null;
+    let closed = false;
+    let reloadTimer = null;
+    let reconnectTimer = null;
+    const scheduleReload = () => {
+      clearTimeout(reloadTimer);
+      reloadTimer = setTimeout(loadData, 300);
+    };
+
+    // The stream is opened with a short-lived ticket rather than the login token,
+    // which would end up in access logs; a rejected reconnect gets a fresh ticket
+    const connect = async () => {
+      try {
+        const response = await axios.post(`${API}/admin/calendar/stream-ticket`);
+        if (closed) return;
+        source = new EventSource(
+          `${API}/admin/calendar/stream?ticket=${encodeURIComponent(response.data.ticket)}&start_date=${selectedDate}&end_date=${selectedDate}`
+        );
+        ['booking', 'bookings_cancelled', 'assignment', 'availability', 'slot', 'dates_changed', 'resync']
+          .forEach((type) => source.addEventListener(type, scheduleReload));
+        source.onerror = () => {
+          if (source.readyState === EventSource.CLOSED && !closed) {
+            reconnectTimer = setTimeout(connect, 5000);
+          }
+        };
+      } catch (error) {
+        console.error('Failed to open calendar stream:', error);
+        if (!closed) reconnectTimer = setTimeout(connect, 30000);
+      }
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(reloadTimer);
+      clearTimeout(reconnectTimer);
+      if (source) source.close();
+    };
+  }, [selectedDate]);
+
   const loadData = async () => {
     setLoading(true);
     try {
@@ -23,6 +23,7 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from
 import { Tabs, TabsContent, TabsList, TabsTrigger } from './ui/tabs';
 import { toast } from 'sonner';
 import axios from 'axios';
+import { fetchAllPages } from '../lib/pagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -45,8 +46,8 @@ const InvoiceManagement = () => {
   const loadInvoices = async () => {
     try {
       setLoading(true);
-      const response = await axios.get(`${API}/admin/invoices${statusFilter && statusFilter !== 'all' ? `?status=${statusFilter}` : ''}`);
-      setInvoices(response.data);
+      const params = statusFilter && statusFilter !== 'all' ? { status: statusFilter } : {};
+      setInvoices(await fetchAllPages(`${API}/admin/invoices`, { params }));
     } catch (error) {
       toast.error('Failed to load invoices');
       console.error(error);
@@ -57,8 +58,8 @@ const InvoiceManagement = () => {
 
   const loadCompletedBookings = async () => {
     try {
-      const response = await axios.get(`${API}/admin/bookings`);
-      const completed = response.data.filter(booking => 
+      const bookings = await fetchAllPages(`${API}/admin/bookings`);
+      const completed = bookings.filter(booking => 
         booking.status === 'completed' && 
         !invoices.some(invoice => invoice.booking_id === booking.id)
       );
@@ -25,6 +25,7 @@ import { Badge } from './ui/badge';
 import { Alert, AlertDescription } from './ui/alert';
 import { toast } from 'sonner';
 import axios from 'axios';
+import { fetchAllPages } from '../lib/pagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -59,8 +60,7 @@ const PromoCodeManagement = () => {
   const loadPromoCodes = async () => {
     try {
       setLoading(true);
-      const response = await axios.get(`${API}/admin/promo-codes`);
-      setPromoCodes(response.data);
+      setPromoCodes(await fetchAllPages(`${API}/admin/promo-codes`));
     } catch (error) {
       toast.error('Failed to load promo codes');
       console.error('Failed to load promo codes:', error);
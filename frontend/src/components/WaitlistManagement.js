@@ -23,6 +23,7 @@ import { Textarea } from './ui/textarea';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from './ui/dialog';
 import { toast } from 'sonner';
 import axios from 'axios';
+import { fetchAllPages } from '../lib/pagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -45,10 +46,10 @@ const WaitlistManagement = () => {
     try {
       setLoading(true);
       const token = localStorage.getItem('token');
-      const response = await axios.get(`${API}/waitlist`, {
+      const entries = await fetchAllPages(`${API}/waitlist`, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setWaitlist(response.data || []);
+      setWaitlist(entries);
     } catch (error) {
       console.error('Failed to load waitlist:', error);
       toast.error('Failed to load waitlist');
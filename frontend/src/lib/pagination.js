@@ -0,0 +1,22 @@
+import axios from 'axios';
+
+const PAGE_SIZE = 500;
+
+// Follow the X-Next-Cursor header of a paginated list endpoint and
+// concatenate every page into one array
+export async function fetchAllPages(url, config = {}) {
+  const items = [];
+  let cursor = null;
+
+  do {
+    const params = { ...(config.params || {}), limit: PAGE_SIZE };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    const response = await axios.get(url, { ...config, params });
+    items.push(...(response.data || []));
+    cursor = response.headers['x-next-cursor'] || null;
+  } while (cursor);
+
+  return items;
+}